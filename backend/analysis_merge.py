@@ -0,0 +1,205 @@
+"""
+AluQuote AI - Analysis Merge Module
+Vistas agregadas (merged) das análises DXF e PDF de um projeto
+Cada ficheiro contribui com uma parte própria; o resumo agregado só guarda totais e chaves
+Acrescentar um ficheiro só escreve a sua parte e o resumo, sem reescrever os restantes
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# How each part of a per-file analysis is folded into the merged view:
+#   lists   - concatenated in upload order; "tagged" ones get a source_file key per entry
+#   counts  - summed per key
+#   dicts   - dict.update, the last file defining a key wins
+#   sets    - de-duplicated union
+MERGE_SPECS = {
+    "dxf": {
+        "info_key": "file_info",
+        "lists": ("profiles", "material_quantities", "texts_extracted"),
+        "tagged": ("profiles",),
+        "counts": ("features_summary",),
+        "dicts": ("layers", "blocks_analyzed"),
+        "sets": (),
+    },
+    "pdf": {
+        "info_key": "document_info",
+        "lists": ("bom_items", "constraints", "dimension_specs", "material_specs"),
+        "tagged": ("bom_items", "constraints"),
+        "counts": (),
+        "dicts": (),
+        "sets": ("profile_references",),
+    },
+}
+
+# The merged view is stored in two pieces:
+#   summary - counts, dicts and sets folded over every file, plus one small "sources" entry
+#             per file (id, filename, list lengths, its counts); no list entries
+#   parts   - per file: its (tagged) list entries and its dict/set values, kept with the file
+# merged_view(summary, parts) rebuilds the full view; adding a file only touches its own part.
+
+
+def empty_summary(kind: str) -> Dict[str, Any]:
+    spec = MERGE_SPECS[kind]
+    summary: Dict[str, Any] = {"success": True}
+    for field in spec["counts"] + spec["dicts"]:
+        summary[field] = {}
+    for field in spec["sets"]:
+        summary[field] = []
+    summary["sources"] = []
+    _update_totals(kind, summary)
+    return summary
+
+
+def _update_totals(kind: str, summary: Dict[str, Any]):
+    sources = summary["sources"]
+    summary["files_merged"] = len(sources)
+    if kind == "dxf":
+        summary["total_profiles"] = sum(source["counts"].get("profiles", 0) for source in sources)
+        summary["total_features"] = sum(summary["features_summary"].values())
+    else:
+        summary["total_items"] = sum(source["counts"].get("bom_items", 0) for source in sources)
+        summary["total_constraints"] = sum(source["counts"].get("constraints", 0) for source in sources)
+
+
+def file_part(kind: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """One file's contribution to the merged lists, dicts and sets (empty for a failed analysis)"""
+    spec = MERGE_SPECS[kind]
+    if not analysis.get("success"):
+        return {}
+
+    filename = (analysis.get(spec["info_key"]) or {}).get("filename", "")
+    part: Dict[str, Any] = {}
+    for field in spec["lists"]:
+        entries = analysis.get(field, [])
+        if field in spec["tagged"]:
+            entries = [{**entry, "source_file": filename} for entry in entries]
+        part[field] = list(entries)
+    for field in spec["dicts"]:
+        part[field] = dict(analysis.get(field, {}))
+    for field in spec["sets"]:
+        part[field] = list(dict.fromkeys(analysis.get(field, [])))
+    return part
+
+
+def add_analysis(kind: str, summary: Optional[Dict[str, Any]], file_id: str,
+                 analysis: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Fold one file's analysis into the summary (created if None).
+    Returns (summary, part); the caller stores the part next to the file.
+    Only the new analysis is walked.
+    """
+    spec = MERGE_SPECS[kind]
+    if summary is None:
+        summary = empty_summary(kind)
+
+    part = file_part(kind, analysis)
+    filename = (analysis.get(spec["info_key"]) or {}).get("filename", "")
+    source: Dict[str, Any] = {
+        "file_id": file_id,
+        "filename": filename,
+        "counts": {field: len(part[field]) for field in spec["lists"] if part.get(field)},
+        # dict/set fields this file defines keys in (re-folded from the parts if it is removed)
+        "keyed": [field for field in spec["dicts"] + spec["sets"] if part.get(field)]
+    }
+
+    if part:
+        for field in spec["counts"]:
+            values = dict(analysis.get(field, {}))
+            for key, count in values.items():
+                summary[field][key] = summary[field].get(key, 0) + count
+            source[field] = values
+
+        for field in spec["dicts"]:
+            summary[field].update(part[field])
+
+        for field in spec["sets"]:
+            summary[field] = list(dict.fromkeys(summary[field] + part[field]))
+
+    summary["sources"].append(source)
+    _update_totals(kind, summary)
+    return summary, part
+
+
+def remove_analysis(kind: str, summary: Optional[Dict[str, Any]], file_id: str,
+                    remaining_parts: Callable[[], Iterable[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Take one file's contribution out of the summary (its part is simply dropped).
+    Counts are subtracted; dict and set fields are re-folded from remaining_parts(),
+    which is only called when the removed file contributed to them.
+    Returns None once no file is left.
+    """
+    if summary is None:
+        return None
+
+    spec = MERGE_SPECS[kind]
+    sources = summary["sources"]
+    index = next((i for i, source in enumerate(sources) if source["file_id"] == file_id), None)
+    if index is None:
+        return summary
+
+    removed = sources.pop(index)
+    if not sources:
+        return None
+
+    for field in spec["counts"]:
+        for key, count in removed.get(field, {}).items():
+            remaining = summary[field].get(key, 0) - count
+            if any(key in source.get(field, {}) for source in sources):
+                summary[field][key] = remaining
+            else:
+                summary[field].pop(key, None)
+
+    keyed = removed.get("keyed", [])
+    if keyed:
+        parts = list(remaining_parts())
+        for field in spec["dicts"]:
+            if field in keyed:
+                summary[field] = {}
+                for part in parts:
+                    summary[field].update(part.get(field, {}))
+        for field in spec["sets"]:
+            if field in keyed:
+                values: Dict[str, None] = {}
+                for part in parts:
+                    values.update(dict.fromkeys(part.get(field, [])))
+                summary[field] = list(values)
+
+    _update_totals(kind, summary)
+    return summary
+
+
+def merged_view(kind: str, summary: Optional[Dict[str, Any]],
+                parts: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The full merged analysis: the summary plus every part's list entries, in part order"""
+    if summary is None:
+        return None
+
+    spec = MERGE_SPECS[kind]
+    merged = dict(summary)
+    for field in spec["lists"]:
+        merged[field] = []
+    for part in parts:
+        for field in spec["lists"]:
+            merged[field].extend(part.get(field, ()))
+    return merged
+
+
+def merge_project_files(project: Dict[str, Any], added_files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fold newly added files into a project record's merged summaries (ProjectStore.update_with),
+    putting each file's part in project["merge_parts"].
+    Files deleted from the project meanwhile are skipped: folding them would leave a source
+    that no file row can ever remove. Returns the files that were merged.
+    """
+    present = {file_info["id"] for file_info in project["files"]}
+    parts = project.setdefault("merge_parts", {})
+    merged = []
+    for file_info in added_files:
+        if file_info["id"] not in present:
+            continue
+        key = f"merged_{file_info['type']}_analysis"
+        project[key], parts[file_info["id"]] = add_analysis(
+            file_info["type"], project.get(key), file_info["id"], file_info["analysis"]
+        )
+        merged.append(file_info)
+    return merged
@@ -0,0 +1,78 @@
+"""
+AluQuote AI - Analysis Views Module
+Seleção de campos e paginação das análises devolvidas pela API
+A interface pede só as colunas e as páginas que vai mostrar
+"""
+
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Sequence
+
+# Paginated collections of each analysis kind (aliases map short names to analysis keys)
+COLLECTIONS = {
+    "dxf": ("profiles", "texts_extracted", "features_detail", "material_quantities"),
+    "pdf": ("bom_items", "constraints", "dimension_specs", "material_specs"),
+}
+COLLECTION_ALIASES = {"texts": "texts_extracted", "features": "features_detail"}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a cursor that was not produced by paginate()"""
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """'a, b,c' -> ['a', 'b', 'c']; None or blank means every field"""
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return names or None
+
+
+def select_fields(document: Any, fields: Optional[Sequence[str]]) -> Any:
+    """Keep only the requested top-level keys of a dict (in request order, missing keys skipped)"""
+    if fields is None or not isinstance(document, dict):
+        return document
+    return {name: document[name] for name in fields if name in document}
+
+
+def resolve_collection(kind: str, name: str) -> Optional[str]:
+    name = COLLECTION_ALIASES.get(name, name)
+    return name if name in COLLECTIONS[kind] else None
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, offset = raw.split(":", 1)
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Cursor inválido")
+    if prefix != "o" or offset < 0:
+        raise InvalidCursorError("Cursor inválido")
+    return offset
+
+
+def paginate(items: Sequence[Any], limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None,
+             fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    One page of a collection: {"items", "total", "limit", "next_cursor"}.
+    next_cursor is None on the last page; fields selects keys of every item.
+    """
+    offset = decode_cursor(cursor)
+    page = items[offset:offset + limit]
+    end = offset + len(page)
+    return {
+        "items": [select_fields(item, fields) for item in page],
+        "total": len(items),
+        "limit": limit,
+        "next_cursor": encode_cursor(end) if end < len(items) else None
+    }
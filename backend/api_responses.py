@@ -0,0 +1,187 @@
+"""
+AluQuote AI - API Responses Module
+Serialização JSON rápida (orjson) e compressão gzip/brotli das respostas grandes
+As análises e orçamentos são dicts aninhados enormes; o encoder por omissão do FastAPI é lento
+"""
+
+import json
+import zlib
+from typing import Any, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/xml", "image/svg+xml", "text/"
+)
+
+
+def dumps(content: Any, indent: bool = False) -> bytes:
+    """UTF-8 JSON bytes; orjson when installed, stdlib json otherwise (non-JSON types via str)"""
+    if ORJSON_AVAILABLE:
+        options = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(content, default=str, option=options)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; fall through to the stdlib encoder
+    return json.dumps(content, ensure_ascii=False, default=str, indent=2 if indent else None,
+                      separators=None if indent else (",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps().
+    Returning it from an endpoint also skips FastAPI's jsonable_encoder pass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    return FastJSONResponse(content=content, status_code=status_code)
+
+
+def _accepted_encodings(accept_encoding: str) -> List[Tuple[str, float]]:
+    encodings = []
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings.append((name.strip().lower(), quality))
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """'br' or 'gzip' from an Accept-Encoding header (brotli only when installed), else None"""
+    accepted = {name: quality for name, quality in _accepted_encodings(accept_encoding)}
+    candidates = (["br"] if BROTLI_AVAILABLE else []) + ["gzip"]
+    best = None
+    best_quality = 0.0
+    for name in candidates:
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class _Compressor:
+    """Incremental gzip or brotli encoder with one interface"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON/text/SVG responses with brotli or gzip, as the client accepts.
+    Single-body responses are compressed only from minimum_size bytes; streamed responses
+    are compressed chunk by chunk. Bodies that already carry a Content-Encoding are left alone.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingSend(send, encoding, self)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSend:
+    def __init__(self, send, encoding: str, settings: CompressionMiddleware):
+        self.send = send
+        self.encoding = encoding
+        self.settings = settings
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def __call__(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if not self._compressible(headers) or (not more_body and len(body) < self.settings.minimum_size):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.settings.gzip_level, self.settings.brotli_quality)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+                await self.send(self.start_message)
+            else:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        if chunk or not more_body:
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
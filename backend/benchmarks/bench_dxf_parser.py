@@ -0,0 +1,147 @@
+"""
+AluQuote AI - DXF Parser Benchmark
+Gera um desenho sintético grande e mede o parser, a travessia do modelspace
+e a procura de quantidades por proximidade
+
+Uso (a partir de backend/):
+    python benchmarks/bench_dxf_parser.py --entities 50000
+"""
+
+import argparse
+import math
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import ezdxf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dxf_parser import DXFParser  # noqa: E402
+
+
+def build_synthetic_drawing(path: Path, entities: int, seed: int = 7, extent: float = 50000.0):
+    """Mixed drawing: ~20% texts (half with quantities), the rest profiles on material layers"""
+    rng = random.Random(seed)
+    doc = ezdxf.new(setup=True)
+    doc.header['$INSUNITS'] = 4
+    msp = doc.modelspace()
+    for name in ['ALU_PERFIL', 'VIDRO', 'ACO_S275', 'COTAS']:
+        doc.layers.add(name)
+
+    for i in range(entities):
+        x, y = rng.uniform(0, extent), rng.uniform(0, extent)
+        layer = rng.choice(['ALU_PERFIL', 'VIDRO', 'ACO_S275', '0'])
+        kind = i % 10
+        if kind == 0:
+            msp.add_text(f"{rng.randint(1, 20)} un", dxfattribs={'layer': 'COTAS', 'height': 20}).set_placement((x, y))
+        elif kind == 1:
+            msp.add_mtext(f"PERFIL P-{i % 50:03d} alum 6060", dxfattribs={'layer': 'COTAS', 'insert': (x, y)})
+        elif kind in (2, 3, 4):
+            pts = [(x + rng.uniform(-80, 80), y + rng.uniform(-80, 80)) for _ in range(rng.randint(3, 12))]
+            msp.add_lwpolyline(pts, close=rng.random() < 0.7, dxfattribs={'layer': layer})
+        elif kind == 5:
+            msp.add_circle((x, y), rng.choice([3, 8, 20, 60]), dxfattribs={'layer': layer})
+        elif kind == 6:
+            msp.add_arc((x, y), 30, 0, rng.uniform(10, 300), dxfattribs={'layer': layer})
+        elif kind == 7:
+            msp.add_polyline2d([(x, y), (x + 200, y), (x + 200, y + 40)], close=True, dxfattribs={'layer': layer})
+        else:
+            msp.add_line((x, y), (x + rng.uniform(-500, 500), y + rng.uniform(-500, 500)), dxfattribs={'layer': layer})
+
+    doc.saveas(str(path))
+
+
+def linear_quantity_scan(texts, position, radius):
+    """Reference implementation: the original O(texts) scan"""
+    for text in texts:
+        if text.get('quantity_hint'):
+            text_pos = text.get('position', (0, 0))
+            dist = math.sqrt((position[0] - text_pos[0])**2 + (position[1] - text_pos[1])**2)
+            if dist < radius:
+                return text['quantity_hint']
+    return 1
+
+
+class MultiQueryDXFParser(DXFParser):
+    """Reference parser: one msp.query() per entity type, as before the single-pass dispatch"""
+
+    def _index_modelspace(self):
+        for entity in self.msp:
+            try:
+                layer = entity.dxf.layer
+                etype = entity.dxftype()
+                self.entity_counts[etype] += 1
+                if layer in self.layers_info:
+                    self.layers_info[layer]["entity_count"] += 1
+            except:
+                pass
+
+    def _entities(self, dxftype):
+        return self.msp.query(dxftype)
+
+
+def timed_parse(parser_cls, path: Path):
+    parser = parser_cls(str(path))
+    start = time.perf_counter()
+    result = parser.parse()
+    return parser, result, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--entities', type=int, default=50000)
+    arg_parser.add_argument('--sample', type=int, default=2000,
+                            help="queries timed with the linear scan (it is extrapolated to all profiles)")
+    arg_parser.add_argument('--dxf', type=Path, default=None, help="benchmark an existing DXF instead")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.dxf
+        if path is None:
+            path = Path(tmp) / 'synthetic.dxf'
+            start = time.perf_counter()
+            build_synthetic_drawing(path, args.entities)
+            print(f"drawing: {args.entities} entities generated in {time.perf_counter() - start:.1f}s")
+
+        parser, result, parse_time = timed_parse(DXFParser, path)
+        if not result['success']:
+            print(result['error'])
+            return 1
+        _, legacy_result, legacy_time = timed_parse(MultiQueryDXFParser, path)
+
+    radius = DXFParser.QUANTITY_SEARCH_RADIUS
+    queries = list(zip(parser.profiles.values('centroid_x'), parser.profiles.values('centroid_y')))
+    hinted = sum(1 for t in parser.texts_extracted if t.get('quantity_hint'))
+    print(f"parse: {parse_time:.2f}s  profiles={len(parser.profiles)}  "
+          f"texts={len(parser.texts_extracted)} (with quantity: {hinted})")
+    same_output = legacy_result == result
+    print(f"parse (one msp.query per type): {legacy_time:.2f}s  "
+          f"speedup: {legacy_time / max(parse_time, 1e-9):.2f}x  identical output: {same_output}")
+
+    start = time.perf_counter()
+    index = parser._build_quantity_index()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = [parser._find_quantity_near_position(q) for q in queries]
+    index_time = time.perf_counter() - start
+
+    sample = random.Random(1).sample(range(len(queries)), min(args.sample, len(queries)))
+    start = time.perf_counter()
+    reference = [linear_quantity_scan(parser.texts_extracted, queries[i], radius) for i in sample]
+    scan_time = (time.perf_counter() - start) * len(queries) / max(1, len(sample))
+
+    mismatches = sum(1 for i, expected in zip(sample, reference) if indexed[i] != expected)
+    print(f"grid index: build {build_time * 1000:.1f}ms ({len(index)} points), "
+          f"{len(queries)} lookups {index_time * 1000:.1f}ms")
+    print(f"linear scan: ~{scan_time * 1000:.0f}ms for {len(queries)} lookups "
+          f"(extrapolated from {len(sample)})")
+    print(f"speedup: ~{scan_time / max(index_time, 1e-9):.0f}x  mismatches: {mismatches}/{len(sample)}")
+    return 1 if mismatches or not same_output else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+AluQuote AI - JSON Response Benchmark
+Mede a serialização de uma análise real (json da stdlib vs orjson) e os bytes transmitidos
+sem compressão, com gzip e com brotli
+
+Uso (a partir de backend/):
+    python benchmarks/bench_json_responses.py --payload cache/parse/dxf_<versão>_<sha256>.json.gz
+    python benchmarks/bench_json_responses.py --entities 50000   (análise de um desenho sintético)
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from api_responses import BROTLI_AVAILABLE, ORJSON_AVAILABLE, dumps  # noqa: E402
+
+
+def load_payload(path: Path):
+    """A captured analysis: plain .json or a ParseCache .json.gz entry"""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthetic_payload(entities: int):
+    from bench_dxf_parser import build_synthetic_drawing
+    from dxf_parser import parse_dxf_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.dxf"
+        build_synthetic_drawing(path, entities)
+        return parse_dxf_file(str(path))
+
+
+def best_of(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--payload', type=Path, help="captured analysis (.json or .json.gz)")
+    arg_parser.add_argument('--entities', type=int, default=50000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    payload = load_payload(args.payload) if args.payload else synthetic_payload(args.entities)
+
+    encoders = [("json (stdlib)", lambda: json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"))]
+    try:
+        from fastapi.encoders import jsonable_encoder
+        encoders.insert(0, ("jsonable_encoder + json", lambda: json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False).encode("utf-8")))
+    except ImportError:
+        pass
+    if ORJSON_AVAILABLE:
+        encoders.append(("orjson (dumps)", lambda: dumps(payload)))
+
+    print(f"payload: {len(payload.get('profiles', []))} profiles, {len(payload.get('texts_extracted', []))} texts")
+    body = None
+    for name, encode in encoders:
+        elapsed, body = best_of(encode, args.repeat)
+        print(f"encode {name:26s} {elapsed * 1000:8.1f} ms  {len(body) / 1024:9.1f} KB")
+
+    codecs = [("gzip -6", lambda: zlib.compress(body, 6))]
+    if BROTLI_AVAILABLE:
+        import brotli
+        codecs.append(("brotli q4", lambda: brotli.compress(body, quality=4)))
+    for name, compress in codecs:
+        elapsed, wire = best_of(compress, args.repeat)
+        print(f"wire   {name:26s} {elapsed * 1000:8.1f} ms  {len(wire) / 1024:9.1f} KB "
+              f"({len(body) / len(wire):.1f}x smaller)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
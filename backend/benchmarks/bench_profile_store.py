@@ -0,0 +1,88 @@
+"""
+AluQuote AI - Profile Store Benchmark
+Compara listas de ProfileData com o ProfileStore colunar: memória e serialização
+
+Uso (a partir de backend/):
+    python benchmarks/bench_profile_store.py --profiles 150000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dxf_parser import GeometricFeature, ProfileData, ProfileStore  # noqa: E402
+
+
+def synthetic_profiles(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    layers = [f"ALU_PERFIL_{i:02d}" for i in range(40)]
+    for i in range(count):
+        x, y = rng.uniform(0, 50000), rng.uniform(0, 50000)
+        w, h = rng.uniform(1, 400), rng.uniform(1, 400)
+        yield ProfileData(
+            profile_id=f"LWPOLY_{i:04d}",
+            layer=rng.choice(layers),
+            is_closed=rng.random() < 0.7,
+            perimeter_mm=2 * (w + h),
+            area_mm2=w * h,
+            length_mm=max(w, h),
+            bounding_box={'min_x': round(x, 2), 'min_y': round(y, 2), 'max_x': round(x + w, 2),
+                          'max_y': round(y + h, 2), 'width': round(w, 2), 'height': round(h, 2)},
+            centroid=(round(x + w / 2, 2), round(y + h / 2, 2)),
+            vertex_count=rng.randint(3, 12),
+            entity_type='LWPOLYLINE',
+            color=256,
+            material_hint='aluminio',
+            quantity=rng.randint(1, 4)
+        )
+
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build()
+    build_time = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return container, size, build_time
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--profiles', type=int, default=150000)
+    args = arg_parser.parse_args()
+
+    features = [GeometricFeature('hole', (0.0, 0.0), {'radius': 4.0}, 'ALU_PERFIL_00', 'CIRCLE', 3.0)]
+
+    def build_store():
+        store = ProfileStore()
+        for profile in synthetic_profiles(args.profiles):
+            store.append(profile)
+        return store
+
+    profile_list, list_bytes, _ = measure(lambda: list(synthetic_profiles(args.profiles)))
+    store, store_bytes, _ = measure(build_store)
+
+    start = time.perf_counter()
+    list_dicts = [p.to_dict() for p in profile_list]
+    list_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    store_dicts = store.to_dicts(features)
+    store_time = time.perf_counter() - start
+
+    print(f"{args.profiles} profiles")
+    print(f"memory: ProfileData list {list_bytes / 2**20:.1f} MB, ProfileStore {store_bytes / 2**20:.1f} MB "
+          f"({list_bytes / max(store_bytes, 1):.1f}x smaller)")
+    print(f"serialization: to_dict() {list_time:.2f}s, to_dicts() {store_time:.2f}s "
+          f"({list_time / max(store_time, 1e-9):.1f}x faster)  identical: {list_dicts == store_dicts}")
+    return 0 if list_dicts == store_dicts else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
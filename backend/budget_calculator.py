@@ -257,6 +257,7 @@ class BudgetCalculator:
         # Build lookup indexes
         pdf_lookup = self._build_pdf_lookup(pdf_items)
         constraints_by_type = self._index_constraints(pdf_constraints)
+        project_specs = self._project_specifications(constraints_by_type)
         
         if has_dxf:
             # PRIMARY PATH: DXF exists - use DXF quantities
@@ -268,13 +269,13 @@ class BudgetCalculator:
             
             # Process each DXF profile
             for profile in dxf_profiles:
-                correlation = self._correlate_profile_with_pdf(profile, pdf_lookup, constraints_by_type)
+                correlation = self._correlate_profile_with_pdf(profile, pdf_lookup, project_specs)
                 correlations.append(correlation)
             
             # Also process material quantities from blocks
             for material_qty in dxf_materials:
                 if material_qty.get('source') == 'block_count':
-                    correlation = self._create_material_correlation(material_qty, pdf_lookup, constraints_by_type)
+                    correlation = self._create_material_correlation(material_qty, pdf_lookup, project_specs)
                     if correlation:
                         correlations.append(correlation)
         
@@ -460,7 +461,7 @@ class BudgetCalculator:
         return indexed
     
     def _correlate_profile_with_pdf(self, profile: Dict, pdf_lookup: Dict, 
-                                    constraints: Dict) -> Dict[str, Any]:
+                                    project_specs: Dict) -> Dict[str, Any]:
         """Correlate a DXF profile with PDF items for specifications"""
         profile_id = profile.get('profile_id', '')
         layer = profile.get('layer', '')
@@ -498,7 +499,7 @@ class BudgetCalculator:
                     break
         
         # Extract specifications from matched PDF or constraints
-        specs = self._extract_specifications(matched_pdf, constraints)
+        specs = self._extract_specifications(matched_pdf, project_specs)
         
         return {
             "dxf_profile": profile,
@@ -510,12 +511,12 @@ class BudgetCalculator:
         }
     
     def _create_material_correlation(self, material_qty: Dict, pdf_lookup: Dict,
-                                     constraints: Dict) -> Optional[Dict]:
+                                     project_specs: Dict) -> Optional[Dict]:
         """Create correlation from material quantity (blocks)"""
         ref = material_qty.get('profile_reference', '')
         
         matched_pdf = pdf_lookup.get('by_reference', {}).get(ref.upper())
-        specs = self._extract_specifications(matched_pdf, constraints)
+        specs = self._extract_specifications(matched_pdf, project_specs)
         
         return {
             "dxf_profile": None,
@@ -527,43 +528,65 @@ class BudgetCalculator:
             "specifications": specs
         }
     
-    def _extract_specifications(self, pdf_item: Optional[Dict], 
-                                constraints: Dict) -> Dict[str, Any]:
-        """Extract specifications from PDF item and constraints"""
-        specs = {
+    def _project_specifications(self, constraints: Dict) -> Dict[str, Any]:
+        """
+        Project-wide specifications from the PDF constraints (indexed by type), built once per
+        correlation run: first material grade and surface treatment, certifications and
+        every high-importance constraint
+        """
+        project_specs = {
             "material": None,
             "finish": None,
-            "thickness_mm": None,
             "certifications": [],
             "constraints": []
         }
-        
-        if pdf_item:
-            specs["material"] = pdf_item.get('material')
-            specs["finish"] = pdf_item.get('finish')
-            specs["thickness_mm"] = pdf_item.get('thickness_mm')
-        
-        # Add from constraints
-        if 'material_grade' in constraints and constraints['material_grade']:
-            if not specs["material"]:
-                specs["material"] = constraints['material_grade'][0].get('value')
-        
-        if 'surface_treatment' in constraints and constraints['surface_treatment']:
-            if not specs["finish"]:
-                specs["finish"] = constraints['surface_treatment'][0].get('value')
-        
+
+        if constraints.get('material_grade'):
+            project_specs["material"] = constraints['material_grade'][0].get('value')
+
+        if constraints.get('surface_treatment'):
+            project_specs["finish"] = constraints['surface_treatment'][0].get('value')
+
         if 'certification' in constraints:
-            specs["certifications"] = [c.get('value') for c in constraints['certification']]
-        
+            project_specs["certifications"] = [c.get('value') for c in constraints['certification']]
+
         # Collect all high-importance constraints
         for ctype, clist in constraints.items():
             for c in clist:
                 if c.get('importance') == 'high':
-                    specs["constraints"].append({
+                    project_specs["constraints"].append({
                         "type": ctype,
                         "value": c.get('value'),
                         "context": c.get('context', '')[:100]
                     })
+
+        return project_specs
+    
+    def _extract_specifications(self, pdf_item: Optional[Dict], 
+                                project_specs: Dict) -> Dict[str, Any]:
+        """
+        Extract specifications from PDF item and the project-wide specifications
+        (the certifications and constraints lists are shared by every correlation, not copied)
+        """
+        specs = {
+            "material": None,
+            "finish": None,
+            "thickness_mm": None,
+            "certifications": project_specs["certifications"],
+            "constraints": project_specs["constraints"]
+        }
+        
+        if pdf_item:
+            specs["material"] = pdf_item.get('material')
+            specs["finish"] = pdf_item.get('finish')
+            specs["thickness_mm"] = pdf_item.get('thickness_mm')
+        
+        # Add from constraints
+        if not specs["material"]:
+            specs["material"] = project_specs["material"]
+        
+        if not specs["finish"]:
+            specs["finish"] = project_specs["finish"]
         
         return specs
     
@@ -0,0 +1,153 @@
+"""
+AluQuote AI - Budget Exports Module
+Exportação do orçamento em CSV e JSON por streaming, sem ficheiros temporários
+A última exportação de cada projeto/versão do orçamento pode ficar em memória
+"""
+
+import csv
+import io
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List
+
+from api_responses import dumps
+
+CSV_HEADER = [
+    "Linha", "Referência", "Descrição", "Qtd", "Fonte Qtd",
+    "Perímetro (mm)", "Comprimento (mm)", "Peso (kg)",
+    "Custo Material", "Custo Tratamento", "Custo M.O.",
+    "Custo Unitário", "Custo Total", "Confiança"
+]
+
+
+def csv_row(item: Dict[str, Any]) -> List[Any]:
+    geometry = item.get("geometry", {})
+    costs = item.get("costs", {})
+    return [
+        item["line_id"],
+        item["reference"],
+        item["description"],
+        item["quantity"],
+        item.get("quantity_source", ""),
+        geometry.get("perimeter_mm", 0),
+        geometry.get("length_mm", 0),
+        geometry.get("weight_kg", 0),
+        costs.get("raw_material", 0),
+        costs.get("surface_treatment", 0),
+        costs.get("labor", 0),
+        item["unit_cost"],
+        item["total_cost"],
+        item.get("correlation_confidence", 0)
+    ]
+
+
+def iter_csv(budget: Dict[str, Any], rows_per_chunk: int = 256) -> Iterator[bytes]:
+    """Budget line items as UTF-8 CSV, a few hundred rows per chunk"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+
+    for i, item in enumerate(budget.get("line_items", []), 1):
+        writer.writerow(csv_row(item))
+        if i % rows_per_chunk == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _indented(value: Any, level: int) -> bytes:
+    """Value dumped with indent=2, shifted to sit `level` levels deep (JSON strings hold no raw newlines)"""
+    return dumps(value, indent=True).replace(b"\n", b"\n" + b"  " * level)
+
+
+def iter_json(budget: Dict[str, Any], stream_keys: Iterable[str] = ("line_items",)) -> Iterator[bytes]:
+    """
+    Budget as indented JSON (same text as dumps(budget, indent=True)), one top-level key
+    per chunk and one element per chunk for the large lists in stream_keys
+    """
+    if not budget:
+        yield dumps(budget, indent=True)
+        return
+
+    stream_keys = set(stream_keys)
+    yield b"{"
+    for n, (key, value) in enumerate(budget.items()):
+        prefix = (b"," if n else b"") + b"\n  " + dumps(str(key)) + b": "
+        if key in stream_keys and isinstance(value, list) and value:
+            yield prefix + b"["
+            for i, element in enumerate(value):
+                yield (b"," if i else b"") + b"\n    " + _indented(element, 2)
+            yield b"\n  ]"
+        else:
+            yield prefix + _indented(value, 1)
+    yield b"\n}"
+
+
+class ExportCache:
+    """
+    In-memory LRU of finished exports keyed by (project, budget version, format).
+    Streams are recorded while they are sent and kept only if they complete and fit;
+    max_bytes = 0 disables caching.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        if not self.max_bytes:
+            return None
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Hashable, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def discard(self, predicate: Callable[[Hashable], bool]):
+        """Drop every entry whose key matches (e.g. all exports of a deleted project)"""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self._size -= len(self._entries.pop(key))
+
+    def record(self, key: Hashable, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Pass chunks through, keeping the whole export under key if it completes and fits"""
+        if not self.max_bytes:
+            return chunks
+        return self._recording(key, chunks)
+
+    def _recording(self, key: Hashable, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        recorded = []
+        size = 0
+        for chunk in chunks:
+            if recorded is not None:
+                size += len(chunk)
+                if size <= self.max_bytes:
+                    recorded.append(chunk)
+                else:
+                    recorded = None
+            yield chunk
+        if recorded is not None:
+            self.put(key, b"".join(recorded))
@@ -6,14 +6,28 @@ PREVALÊNCIA: Quantidades do DXF prevalecem sobre PDF
 """
 
 import ezdxf
+from ezdxf.addons import iterdxf
+from ezdxf.entities import factory
+from ezdxf.filemanagement import dxf_file_info
+from ezdxf.lldxf.extendedtags import ExtendedTags
+from ezdxf.lldxf.tagger import ascii_tags_loader, tag_compiler
 from ezdxf.math import Vec2, Vec3
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Tuple, Optional, Set
+import heapq
 import math
 from pathlib import Path
 from collections import Counter, defaultdict
+from array import array
 import re
 
+import numpy as np
+
+import geometry
+from dxf_preview import render_svg
+from geometry import PolylineBatch
+from spatial_index import PointGridIndex
+
 
 @dataclass
 class GeometricFeature:
@@ -102,6 +116,247 @@ class ProfileData:
         return round(base_time * complexity_factor + feature_time, 1)
 
 
+class ProfileStore:
+    """
+    Columnar (struct-of-arrays) storage for the extracted profiles.
+    Numeric fields live in compact array.array columns, viewed as NumPy arrays for
+    aggregates; layer, entity type, material and linetype are codes into one string
+    table. Analyzers still build a ProfileData per entity, which is unpacked on append().
+    """
+    
+    FLOAT_COLUMNS = (
+        'perimeter_mm', 'area_mm2', 'length_mm',
+        'min_x', 'min_y', 'max_x', 'max_y', 'width', 'height',
+        'centroid_x', 'centroid_y', 'complexity_score', 'thickness_hint'
+    )
+    INT_COLUMNS = ('is_closed', 'vertex_count', 'quantity', 'color')
+    STRING_COLUMNS = ('layer', 'entity_type', 'material_hint', 'linetype')
+    BBOX_KEYS = ('min_x', 'min_y', 'max_x', 'max_y', 'width', 'height')
+    
+    # Sentinels for None in numeric columns
+    NO_INT = -1
+    NO_FLOAT = math.nan
+    
+    def __init__(self):
+        self.profile_ids: List[str] = []
+        self._columns: Dict[str, array] = {name: array('d') for name in self.FLOAT_COLUMNS}
+        self._columns.update({name: array('q') for name in self.INT_COLUMNS + self.STRING_COLUMNS})
+        self._strings: List[str] = []
+        self._string_codes: Dict[str, int] = {}
+        # Features per profile as CSR: indices into the parser's feature list
+        self._feature_offsets = array('q', [0])
+        self._feature_indices = array('q')
+    
+    def __len__(self) -> int:
+        return len(self.profile_ids)
+    
+    def _encode(self, value: Optional[str]) -> int:
+        if value is None:
+            return self.NO_INT
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+    
+    def append(self, profile: 'ProfileData'):
+        columns = self._columns
+        bbox = profile.bounding_box
+        self.profile_ids.append(profile.profile_id)
+        columns['perimeter_mm'].append(profile.perimeter_mm)
+        columns['area_mm2'].append(profile.area_mm2)
+        columns['length_mm'].append(profile.length_mm)
+        for key in self.BBOX_KEYS:
+            columns[key].append(bbox[key])
+        columns['centroid_x'].append(profile.centroid[0])
+        columns['centroid_y'].append(profile.centroid[1])
+        columns['complexity_score'].append(profile.complexity_score)
+        columns['thickness_hint'].append(self.NO_FLOAT if profile.thickness_hint is None else profile.thickness_hint)
+        columns['is_closed'].append(1 if profile.is_closed else 0)
+        columns['vertex_count'].append(profile.vertex_count)
+        columns['quantity'].append(profile.quantity)
+        columns['color'].append(self.NO_INT if profile.color is None else profile.color)
+        columns['layer'].append(self._encode(profile.layer))
+        columns['entity_type'].append(self._encode(profile.entity_type))
+        columns['material_hint'].append(self._encode(profile.material_hint))
+        columns['linetype'].append(self._encode(profile.linetype))
+        self._feature_offsets.append(self._feature_offsets[-1])
+    
+    def column(self, name: str) -> np.ndarray:
+        """NumPy view of a numeric column (string columns give their codes)"""
+        dtype = np.float64 if name in self.FLOAT_COLUMNS else np.int64
+        return np.frombuffer(self._columns[name], dtype=dtype)
+    
+    def values(self, name: str) -> List[Any]:
+        """Plain Python values of one column (strings decoded, sentinels turned into None)"""
+        raw = self._columns[name].tolist()
+        if name in self.STRING_COLUMNS:
+            strings = self._strings
+            return [strings[code] if code >= 0 else None for code in raw]
+        if name == 'is_closed':
+            return [bool(v) for v in raw]
+        if name == 'color':
+            return [None if v == self.NO_INT else v for v in raw]
+        if name == 'thickness_hint':
+            return [None if v != v else v for v in raw]
+        return raw
+    
+    def set_column(self, name: str, values):
+        typecode = 'd' if name in self.FLOAT_COLUMNS else 'q'
+        values = np.asarray(values, dtype=np.float64 if typecode == 'd' else np.int64)
+        self._columns[name] = array(typecode, values.tobytes())
+    
+    def set_features(self, features_per_profile: List[List[int]]):
+        """Attach features (indices into the parser's feature list) to every profile"""
+        offsets = array('q', [0])
+        indices = array('q')
+        for feature_ids in features_per_profile:
+            indices.extend(feature_ids)
+            offsets.append(len(indices))
+        self._feature_offsets = offsets
+        self._feature_indices = indices
+    
+    def feature_indices(self, i: int) -> List[int]:
+        return self._feature_indices[self._feature_offsets[i]:self._feature_offsets[i + 1]].tolist()
+    
+    def scale(self, factor: float):
+        """Convert lengths/areas in place (centroids are left in drawing units, as before)"""
+        for name in ('perimeter_mm', 'length_mm', 'min_x', 'min_y', 'max_x', 'max_y', 'width', 'height'):
+            self.set_column(name, self.column(name) * factor)
+        self.set_column('area_mm2', self.column('area_mm2') * (factor ** 2))
+    
+    def weights(self, density_kg_m3: float = 2700) -> List[float]:
+        """ProfileData.calculate_weight() for every profile"""
+        perimeter = self.column('perimeter_mm')
+        area = self.column('area_mm2')
+        thickness = self.column('thickness_hint')
+        t = np.where(np.isnan(thickness) | (thickness == 0), 2.0, thickness)
+        solid = (self.column('is_closed') == 1) & (area > 0)
+        raw = np.where(solid, (area * t) / 1e9 * density_kg_m3,
+                       np.where(perimeter > 0, (perimeter * t * t) / 1e9 * density_kg_m3, 0.0))
+        return geometry.round_values(raw, 4)
+    
+    def machining_times(self, feature_times: List[float]) -> List[float]:
+        """ProfileData.calculate_machining_time() for every profile"""
+        times = np.asarray(feature_times, dtype=np.float64)
+        indices = np.frombuffer(self._feature_indices, dtype=np.int64)
+        offsets = np.frombuffer(self._feature_offsets, dtype=np.int64)
+        per_feature = times[indices] if len(indices) else np.zeros(0)
+        feature_time = np.zeros(len(self))
+        nonempty = offsets[1:] > offsets[:-1]
+        if nonempty.any():
+            feature_time[nonempty] = np.add.reduceat(per_feature, offsets[:-1][nonempty])
+        raw = 2.0 * self.column('complexity_score') + feature_time
+        return geometry.round_values(raw, 1)
+    
+    def layer_totals(self) -> List[Dict[str, Any]]:
+        """
+        Per-layer profile count, perimeter × quantity, area × quantity, quantity and
+        last material hint, in order of first appearance
+        """
+        codes = self.column('layer')
+        if not len(codes):
+            return []
+        size = len(self._strings)
+        quantity = self.column('quantity').astype(np.float64)
+        counts = np.bincount(codes, minlength=size).tolist()
+        perimeters = np.bincount(codes, weights=self.column('perimeter_mm') * quantity, minlength=size).tolist()
+        areas = np.bincount(codes, weights=self.column('area_mm2') * quantity, minlength=size).tolist()
+        quantities = np.bincount(codes, weights=quantity, minlength=size).tolist()
+        materials = {}
+        for code, material in zip(codes.tolist(), self._columns['material_hint'].tolist()):
+            if material >= 0:
+                materials[code] = self._strings[material]
+        unique_codes, first_seen = np.unique(codes, return_index=True)
+        return [
+            {
+                'layer': self._strings[code],
+                'count': counts[code],
+                'total_perimeter': perimeters[code],
+                'total_area': areas[code],
+                'total_quantity': int(quantities[code]),
+                'material': materials.get(code)
+            }
+            for code in unique_codes[np.argsort(first_seen)].tolist()
+        ]
+    
+    def __getitem__(self, i: int) -> 'ProfileData':
+        """Materialize one profile (features are left empty; see feature_indices)"""
+        columns = self._columns
+        color = columns['color'][i]
+        thickness = columns['thickness_hint'][i]
+        strings = self._strings
+        decode = lambda name: strings[columns[name][i]] if columns[name][i] >= 0 else None
+        return ProfileData(
+            profile_id=self.profile_ids[i],
+            layer=decode('layer'),
+            is_closed=bool(columns['is_closed'][i]),
+            perimeter_mm=columns['perimeter_mm'][i],
+            area_mm2=columns['area_mm2'][i],
+            bounding_box={key: columns[key][i] for key in self.BBOX_KEYS},
+            centroid=(columns['centroid_x'][i], columns['centroid_y'][i]),
+            vertex_count=columns['vertex_count'][i],
+            entity_type=decode('entity_type'),
+            color=None if color == self.NO_INT else color,
+            linetype=decode('linetype'),
+            complexity_score=columns['complexity_score'][i],
+            material_hint=decode('material_hint'),
+            thickness_hint=None if thickness != thickness else thickness,
+            quantity=columns['quantity'][i],
+            length_mm=columns['length_mm'][i]
+        )
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def to_dicts(self, features: List['GeometricFeature']) -> List[Dict[str, Any]]:
+        """Same dicts as ProfileData.to_dict(), built column-wise"""
+        feature_dicts = [f.to_dict() for f in features]
+        feature_indices = self._feature_indices.tolist()
+        offsets = self._feature_offsets.tolist()
+        weights = self.weights()
+        machining = self.machining_times([f.machining_time_mins for f in features])
+        bbox_columns = [self._columns[key].tolist() for key in self.BBOX_KEYS]
+        bbox_keys = self.BBOX_KEYS
+        
+        rounded = lambda name, ndigits: geometry.round_values(self.column(name), ndigits)
+        rows = zip(
+            self.profile_ids, self.values('layer'), self.values('is_closed'),
+            rounded('perimeter_mm', 2), rounded('area_mm2', 2), rounded('length_mm', 2),
+            zip(*bbox_columns), self.values('centroid_x'), self.values('centroid_y'),
+            self.values('vertex_count'), self.values('entity_type'), self.values('color'),
+            self.values('linetype'), rounded('complexity_score', 2), weights, machining,
+            self.values('material_hint'), self.values('thickness_hint'), self.values('quantity')
+        )
+        result = []
+        for i, (profile_id, layer, is_closed, perimeter, area, length, bbox, cx, cy, vertex_count,
+                entity_type, color, linetype, complexity, weight, machining_time,
+                material_hint, thickness_hint, quantity) in enumerate(rows):
+            result.append({
+                "profile_id": profile_id,
+                "layer": layer,
+                "is_closed": is_closed,
+                "perimeter_mm": perimeter,
+                "area_mm2": area,
+                "length_mm": length,
+                "bounding_box": dict(zip(bbox_keys, bbox)),
+                "centroid": (cx, cy),
+                "vertex_count": vertex_count,
+                "entity_type": entity_type,
+                "color": color,
+                "linetype": linetype,
+                "features": [feature_dicts[j] for j in feature_indices[offsets[i]:offsets[i + 1]]],
+                "complexity_score": complexity,
+                "weight_kg": weight,
+                "machining_time_mins": machining_time,
+                "material_hint": material_hint,
+                "thickness_hint": thickness_hint,
+                "quantity": quantity
+            })
+        return result
+
+
 @dataclass
 class DXFScale:
     """Scale information extracted from DXF"""
@@ -162,6 +417,9 @@ class DXFParser:
     Extração exaustiva com suporte a escalas, materiais e quantidades
     """
     
+    # Bump whenever parse() output changes (invalidates cached analyses)
+    PARSER_VERSION = "2.0.1"
+    
     HOLE_RADIUS_THRESHOLD_MM = 50.0
     
     # Conversão de unidades para mm
@@ -193,11 +451,40 @@ class DXFParser:
         r'n[ºo°]?\s*(\d+)',
     ]
     
-    def __init__(self, file_path: str):
+    # Raio (unidades do desenho) para associar um texto de quantidade a uma geometria
+    QUANTITY_SEARCH_RADIUS = 200
+    
+    # Meia largura da janela (unidades do desenho) para associar features a um perfil
+    FEATURE_SEARCH_HALF_SIZE = 100
+    
+    # A partir deste número de vértices as métricas de uma forma isolada usam NumPy
+    # (abaixo disso o custo fixo de criar arrays supera o ganho)
+    VECTORIZE_MIN_POINTS = 64
+    
+    # Modo streaming: polilinhas pendentes antes de calcular as métricas em lote
+    STREAM_BATCH_SIZE = 4096
+    
+    TEXT_TYPES = ['TEXT', 'MTEXT', 'ATTRIB', 'ATTDEF']
+    
+    # Entidades de geometria simples: tipo -> (prefixo do profile_id, método de análise)
+    SIMPLE_GEOMETRY_HANDLERS = {
+        'ARC': ('ARC', '_analyze_arc'),
+        'ELLIPSE': ('ELLIPSE', '_analyze_ellipse'),
+        'SPLINE': ('SPLINE', '_analyze_spline'),
+        'SOLID': ('SOLID', '_analyze_solid'),
+        '3DFACE': ('3DFACE', '_analyze_3dface'),
+        'HATCH': ('HATCH', '_analyze_hatch'),
+    }
+    
+    def __init__(self, file_path: str, streaming: bool = False):
         self.file_path = Path(file_path)
+        # Streaming mode reads the modelspace entity by entity (ezdxf iterdxf)
+        # instead of loading the whole document into memory
+        self.streaming = streaming
         self.doc = None
+        self.header: Dict[str, Any] = {}
         self.msp = None
-        self.profiles: List[ProfileData] = []
+        self.profiles = ProfileStore()
         self.features: List[GeometricFeature] = []
         self.file_info: Dict[str, Any] = {}
         self.scale_info: DXFScale = DXFScale()
@@ -207,31 +494,39 @@ class DXFParser:
         self.blocks_analyzed: Dict[str, Dict] = {}
         self.layers_info: Dict[str, Dict] = {}
         self.entity_counts: Dict[str, int] = defaultdict(int)
+        self._quantity_index: Optional[PointGridIndex] = None
+        self._entities_by_type: Dict[str, List[Any]] = defaultdict(list)
         
     def parse(self) -> Dict[str, Any]:
         """Main parsing method - EXHAUSTIVE analysis"""
         try:
-            self.doc = ezdxf.readfile(str(self.file_path))
-            self.msp = self.doc.modelspace()
-            
-            # 1. Extract file info and scales
-            self._extract_file_info()
-            self._extract_scale_info()
-            
-            # 2. Analyze all layers
-            self._analyze_layers()
-            
-            # 3. Extract ALL text entities
-            self._extract_all_texts()
-            
-            # 4. Extract dimension entities
-            self._extract_dimensions()
-            
-            # 5. Analyze blocks and their counts
-            self._analyze_blocks_exhaustive()
-            
-            # 6. Extract ALL geometry types
-            self._extract_all_geometry()
+            if self.streaming:
+                # 1-6. Same extraction, streamed from disk with bounded memory
+                self._parse_streaming()
+            else:
+                self.doc = ezdxf.readfile(str(self.file_path))
+                self.msp = self.doc.modelspace()
+                self.header = self.doc.header
+                
+                # 1. Extract file info and scales
+                self._extract_file_info()
+                self._extract_scale_info()
+                
+                # 2. Analyze all layers and route modelspace entities by type (single pass)
+                self._analyze_layers()
+                self._index_modelspace()
+                
+                # 3. Extract ALL text entities
+                self._extract_all_texts()
+                
+                # 4. Extract dimension entities
+                self._extract_dimensions()
+                
+                # 5. Analyze blocks and their counts
+                self._analyze_blocks_exhaustive()
+                
+                # 6. Extract ALL geometry types
+                self._extract_all_geometry()
             
             # 7. Detect features
             self._detect_all_features()
@@ -248,7 +543,7 @@ class DXFParser:
                 "file_info": self.file_info,
                 "scale_info": self.scale_info.to_dict(),
                 "layers": self.layers_info,
-                "profiles": [p.to_dict() for p in self.profiles],
+                "profiles": self.profiles.to_dicts(self.features),
                 "features_summary": self._get_features_summary(),
                 "features_detail": [f.to_dict() for f in self.features],
                 "material_quantities": [m.to_dict() for m in self.material_quantities],
@@ -256,19 +551,7 @@ class DXFParser:
                 "texts_extracted": self.texts_extracted,
                 "dimensions_extracted": self.dimensions_extracted,
                 "entity_counts": dict(self.entity_counts),
-                "statistics": {
-                    "total_profiles": len(self.profiles),
-                    "total_features": len(self.features),
-                    "total_perimeter_mm": sum(p.perimeter_mm * p.quantity for p in self.profiles),
-                    "total_area_mm2": sum(p.area_mm2 * p.quantity for p in self.profiles if p.is_closed),
-                    "total_length_mm": sum(p.length_mm * p.quantity for p in self.profiles),
-                    "estimated_weight_kg": sum(p.calculate_weight() * p.quantity for p in self.profiles),
-                    "estimated_machining_time_mins": sum(p.calculate_machining_time() * p.quantity for p in self.profiles),
-                    "total_material_items": len(self.material_quantities),
-                    "unique_layers": len(self.layers_info),
-                    "total_texts": len(self.texts_extracted),
-                    "total_dimensions": len(self.dimensions_extracted)
-                }
+                "statistics": self._compute_statistics()
             }
             
         except Exception as e:
@@ -280,6 +563,28 @@ class DXFParser:
                 "file_info": {"filename": self.file_path.name}
             }
     
+    def _compute_statistics(self) -> Dict[str, Any]:
+        """Drawing totals computed on the profile columns"""
+        profiles = self.profiles
+        quantity = profiles.column('quantity')
+        closed = profiles.column('is_closed') == 1
+        quantities = quantity.tolist()
+        weights = profiles.weights()
+        machining = profiles.machining_times([f.machining_time_mins for f in self.features])
+        return {
+            "total_profiles": len(profiles),
+            "total_features": len(self.features),
+            "total_perimeter_mm": sum((profiles.column('perimeter_mm') * quantity).tolist()),
+            "total_area_mm2": sum((profiles.column('area_mm2') * quantity)[closed].tolist()),
+            "total_length_mm": sum((profiles.column('length_mm') * quantity).tolist()),
+            "estimated_weight_kg": sum(w * q for w, q in zip(weights, quantities)),
+            "estimated_machining_time_mins": sum(t * q for t, q in zip(machining, quantities)),
+            "total_material_items": len(self.material_quantities),
+            "unique_layers": len(self.layers_info),
+            "total_texts": len(self.texts_extracted),
+            "total_dimensions": len(self.dimensions_extracted)
+        }
+    
     def _extract_file_info(self):
         """Extract comprehensive file information"""
         self.file_info = {
@@ -292,7 +597,7 @@ class DXFParser:
     def _detect_units(self) -> str:
         """Detect DXF units from header"""
         try:
-            units = self.doc.header.get('$INSUNITS', 0)
+            units = self.header.get('$INSUNITS', 0)
             unit_map = {
                 0: 'unitless', 1: 'inches', 2: 'feet', 3: 'miles',
                 4: 'mm', 5: 'cm', 6: 'm', 7: 'km',
@@ -308,7 +613,7 @@ class DXFParser:
     
     def _extract_scale_info(self):
         """Extract all scale-related information from DXF"""
-        header = self.doc.header
+        header = self.header
         
         try:
             self.scale_info.dimscale = header.get('$DIMSCALE', 1.0)
@@ -320,9 +625,9 @@ class DXFParser:
         except:
             pass
         
-        # Check viewports
+        # Check viewports (paperspace layouts are not read in streaming mode)
         try:
-            for layout in self.doc.layouts:
+            for layout in (self.doc.layouts if self.doc is not None else []):
                 if layout.name != 'Model':
                     for entity in layout:
                         if entity.dxftype() == 'VIEWPORT':
@@ -347,32 +652,186 @@ class DXFParser:
         """Analyze all layers in the DXF"""
         try:
             for layer in self.doc.layers:
-                layer_name = layer.dxf.name
-                self.layers_info[layer_name] = {
-                    "name": layer_name,
-                    "color": layer.color,
-                    "is_on": layer.is_on(),
-                    "is_frozen": layer.is_frozen(),
-                    "linetype": layer.dxf.linetype,
-                    "entity_count": 0,
-                    "material_hint": self._detect_material_from_name(layer_name),
-                    "profiles_count": 0,
-                    "total_length_mm": 0.0
-                }
+                self._register_layer(layer)
         except:
             pass
-        
-        # Count entities per layer
+    
+    def _register_layer(self, layer):
+        layer_name = layer.dxf.name
+        self.layers_info[layer_name] = {
+            "name": layer_name,
+            "color": layer.color,
+            "is_on": layer.is_on(),
+            "is_frozen": layer.is_frozen(),
+            "linetype": layer.dxf.linetype,
+            "entity_count": 0,
+            "material_hint": self._detect_material_from_name(layer_name),
+            "profiles_count": 0,
+            "total_length_mm": 0.0
+        }
+    
+    def _index_modelspace(self):
+        """Walk the modelspace once: count entities per type/layer and bucket them by dxftype()"""
         for entity in self.msp:
             try:
-                layer = entity.dxf.layer
-                etype = entity.dxftype()
-                self.entity_counts[etype] += 1
-                if layer in self.layers_info:
-                    self.layers_info[layer]["entity_count"] += 1
+                self._entities_by_type[entity.dxftype()].append(entity)
+                self._count_entity(entity)
             except:
                 pass
     
+    def _count_entity(self, entity):
+        layer = entity.dxf.layer
+        etype = entity.dxftype()
+        self.entity_counts[etype] += 1
+        if layer in self.layers_info:
+            self.layers_info[layer]["entity_count"] += 1
+    
+    def _entities(self, dxftype: str) -> List[Any]:
+        """Modelspace entities of one type, in drawing order (see _index_modelspace)"""
+        return self._entities_by_type.get(dxftype, [])
+    
+    # ---------------------------------------------------------------- streaming
+    
+    def _parse_streaming(self):
+        """
+        Streaming ingestion: the file is read tag by tag and only one entity is held at a time.
+        Two modelspace passes: texts first (quantity hints must be known before geometry),
+        then every other entity through the same per-entity handlers as parse().
+        Paperspace viewports are not read, so viewport scales stay empty.
+        """
+        filename = str(self.file_path)
+        info = dxf_file_info(filename)
+        self.header = self._read_streaming_header(['$INSUNITS', '$DIMSCALE', '$LTSCALE'])
+        self.file_info = {
+            "filename": self.file_path.name,
+            "dxf_version": info.version,
+            "encoding": info.encoding,
+            "units": self._detect_units()
+        }
+        self._extract_scale_info()
+        
+        for layer in self._stream_section_entities('TABLES', {'LAYER'}):
+            try:
+                self._register_layer(layer)
+            except:
+                continue
+        
+        for entity in iterdxf.modelspace(filename, types=self.TEXT_TYPES):
+            self._extract_text(entity, entity.dxftype())
+        # Same order as the per-type extraction (TEXT, MTEXT, ATTRIB, ATTDEF)
+        self.texts_extracted.sort(key=lambda text: self.TEXT_TYPES.index(text["type"]))
+        
+        block_counts = Counter()
+        self._stream_geometry(iterdxf.modelspace(filename), block_counts)
+        self._stream_blocks(block_counts)
+    
+    def _stream_geometry(self, entities, block_counts: Counter):
+        """Route streamed modelspace entities to their handlers by dxftype()"""
+        profile_count = 0
+        self._quantity_index = self._build_quantity_index()
+        pending = []
+        line_groups: Dict[str, Dict[str, float]] = {}
+        
+        for entity in entities:
+            try:
+                self._count_entity(entity)
+                etype = entity.dxftype()
+            except:
+                continue
+            
+            if etype in ('LWPOLYLINE', 'POLYLINE'):
+                profile_count += 1
+                prefix = 'LWPOLY' if etype == 'LWPOLYLINE' else 'POLY'
+                pending.append(self._pending_polyline(entity, f"{prefix}_{profile_count:04d}"))
+                if len(pending) >= self.STREAM_BATCH_SIZE:
+                    self._flush_polylines(pending)
+            elif etype == 'CIRCLE':
+                profile_count += 1
+                self._process_circle(entity, profile_count)
+            elif etype in self.SIMPLE_GEOMETRY_HANDLERS:
+                profile_count += 1
+                prefix, method = self.SIMPLE_GEOMETRY_HANDLERS[etype]
+                profile = getattr(self, method)(entity, f"{prefix}_{profile_count:04d}")
+                if profile:
+                    self.profiles.append(profile)
+            elif etype == 'LINE':
+                self._add_line(line_groups, entity)
+            elif etype == 'DIMENSION':
+                self._extract_dimension(entity)
+            elif etype == 'INSERT':
+                self._count_insert(block_counts, entity)
+        
+        self._flush_polylines(pending)
+        for layer, group in line_groups.items():
+            profile_count += 1
+            self.profiles.append(self._line_group_profile(layer, group, profile_count))
+        
+        self._update_layer_statistics()
+    
+    def _stream_blocks(self, block_counts: Counter):
+        """Analyze the definitions of inserted blocks, one block's entities in memory at a time"""
+        if not block_counts:
+            return
+        types = (iterdxf.SUPPORTED_TYPES - {'VERTEX', 'SEQEND', 'ATTRIB'}) | {'BLOCK', 'ENDBLK'}
+        block_name = None
+        block_entities = []
+        for entity in self._stream_section_entities('BLOCKS', types):
+            etype = entity.dxftype()
+            if etype == 'BLOCK':
+                name = entity.dxf.name
+                block_name = name if name in block_counts else None
+                block_entities = []
+            elif etype == 'ENDBLK':
+                if block_name is not None:
+                    try:
+                        self._analyze_block(block_name, block_counts[block_name], block_entities)
+                    except:
+                        pass
+                block_name = None
+                block_entities = []
+            elif block_name is not None:
+                block_entities.append(entity)
+    
+    def _stream_section_tags(self, section: str):
+        """Compiled DXF tags of one section, read sequentially from disk"""
+        info = dxf_file_info(str(self.file_path))
+        with open(self.file_path, mode='rt', encoding=info.encoding, errors='surrogateescape') as fp:
+            in_section = False
+            prev_code, prev_value = -1, None
+            for tag in tag_compiler(ascii_tags_loader(fp)):
+                if in_section:
+                    if tag.code == 0 and tag.value == 'ENDSEC':
+                        return
+                    yield tag
+                elif tag.code == 2 and prev_code == 0 and prev_value == 'SECTION':
+                    in_section = tag.value == section
+                prev_code, prev_value = tag.code, tag.value
+    
+    def _stream_section_entities(self, section: str, types: Set[str]):
+        """Entities of the requested types in one section (tables, blocks), loaded one by one"""
+        tags = []
+        for tag in self._stream_section_tags(section):
+            if tag.code == 0:
+                if tags and tags[0].value in types:
+                    yield factory.load(ExtendedTags(tags))
+                tags = [tag]
+            elif tags:
+                tags.append(tag)
+        if tags and tags[0].value in types:
+            yield factory.load(ExtendedTags(tags))
+    
+    def _read_streaming_header(self, names: List[str]) -> Dict[str, Any]:
+        """Selected HEADER variables, without loading the document"""
+        header = {}
+        current = None
+        for tag in self._stream_section_tags('HEADER'):
+            if tag.code == 9:
+                current = tag.value if tag.value in names else None
+            elif current is not None:
+                header[current] = tag.value
+                current = None
+        return header
+    
     def _detect_material_from_name(self, name: str) -> Optional[str]:
         """Detect material type from layer/block name"""
         name_lower = name.lower()
@@ -383,42 +842,43 @@ class DXFParser:
     
     def _extract_all_texts(self):
         """Extract ALL text entities for analysis"""
-        text_types = ['TEXT', 'MTEXT', 'ATTRIB', 'ATTDEF']
-        
-        for text_type in text_types:
-            for entity in self.msp.query(text_type):
-                try:
-                    if text_type in ['TEXT', 'ATTRIB', 'ATTDEF']:
-                        content = entity.dxf.text
-                        pos = (entity.dxf.insert.x, entity.dxf.insert.y)
-                        height = getattr(entity.dxf, 'height', 0)
-                    else:
-                        content = entity.text
-                        pos = (entity.dxf.insert.x, entity.dxf.insert.y)
-                        height = getattr(entity.dxf, 'char_height', 0)
-                    
-                    if content and content.strip():
-                        # Clean MTEXT formatting codes
-                        clean_content = re.sub(r'\\[A-Za-z][^;]*;', '', content)
-                        clean_content = re.sub(r'\{|\}', '', clean_content)
-                        clean_content = clean_content.strip()
-                        
-                        if clean_content:
-                            text_data = {
-                                "content": clean_content,
-                                "raw_content": content,
-                                "position": pos,
-                                "layer": entity.dxf.layer,
-                                "type": text_type,
-                                "height": height,
-                                "quantity_hint": self._extract_quantity_from_text(clean_content),
-                                "material_hint": self._detect_material_from_name(clean_content),
-                                "dimension_values": self._extract_dimension_values(clean_content),
-                                "profile_reference": self._extract_profile_reference(clean_content)
-                            }
-                            self.texts_extracted.append(text_data)
-                except:
-                    continue
+        for text_type in self.TEXT_TYPES:
+            for entity in self._entities(text_type):
+                self._extract_text(entity, text_type)
+    
+    def _extract_text(self, entity, text_type: str):
+        try:
+            if text_type in ['TEXT', 'ATTRIB', 'ATTDEF']:
+                content = entity.dxf.text
+                pos = (entity.dxf.insert.x, entity.dxf.insert.y)
+                height = getattr(entity.dxf, 'height', 0)
+            else:
+                content = entity.text
+                pos = (entity.dxf.insert.x, entity.dxf.insert.y)
+                height = getattr(entity.dxf, 'char_height', 0)
+            
+            if content and content.strip():
+                # Clean MTEXT formatting codes
+                clean_content = re.sub(r'\\[A-Za-z][^;]*;', '', content)
+                clean_content = re.sub(r'\{|\}', '', clean_content)
+                clean_content = clean_content.strip()
+                
+                if clean_content:
+                    text_data = {
+                        "content": clean_content,
+                        "raw_content": content,
+                        "position": pos,
+                        "layer": entity.dxf.layer,
+                        "type": text_type,
+                        "height": height,
+                        "quantity_hint": self._extract_quantity_from_text(clean_content),
+                        "material_hint": self._detect_material_from_name(clean_content),
+                        "dimension_values": self._extract_dimension_values(clean_content),
+                        "profile_reference": self._extract_profile_reference(clean_content)
+                    }
+                    self.texts_extracted.append(text_data)
+        except:
+            pass
     
     def _extract_quantity_from_text(self, text: str) -> Optional[int]:
         """Extract quantity from text content"""
@@ -467,212 +927,270 @@ class DXFParser:
     
     def _extract_dimensions(self):
         """Extract DIMENSION entities"""
-        for entity in self.msp.query('DIMENSION'):
+        for entity in self._entities('DIMENSION'):
+            self._extract_dimension(entity)
+    
+    def _extract_dimension(self, entity):
+        try:
+            dim_data = {
+                "type": entity.dxftype(),
+                "layer": entity.dxf.layer,
+                "measurement": None,
+                "text_override": None
+            }
+            
+            # Try to get actual measurement
             try:
-                dim_data = {
-                    "type": entity.dxftype(),
-                    "layer": entity.dxf.layer,
-                    "measurement": None,
-                    "text_override": None
-                }
-                
-                # Try to get actual measurement
-                try:
-                    if hasattr(entity, 'measurement'):
-                        dim_data["measurement"] = entity.measurement
-                except:
-                    pass
-                
-                # Get text override if present
-                try:
-                    dim_data["text_override"] = entity.dxf.text
-                except:
-                    pass
-                
-                if dim_data["measurement"] or dim_data["text_override"]:
-                    self.dimensions_extracted.append(dim_data)
+                if hasattr(entity, 'measurement'):
+                    dim_data["measurement"] = entity.measurement
             except:
-                continue
+                pass
+            
+            # Get text override if present
+            try:
+                dim_data["text_override"] = entity.dxf.text
+            except:
+                pass
+            
+            if dim_data["measurement"] or dim_data["text_override"]:
+                self.dimensions_extracted.append(dim_data)
+        except:
+            pass
     
     def _analyze_blocks_exhaustive(self):
         """Analyze block definitions and insertions exhaustively"""
         block_counts = Counter()
         
         # Count all block insertions
-        for insert in self.msp.query('INSERT'):
-            try:
-                block_name = insert.dxf.name
-                block_counts[block_name] += 1
-            except:
-                continue
+        for insert in self._entities('INSERT'):
+            self._count_insert(block_counts, insert)
         
         # Analyze each unique block
         for block_name, count in block_counts.items():
             try:
                 block = self.doc.blocks.get(block_name)
                 if block:
-                    block_data = {
-                        "name": block_name,
-                        "count": count,
-                        "entities": defaultdict(int),
-                        "total_perimeter": 0.0,
-                        "total_area": 0.0,
-                        "material_hint": self._detect_material_from_name(block_name),
-                        "attributes": []
-                    }
-                    
-                    # Analyze block content
-                    for entity in block:
-                        etype = entity.dxftype()
-                        block_data["entities"][etype] += 1
-                        
-                        if etype == 'LWPOLYLINE':
-                            points = list(entity.get_points('xy'))
-                            block_data["total_perimeter"] += self._calculate_perimeter(points, entity.closed)
-                            if entity.closed:
-                                block_data["total_area"] += abs(self._calculate_area(points))
-                        elif etype == 'LINE':
-                            length = math.sqrt(
-                                (entity.dxf.end.x - entity.dxf.start.x)**2 +
-                                (entity.dxf.end.y - entity.dxf.start.y)**2
-                            )
-                            block_data["total_perimeter"] += length
-                        elif etype == 'CIRCLE':
-                            block_data["total_perimeter"] += 2 * math.pi * entity.dxf.radius
-                            block_data["total_area"] += math.pi * entity.dxf.radius**2
-                        elif etype == 'ATTDEF':
-                            block_data["attributes"].append({
-                                "tag": entity.dxf.tag,
-                                "default": entity.dxf.text
-                            })
-                    
-                    block_data["entities"] = dict(block_data["entities"])
-                    self.blocks_analyzed[block_name] = block_data
+                    self._analyze_block(block_name, count, block)
             except:
                 continue
     
+    @staticmethod
+    def _count_insert(block_counts: Counter, insert):
+        try:
+            block_counts[insert.dxf.name] += 1
+        except:
+            pass
+    
+    def _analyze_block(self, block_name: str, count: int, entities):
+        """Analyze the content of one block definition inserted `count` times"""
+        block_data = {
+            "name": block_name,
+            "count": count,
+            "entities": defaultdict(int),
+            "total_perimeter": 0.0,
+            "total_area": 0.0,
+            "material_hint": self._detect_material_from_name(block_name),
+            "attributes": []
+        }
+        
+        # Analyze block content
+        for entity in entities:
+            etype = entity.dxftype()
+            block_data["entities"][etype] += 1
+            
+            if etype == 'LWPOLYLINE':
+                points = list(entity.get_points('xy'))
+                block_data["total_perimeter"] += self._calculate_perimeter(points, entity.closed)
+                if entity.closed:
+                    block_data["total_area"] += abs(self._calculate_area(points))
+            elif etype == 'LINE':
+                length = math.sqrt(
+                    (entity.dxf.end.x - entity.dxf.start.x)**2 +
+                    (entity.dxf.end.y - entity.dxf.start.y)**2
+                )
+                block_data["total_perimeter"] += length
+            elif etype == 'CIRCLE':
+                block_data["total_perimeter"] += 2 * math.pi * entity.dxf.radius
+                block_data["total_area"] += math.pi * entity.dxf.radius**2
+            elif etype == 'ATTDEF':
+                block_data["attributes"].append({
+                    "tag": entity.dxf.tag,
+                    "default": entity.dxf.text
+                })
+        
+        block_data["entities"] = dict(block_data["entities"])
+        self.blocks_analyzed[block_name] = block_data
+    
     def _extract_all_geometry(self):
         """Extract ALL geometry types"""
         profile_count = 0
+        self._quantity_index = self._build_quantity_index()
         
-        # LWPOLYLINE
-        for entity in self.msp.query('LWPOLYLINE'):
+        # LWPOLYLINE (metrics for all polylines computed in one batch)
+        pending = []
+        for entity in self._entities('LWPOLYLINE'):
             profile_count += 1
-            profile = self._analyze_lwpolyline(entity, f"LWPOLY_{profile_count:04d}")
-            if profile:
-                self.profiles.append(profile)
+            pending.append(self._pending_polyline(entity, f"LWPOLY_{profile_count:04d}"))
+        self._flush_polylines(pending)
         
         # POLYLINE
-        for entity in self.msp.query('POLYLINE'):
+        for entity in self._entities('POLYLINE'):
             profile_count += 1
-            profile = self._analyze_polyline(entity, f"POLY_{profile_count:04d}")
-            if profile:
-                self.profiles.append(profile)
+            pending.append(self._pending_polyline(entity, f"POLY_{profile_count:04d}"))
+        self._flush_polylines(pending)
         
         # CIRCLE
-        for entity in self.msp.query('CIRCLE'):
+        for entity in self._entities('CIRCLE'):
             profile_count += 1
             self._process_circle(entity, profile_count)
         
         # ARC
-        for entity in self.msp.query('ARC'):
+        for entity in self._entities('ARC'):
             profile_count += 1
             profile = self._analyze_arc(entity, f"ARC_{profile_count:04d}")
             if profile:
                 self.profiles.append(profile)
         
         # ELLIPSE
-        for entity in self.msp.query('ELLIPSE'):
+        for entity in self._entities('ELLIPSE'):
             profile_count += 1
             profile = self._analyze_ellipse(entity, f"ELLIPSE_{profile_count:04d}")
             if profile:
                 self.profiles.append(profile)
         
         # LINE (group significant lines)
-        lines_by_layer = defaultdict(list)
-        for entity in self.msp.query('LINE'):
-            try:
-                start = (entity.dxf.start.x, entity.dxf.start.y)
-                end = (entity.dxf.end.x, entity.dxf.end.y)
-                length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
-                if length > 1:  # Ignore tiny lines
-                    lines_by_layer[entity.dxf.layer].append({
-                        'start': start, 'end': end, 'length': length
-                    })
-            except:
-                continue
+        line_groups: Dict[str, Dict[str, float]] = {}
+        for entity in self._entities('LINE'):
+            self._add_line(line_groups, entity)
         
         # Create profiles from line groups
-        for layer, lines in lines_by_layer.items():
-            if lines:
-                profile_count += 1
-                total_length = sum(l['length'] for l in lines)
-                all_points = []
-                for l in lines:
-                    all_points.extend([l['start'], l['end']])
-                
-                self.profiles.append(ProfileData(
-                    profile_id=f"LINES_{layer}_{profile_count:04d}",
-                    layer=layer,
-                    is_closed=False,
-                    perimeter_mm=total_length,
-                    area_mm2=0,
-                    length_mm=total_length,
-                    bounding_box=self._calculate_bounding_box(all_points),
-                    centroid=self._calculate_centroid(all_points),
-                    vertex_count=len(lines) * 2,
-                    entity_type='LINE_GROUP',
-                    quantity=len(lines),
-                    material_hint=self._detect_material_from_name(layer)
-                ))
+        for layer, group in line_groups.items():
+            profile_count += 1
+            self.profiles.append(self._line_group_profile(layer, group, profile_count))
         
         # SPLINE
-        for entity in self.msp.query('SPLINE'):
+        for entity in self._entities('SPLINE'):
             profile_count += 1
             profile = self._analyze_spline(entity, f"SPLINE_{profile_count:04d}")
             if profile:
                 self.profiles.append(profile)
         
         # SOLID
-        for entity in self.msp.query('SOLID'):
+        for entity in self._entities('SOLID'):
             profile_count += 1
             profile = self._analyze_solid(entity, f"SOLID_{profile_count:04d}")
             if profile:
                 self.profiles.append(profile)
         
         # 3DFACE
-        for entity in self.msp.query('3DFACE'):
+        for entity in self._entities('3DFACE'):
             profile_count += 1
             profile = self._analyze_3dface(entity, f"3DFACE_{profile_count:04d}")
             if profile:
                 self.profiles.append(profile)
         
         # HATCH
-        for entity in self.msp.query('HATCH'):
+        for entity in self._entities('HATCH'):
             profile_count += 1
             profile = self._analyze_hatch(entity, f"HATCH_{profile_count:04d}")
             if profile:
                 self.profiles.append(profile)
         
-        # Update layer statistics
-        for profile in self.profiles:
-            layer = profile.layer
+        self._update_layer_statistics()
+    
+    def _update_layer_statistics(self):
+        for totals in self.profiles.layer_totals():
+            layer = totals['layer']
             if layer in self.layers_info:
-                self.layers_info[layer]["profiles_count"] += 1
-                self.layers_info[layer]["total_length_mm"] += profile.perimeter_mm * profile.quantity
+                self.layers_info[layer]["profiles_count"] += totals['count']
+                self.layers_info[layer]["total_length_mm"] += totals['total_perimeter']
     
-    def _analyze_lwpolyline(self, entity, profile_id: str) -> Optional[ProfileData]:
-        """Analyze a lightweight polyline"""
+    @staticmethod
+    def _pending_polyline(entity, profile_id: str) -> Tuple[str, Any, List[Tuple[float, float]], bool]:
+        """(profile_id, entity, points, closed) of a LWPOLYLINE/POLYLINE awaiting batch metrics"""
+        try:
+            if entity.dxftype() == 'LWPOLYLINE':
+                return (profile_id, entity, list(entity.get_points('xy')), entity.closed)
+            points = [(v.dxf.location.x, v.dxf.location.y) for v in entity.vertices]
+            return (profile_id, entity, points, entity.is_closed)
+        except:
+            return (profile_id, entity, [], False)
+    
+    def _flush_polylines(self, pending: List[Tuple[str, Any, List[Tuple[float, float]], bool]]):
+        """Analyze pending polylines with one batch of NumPy metrics, then empty the list"""
+        for (profile_id, entity, points, is_closed), metrics in zip(pending, self._batch_polyline_metrics(pending)):
+            if entity.dxftype() == 'LWPOLYLINE':
+                profile = self._analyze_lwpolyline(entity, profile_id, points, is_closed, metrics)
+            else:
+                profile = self._analyze_polyline(entity, profile_id, points, is_closed, metrics)
+            if profile:
+                self.profiles.append(profile)
+        pending.clear()
+    
+    @staticmethod
+    def _batch_polyline_metrics(polylines: List[Tuple[str, Any, List[Tuple[float, float]], bool]]) -> List[Tuple]:
+        """(perimeter, area, bounding box, centroid) for every pending polyline in one NumPy batch"""
+        if not polylines:
+            return []
+        batch = PolylineBatch([p[2] for p in polylines], [p[3] for p in polylines])
+        return list(zip(batch.perimeters().tolist(), batch.areas().tolist(),
+                        batch.bounding_boxes(), batch.centroids()))
+    
+    @staticmethod
+    def _add_line(line_groups: Dict[str, Dict[str, float]], entity):
+        """Accumulate a LINE into its layer's group (running totals, the lines themselves are not kept)"""
+        try:
+            start = (entity.dxf.start.x, entity.dxf.start.y)
+            end = (entity.dxf.end.x, entity.dxf.end.y)
+            length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
+            if length > 1:  # Ignore tiny lines
+                group = line_groups.get(entity.dxf.layer)
+                if group is None:
+                    group = line_groups[entity.dxf.layer] = {
+                        'count': 0, 'total_length': 0.0, 'sum_x': 0.0, 'sum_y': 0.0,
+                        'min_x': math.inf, 'min_y': math.inf, 'max_x': -math.inf, 'max_y': -math.inf
+                    }
+                group['count'] += 1
+                group['total_length'] += length
+                for x, y in (start, end):
+                    group['sum_x'] += x
+                    group['sum_y'] += y
+                    group['min_x'] = min(group['min_x'], x)
+                    group['min_y'] = min(group['min_y'], y)
+                    group['max_x'] = max(group['max_x'], x)
+                    group['max_y'] = max(group['max_y'], y)
+        except:
+            pass
+    
+    def _line_group_profile(self, layer: str, group: Dict[str, float], count: int) -> ProfileData:
+        n_points = group['count'] * 2
+        return ProfileData(
+            profile_id=f"LINES_{layer}_{count:04d}",
+            layer=layer,
+            is_closed=False,
+            perimeter_mm=group['total_length'],
+            area_mm2=0,
+            length_mm=group['total_length'],
+            bounding_box=geometry.bounding_box_from_bounds(
+                group['min_x'], group['min_y'], group['max_x'], group['max_y']
+            ),
+            centroid=(round(group['sum_x'] / n_points, 2), round(group['sum_y'] / n_points, 2)),
+            vertex_count=n_points,
+            entity_type='LINE_GROUP',
+            quantity=group['count'],
+            material_hint=self._detect_material_from_name(layer)
+        )
+    
+    def _analyze_lwpolyline(self, entity, profile_id: str, points: List[Tuple[float, float]],
+                            is_closed: bool, metrics: Tuple) -> Optional[ProfileData]:
+        """Analyze a lightweight polyline (geometry metrics precomputed in batch)"""
         try:
-            points = list(entity.get_points('xy'))
             if len(points) < 2:
                 return None
             
-            is_closed = entity.closed
-            perimeter = self._calculate_perimeter(points, is_closed)
-            area_val = self._calculate_area(points) if is_closed else 0.0
-            bbox = self._calculate_bounding_box(points)
-            centroid = self._calculate_centroid(points)
+            perimeter, area_val, bbox, centroid = metrics
+            if not is_closed:
+                area_val = 0.0
             
             layer = entity.dxf.layer
             quantity = self._find_quantity_near_position(centroid)
@@ -698,18 +1216,16 @@ class DXFParser:
         except:
             return None
     
-    def _analyze_polyline(self, entity, profile_id: str) -> Optional[ProfileData]:
-        """Analyze a polyline"""
+    def _analyze_polyline(self, entity, profile_id: str, points: List[Tuple[float, float]],
+                          is_closed: bool, metrics: Tuple) -> Optional[ProfileData]:
+        """Analyze a polyline (geometry metrics precomputed in batch)"""
         try:
-            points = [(v.dxf.location.x, v.dxf.location.y) for v in entity.vertices]
             if len(points) < 2:
                 return None
             
-            is_closed = entity.is_closed
-            perimeter = self._calculate_perimeter(points, is_closed)
-            area_val = self._calculate_area(points) if is_closed else 0.0
-            bbox = self._calculate_bounding_box(points)
-            centroid = self._calculate_centroid(points)
+            perimeter, area_val, bbox, centroid = metrics
+            if not is_closed:
+                area_val = 0.0
             layer = entity.dxf.layer
             
             return ProfileData(
@@ -977,72 +1493,99 @@ class DXFParser:
         except:
             return None
     
-    def _find_quantity_near_position(self, position: Tuple[float, float], radius: float = 200) -> int:
-        """Find quantity hint from nearby text entities"""
+    def _build_quantity_index(self) -> PointGridIndex:
+        """Grid index over the texts that carry a quantity hint (built once per parse)"""
+        index = PointGridIndex(cell_size=self.QUANTITY_SEARCH_RADIUS)
         for text in self.texts_extracted:
             if text.get('quantity_hint'):
                 text_pos = text.get('position', (0, 0))
-                dist = math.sqrt((position[0] - text_pos[0])**2 + (position[1] - text_pos[1])**2)
-                if dist < radius:
-                    return text['quantity_hint']
-        return 1
+                index.insert(text_pos[0], text_pos[1], text['quantity_hint'])
+        return index
+    
+    def _find_quantity_near_position(self, position: Tuple[float, float], radius: float = QUANTITY_SEARCH_RADIUS) -> int:
+        """Find quantity hint from nearby text entities"""
+        if self._quantity_index is None:
+            self._quantity_index = self._build_quantity_index()
+        # First hint in extraction order within the radius (same result as the old linear scan)
+        quantity = self._quantity_index.first_within_radius(position[0], position[1], radius)
+        return quantity if quantity is not None else 1
     
     def _detect_all_features(self):
         """Detect all machining features"""
-        for profile in self.profiles:
+        profiles = self.profiles
+        rows = zip(profiles.values('vertex_count'), profiles.values('centroid_x'), profiles.values('centroid_y'),
+                   profiles.values('width'), profiles.values('height'),
+                   profiles.values('layer'), profiles.values('entity_type'))
+        for vertex_count, cx, cy, width, height, layer, entity_type in rows:
             # Complex profiles have notches
-            if profile.vertex_count > 8:
-                notch_prob = min(1.0, (profile.vertex_count - 4) / 20)
+            if vertex_count > 8:
+                notch_prob = min(1.0, (vertex_count - 4) / 20)
                 if notch_prob > 0.3:
                     self.features.append(GeometricFeature(
                         feature_type='notch',
-                        position=profile.centroid,
-                        dimensions={'complexity': profile.vertex_count},
-                        layer=profile.layer,
-                        entity_type=profile.entity_type,
+                        position=(cx, cy),
+                        dimensions={'complexity': vertex_count},
+                        layer=layer,
+                        entity_type=entity_type,
                         machining_time_mins=8.0 * notch_prob
                     ))
             
             # Detect slots
-            bbox = profile.bounding_box
-            if bbox['width'] > 0 and bbox['height'] > 0:
-                aspect = max(bbox['width'], bbox['height']) / min(bbox['width'], bbox['height'])
-                if aspect > 5 and min(bbox['width'], bbox['height']) < 20:
+            if width > 0 and height > 0:
+                aspect = max(width, height) / min(width, height)
+                if aspect > 5 and min(width, height) < 20:
                     self.features.append(GeometricFeature(
                         feature_type='slot',
-                        position=profile.centroid,
+                        position=(cx, cy),
                         dimensions={
-                            'width': min(bbox['width'], bbox['height']),
-                            'length': max(bbox['width'], bbox['height'])
+                            'width': min(width, height),
+                            'length': max(width, height)
                         },
-                        layer=profile.layer,
-                        entity_type=profile.entity_type,
+                        layer=layer,
+                        entity_type=entity_type,
                         machining_time_mins=6.0
                     ))
     
     def _calculate_complexity(self):
         """Calculate complexity score for each profile"""
-        for profile in self.profiles:
-            vertex_factor = 1.0 + (profile.vertex_count - 4) * 0.05
+        # Features indexed by layer and by a uniform grid (built once, not per profile)
+        features_by_layer: Dict[str, List[int]] = defaultdict(list)
+        feature_index = PointGridIndex(cell_size=self.FEATURE_SEARCH_HALF_SIZE)
+        for i, feature in enumerate(self.features):
+            features_by_layer[feature.layer].append(i)
+            feature_index.insert(feature.position[0], feature.position[1], i)
+        
+        profiles = self.profiles
+        scores = []
+        features_per_profile = []
+        rows = zip(profiles.values('vertex_count'), profiles.values('centroid_x'), profiles.values('centroid_y'),
+                   profiles.values('width'), profiles.values('height'), profiles.values('layer'))
+        for vertex_count, cx, cy, width, height, layer in rows:
+            vertex_factor = 1.0 + (vertex_count - 4) * 0.05
             vertex_factor = max(1.0, min(vertex_factor, 2.0))
             
-            # Count features near this profile
-            profile_features = [f for f in self.features 
-                              if f.layer == profile.layer or 
-                              (abs(f.position[0] - profile.centroid[0]) < 100 and 
-                               abs(f.position[1] - profile.centroid[1]) < 100)]
+            # Profile features = the whole layer + nearby features from other layers,
+            # in feature order (the layer list is shared when nothing else is nearby)
+            layer_features = features_by_layer.get(layer, [])
+            nearby_other = [
+                i for i in feature_index.within_box(cx, cy, self.FEATURE_SEARCH_HALF_SIZE)
+                if self.features[i].layer != layer
+            ]
+            profile_features = list(heapq.merge(layer_features, nearby_other)) if nearby_other else layer_features
             feature_factor = 1.0 + len(profile_features) * 0.15
             
-            bbox = profile.bounding_box
-            if bbox['height'] > 0 and bbox['width'] > 0:
-                aspect = max(bbox['width'], bbox['height']) / min(bbox['width'], bbox['height'])
+            if height > 0 and width > 0:
+                aspect = max(width, height) / min(width, height)
                 aspect_factor = 1.0 + (aspect - 1) * 0.03
                 aspect_factor = min(aspect_factor, 1.3)
             else:
                 aspect_factor = 1.0
             
-            profile.complexity_score = min(3.0, vertex_factor * feature_factor * aspect_factor)
-            profile.features = profile_features
+            scores.append(min(3.0, vertex_factor * feature_factor * aspect_factor))
+            features_per_profile.append(profile_features)
+        
+        profiles.set_column('complexity_score', scores)
+        profiles.set_features(features_per_profile)
     
     def _compile_material_quantities(self):
         """Compile material quantities from all sources"""
@@ -1065,21 +1608,8 @@ class DXFParser:
                 ))
         
         # From layers
-        layer_aggregates = defaultdict(lambda: {
-            'count': 0, 'total_perimeter': 0, 'total_area': 0, 
-            'total_quantity': 0, 'material': None
-        })
-        
-        for profile in self.profiles:
-            layer = profile.layer
-            layer_aggregates[layer]['count'] += 1
-            layer_aggregates[layer]['total_perimeter'] += profile.perimeter_mm * profile.quantity
-            layer_aggregates[layer]['total_area'] += profile.area_mm2 * profile.quantity
-            layer_aggregates[layer]['total_quantity'] += profile.quantity
-            if profile.material_hint:
-                layer_aggregates[layer]['material'] = profile.material_hint
-        
-        for layer, data in layer_aggregates.items():
+        for data in self.profiles.layer_totals():
+            layer = data['layer']
             if data['total_perimeter'] > 0:
                 material = data['material'] or self._detect_material_from_name(layer) or 'aluminio'
                 avg_perimeter = data['total_perimeter'] / max(data['count'], 1)
@@ -1108,18 +1638,7 @@ class DXFParser:
         if factor == 1.0:
             return
         
-        for profile in self.profiles:
-            profile.perimeter_mm *= factor
-            profile.area_mm2 *= (factor ** 2)
-            profile.length_mm *= factor
-            profile.bounding_box = {
-                'min_x': profile.bounding_box['min_x'] * factor,
-                'min_y': profile.bounding_box['min_y'] * factor,
-                'max_x': profile.bounding_box['max_x'] * factor,
-                'max_y': profile.bounding_box['max_y'] * factor,
-                'width': profile.bounding_box['width'] * factor,
-                'height': profile.bounding_box['height'] * factor,
-            }
+        self.profiles.scale(factor)
         
         for mq in self.material_quantities:
             mq.unit_length_mm *= factor
@@ -1131,6 +1650,8 @@ class DXFParser:
     def _calculate_perimeter(points: List[Tuple[float, float]], is_closed: bool) -> float:
         if not points or len(points) < 2:
             return 0.0
+        if len(points) >= DXFParser.VECTORIZE_MIN_POINTS:
+            return geometry.perimeter(points, is_closed)
         perimeter = 0.0
         n = len(points)
         for i in range(n - 1):
@@ -1148,6 +1669,8 @@ class DXFParser:
         n = len(points)
         if n < 3:
             return 0.0
+        if n >= DXFParser.VECTORIZE_MIN_POINTS:
+            return geometry.area(points)
         area_val = 0.0
         for i in range(n):
             j = (i + 1) % n
@@ -1159,6 +1682,8 @@ class DXFParser:
     def _calculate_bounding_box(points: List[Tuple[float, float]]) -> Dict[str, float]:
         if not points:
             return {'min_x': 0, 'min_y': 0, 'max_x': 0, 'max_y': 0, 'width': 0, 'height': 0}
+        if len(points) >= DXFParser.VECTORIZE_MIN_POINTS:
+            return geometry.bounding_box(points)
         x_coords = [p[0] for p in points]
         y_coords = [p[1] for p in points]
         min_x, max_x = min(x_coords), max(x_coords)
@@ -1173,6 +1698,8 @@ class DXFParser:
     def _calculate_centroid(points: List[Tuple[float, float]]) -> Tuple[float, float]:
         if not points:
             return (0.0, 0.0)
+        if len(points) >= DXFParser.VECTORIZE_MIN_POINTS:
+            return geometry.centroid(points)
         x_sum = sum(p[0] for p in points)
         y_sum = sum(p[1] for p in points)
         n = len(points)
@@ -1185,58 +1712,16 @@ class DXFParser:
             summary[ft] = summary.get(ft, 0) + 1
         return summary
     
-    def get_svg_preview(self, width: int = 800, height: int = 600) -> str:
-        if not self.profiles and not self.features:
-            return '<svg xmlns="http://www.w3.org/2000/svg"></svg>'
-        
-        all_points = []
-        for p in self.profiles:
-            bb = p.bounding_box
-            all_points.extend([(bb['min_x'], bb['min_y']), (bb['max_x'], bb['max_y'])])
-        
-        if not all_points:
-            return '<svg xmlns="http://www.w3.org/2000/svg"></svg>'
-        
-        min_x = min(p[0] for p in all_points) - 10
-        min_y = min(p[1] for p in all_points) - 10
-        max_x = max(p[0] for p in all_points) + 10
-        max_y = max(p[1] for p in all_points) + 10
-        
-        view_width = max_x - min_x
-        view_height = max_y - min_y
-        
-        svg_parts = [
-            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{min_x} {min_y} {view_width} {view_height}" '
-            f'width="{width}" height="{height}" style="background:#1e293b">'
+    def get_svg_preview(self, width: int = 800, height: int = 600, simplify: bool = False) -> str:
+        profiles = self.profiles
+        boxes = list(zip(*(profiles.values(key) for key in ProfileStore.BBOX_KEYS)))
+        holes = [
+            (f.position[0], f.position[1], f.dimensions.get("radius", 5))
+            for f in self.features if f.feature_type == 'hole'
         ]
-        
-        colors = {
-            'LWPOLYLINE': '#38bdf8', 'POLYLINE': '#38bdf8', 'CIRCLE': '#22d3ee',
-            'ARC': '#a78bfa', 'ELLIPSE': '#f472b6', 'LINE_GROUP': '#fbbf24',
-            'SPLINE': '#34d399', 'SOLID': '#f97316', '3DFACE': '#f97316',
-            'HATCH': '#6366f1'
-        }
-        
-        for p in self.profiles:
-            bb = p.bounding_box
-            color = colors.get(p.entity_type, '#38bdf8')
-            svg_parts.append(
-                f'<rect x="{bb["min_x"]}" y="{bb["min_y"]}" '
-                f'width="{bb["width"]}" height="{bb["height"]}" '
-                f'fill="none" stroke="{color}" stroke-width="1" opacity="0.8"/>'
-            )
-        
-        for f in self.features:
-            if f.feature_type == 'hole':
-                svg_parts.append(
-                    f'<circle cx="{f.position[0]}" cy="{f.position[1]}" '
-                    f'r="{f.dimensions.get("radius", 5)}" fill="#10b981" opacity="0.5"/>'
-                )
-        
-        svg_parts.append('</svg>')
-        return '\n'.join(svg_parts)
+        return render_svg(boxes, profiles.values('entity_type'), holes, width, height, simplify=simplify)
 
 
-def parse_dxf_file(file_path: str) -> Dict[str, Any]:
-    parser = DXFParser(file_path)
+def parse_dxf_file(file_path: str, streaming: bool = False) -> Dict[str, Any]:
+    parser = DXFParser(file_path, streaming=streaming)
     return parser.parse()
@@ -0,0 +1,242 @@
+"""
+AluQuote AI - DXF Preview Module
+Pré-visualização SVG de uma análise DXF, com nível de detalhe (LOD)
+Caixas e furos abaixo de poucos píxeis no tamanho pedido são fundidos numa grelha de píxeis
+Mosaico (tiles) com zoom, servido a partir de um índice espacial das caixas e furos
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from spatial_index import BoxGridIndex
+
+EMPTY_SVG = '<svg xmlns="http://www.w3.org/2000/svg"></svg>'
+
+PREVIEW_COLORS = {
+    'LWPOLYLINE': '#38bdf8', 'POLYLINE': '#38bdf8', 'CIRCLE': '#22d3ee',
+    'ARC': '#a78bfa', 'ELLIPSE': '#f472b6', 'LINE_GROUP': '#fbbf24',
+    'SPLINE': '#34d399', 'SOLID': '#f97316', '3DFACE': '#f97316',
+    'HATCH': '#6366f1'
+}
+DEFAULT_COLOR = '#38bdf8'
+HOLE_COLOR = '#10b981'
+
+# Tile pyramid: zoom z covers the drawing with 2**z x 2**z square tiles of TILE_SIZE pixels
+TILE_SIZE = 256
+TILE_MAX_ZOOM = 16
+TILE_INDEX_CELLS = 256  # spatial index cells along each side of the drawing extent
+TILE_CACHED_ZOOM = 4  # tiles up to this zoom cover most of the drawing each, so they are kept
+
+# (min_x, min_y, max_x, max_y, width, height)
+Box = Tuple[float, float, float, float, float, float]
+# (x, y, radius)
+Hole = Tuple[float, float, float]
+
+
+def render_svg(boxes: Sequence[Box], entity_types: Sequence[str], holes: Sequence[Hole],
+               width: int = 800, height: int = 600, simplify: bool = True, min_px: float = 2.0) -> str:
+    """
+    SVG of the profile bounding boxes and holes.
+    Without simplify: one <rect> per profile and one <circle> per hole, in drawing units.
+    With simplify (level of detail for the requested width/height): boxes and holes smaller
+    than min_px on screen are merged into filled cells of a min_px pixel grid, and the rest
+    is drawn as one outline <path> per colour snapped to a 1/10 pixel grid, so the output
+    size is bounded by the pixel count rather than the entity count.
+    """
+    if not boxes:
+        return EMPTY_SVG
+
+    min_x, min_y, max_x, max_y = drawing_extent(boxes)
+    view_width = max_x - min_x
+    view_height = max_y - min_y
+
+    svg_parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{min_x} {min_y} {view_width} {view_height}" '
+        f'width="{width}" height="{height}" style="background:#1e293b">'
+    ]
+    if simplify:
+        # Drawing units per screen pixel (the viewBox is fitted with "meet")
+        unit = 1.0 / min(width / view_width, height / view_height)
+        svg_parts.extend(_simplified_parts(boxes, entity_types, holes, min_x, min_y, unit, min_px))
+    else:
+        for (bx, by, _, _, bw, bh), entity_type in zip(boxes, entity_types):
+            color = PREVIEW_COLORS.get(entity_type, DEFAULT_COLOR)
+            svg_parts.append(
+                f'<rect x="{bx}" y="{by}" '
+                f'width="{bw}" height="{bh}" '
+                f'fill="none" stroke="{color}" stroke-width="1" opacity="0.8"/>'
+            )
+        for x, y, radius in holes:
+            svg_parts.append(
+                f'<circle cx="{x}" cy="{y}" '
+                f'r="{radius}" fill="{HOLE_COLOR}" opacity="0.5"/>'
+            )
+
+    svg_parts.append('</svg>')
+    return '\n'.join(svg_parts)
+
+
+def drawing_extent(boxes: Sequence[Box]) -> Tuple[float, float, float, float]:
+    """Extent of the boxes with a 10 unit margin"""
+    min_x = min(min(b[0] for b in boxes), min(b[2] for b in boxes)) - 10
+    min_y = min(min(b[1] for b in boxes), min(b[3] for b in boxes)) - 10
+    max_x = max(max(b[0] for b in boxes), max(b[2] for b in boxes)) + 10
+    max_y = max(max(b[1] for b in boxes), max(b[3] for b in boxes)) + 10
+    return min_x, min_y, max_x, max_y
+
+
+def _simplified_parts(boxes: Sequence[Box], entity_types: Sequence[str], holes: Sequence[Hole],
+                      min_x: float, min_y: float, unit: float, min_px: float) -> List[str]:
+    """Outline paths and merged sub-pixel cells, both in grid coordinates placed by a transform"""
+    cell = unit * min_px
+    step = unit / 10  # outline grid: 1/10 pixel
+    outlines: Dict[str, List[str]] = {}
+    cells: Dict[str, Dict[Tuple[int, int], None]] = {}
+    hole_marks: List[str] = []
+
+    for (bx, by, _, _, bw, bh), entity_type in zip(boxes, entity_types):
+        color = PREVIEW_COLORS.get(entity_type, DEFAULT_COLOR)
+        if bw < cell and bh < cell:
+            cells.setdefault(color, {})[(int((bx - min_x) // cell), int((by - min_y) // cell))] = None
+            continue
+        x, y = round((bx - min_x) / step), round((by - min_y) / step)
+        w, h = max(1, round(bw / step)), max(1, round(bh / step))
+        outlines.setdefault(color, []).append(f"M{x} {y}h{w}v{h}h-{w}z")
+
+    for x, y, radius in holes:
+        if 2 * radius < cell:
+            cells.setdefault(HOLE_COLOR, {})[(int((x - min_x) // cell), int((y - min_y) // cell))] = None
+            continue
+        hole_marks.append(
+            f'<circle cx="{round((x - min_x) / step)}" cy="{round((y - min_y) / step)}" '
+            f'r="{max(1, round(radius / step))}"/>'
+        )
+
+    parts = []
+    for color, path in outlines.items():
+        parts.append(
+            f'<path transform="translate({min_x} {min_y}) scale({step})" d="{"".join(path)}" '
+            f'fill="none" stroke="{color}" stroke-width="1" vector-effect="non-scaling-stroke" opacity="0.8"/>'
+        )
+    if hole_marks:
+        parts.append(
+            f'<g transform="translate({min_x} {min_y}) scale({step})" fill="{HOLE_COLOR}" opacity="0.5">'
+            + ''.join(hole_marks) + '</g>'
+        )
+    for color, occupied in cells.items():
+        path = ''.join(f"M{cx} {cy}h1v1h-1z" for cx, cy in occupied)
+        parts.append(
+            f'<path transform="translate({min_x} {min_y}) scale({cell})" d="{path}" '
+            f'fill="{color}" opacity="0.8"/>'
+        )
+    return parts
+
+
+def analysis_geometry(analysis: Dict[str, Any]) -> Tuple[List[Box], List[str], List[Hole]]:
+    """Boxes, entity types and holes of a DXFParser.parse() result"""
+    boxes = []
+    entity_types = []
+    for profile in analysis.get("profiles", []):
+        bb = profile["bounding_box"]
+        boxes.append((bb['min_x'], bb['min_y'], bb['max_x'], bb['max_y'], bb['width'], bb['height']))
+        entity_types.append(profile.get("entity_type"))
+    holes = [
+        (f["position"][0], f["position"][1], f["dimensions"].get("radius", 5))
+        for f in analysis.get("features_detail", [])
+        if f.get("feature_type") == 'hole'
+    ]
+    return boxes, entity_types, holes
+
+
+def render_analysis_preview(analysis: Dict[str, Any], width: int = 800, height: int = 600) -> str:
+    """Level-of-detail SVG preview straight from a stored analysis (no re-parse)"""
+    boxes, entity_types, holes = analysis_geometry(analysis)
+    return render_svg(boxes, entity_types, holes, width, height, simplify=True)
+
+
+class TileSet:
+    """
+    Tile pyramid over one analysed drawing, for pan/zoom viewers.
+    The square extent of the drawing is split into 2**z x 2**z tiles at zoom z, tile (0, 0)
+    being at the minimum corner; x grows with drawing x and y with drawing y.
+    Profiles and holes are kept in BoxGridIndex grids so a tile only renders what overlaps it.
+    """
+
+    def __init__(self, boxes: Sequence[Box], entity_types: Sequence[str], holes: Sequence[Hole],
+                 tile_size: int = TILE_SIZE):
+        self.tile_size = tile_size
+        self.boxes = list(boxes)
+        self.entity_types = list(entity_types)
+        self.holes = list(holes)
+
+        if self.boxes:
+            min_x, min_y, max_x, max_y = drawing_extent(self.boxes)
+        else:
+            min_x, min_y, max_x, max_y = 0.0, 0.0, 1.0, 1.0
+        self.origin = (min_x, min_y)
+        self.side = max(max_x - min_x, max_y - min_y)
+
+        cell_size = self.side / TILE_INDEX_CELLS
+        self.box_index = BoxGridIndex(cell_size)
+        for i, box in enumerate(self.boxes):
+            self.box_index.insert(box[0], box[1], box[2], box[3], i)
+        self.hole_index = BoxGridIndex(cell_size)
+        for i, (x, y, radius) in enumerate(self.holes):
+            self.hole_index.insert(x - radius, y - radius, x + radius, y + radius, i)
+        self._rendered: Dict[Tuple[int, int, int, float], str] = {}
+
+    @classmethod
+    def from_analysis(cls, analysis: Dict[str, Any], tile_size: int = TILE_SIZE) -> 'TileSet':
+        boxes, entity_types, holes = analysis_geometry(analysis)
+        return cls(boxes, entity_types, holes, tile_size)
+
+    def metadata(self) -> Dict[str, Any]:
+        return {
+            "origin": list(self.origin),
+            "extent": self.side,
+            "tile_size": self.tile_size,
+            "min_zoom": 0,
+            "max_zoom": TILE_MAX_ZOOM,
+            "profiles": len(self.boxes),
+            "holes": len(self.holes)
+        }
+
+    def tile_bounds(self, z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+        """Drawing-unit bounds (min_x, min_y, max_x, max_y) of a tile"""
+        if not 0 <= z <= TILE_MAX_ZOOM:
+            raise ValueError(f"zoom must be between 0 and {TILE_MAX_ZOOM}")
+        count = 1 << z
+        if not (0 <= x < count and 0 <= y < count):
+            raise ValueError(f"tile ({x}, {y}) outside zoom {z}")
+        span = self.side / count
+        min_x = self.origin[0] + x * span
+        min_y = self.origin[1] + y * span
+        return min_x, min_y, min_x + span, min_y + span
+
+    def render_tile(self, z: int, x: int, y: int, min_px: float = 2.0) -> str:
+        """SVG of one tile, with only the overlapping geometry at the tile's level of detail"""
+        key = (z, x, y, min_px)
+        if key in self._rendered:
+            return self._rendered[key]
+
+        min_x, min_y, max_x, max_y = self.tile_bounds(z, x, y)
+        span = max_x - min_x
+
+        box_ids = self.box_index.intersecting(min_x, min_y, max_x, max_y)
+        hole_ids = self.hole_index.intersecting(min_x, min_y, max_x, max_y)
+
+        svg_parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{min_x} {min_y} {span} {span}" '
+            f'width="{self.tile_size}" height="{self.tile_size}" style="background:#1e293b">'
+        ]
+        if box_ids or hole_ids:
+            svg_parts.extend(_simplified_parts(
+                [self.boxes[i] for i in box_ids],
+                [self.entity_types[i] for i in box_ids],
+                [self.holes[i] for i in hole_ids],
+                min_x, min_y, span / self.tile_size, min_px
+            ))
+        svg_parts.append('</svg>')
+        svg = '\n'.join(svg_parts)
+        if z <= TILE_CACHED_ZOOM:
+            self._rendered[key] = svg
+        return svg
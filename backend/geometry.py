@@ -0,0 +1,179 @@
+"""
+AluQuote AI - Geometry Module
+Kernels NumPy para perímetro, área, caixa envolvente e centróide de polilinhas
+API individual (uma polilinha) e em lote (muitas polilinhas num array irregular)
+"""
+
+from itertools import chain
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+Point = Tuple[float, float]
+
+EMPTY_BOUNDING_BOX = {'min_x': 0, 'min_y': 0, 'max_x': 0, 'max_y': 0, 'width': 0, 'height': 0}
+
+
+def as_coords(points: Sequence[Point]) -> np.ndarray:
+    """Contiguous (n, 2) float64 array from a sequence of (x, y) points"""
+    coords = np.asarray(points, dtype=np.float64)
+    if coords.size == 0:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.ascontiguousarray(coords.reshape(-1, coords.shape[-1])[:, :2])
+
+
+def perimeter(points: Sequence[Point], is_closed: bool) -> float:
+    coords = as_coords(points)
+    if len(coords) < 2:
+        return 0.0
+    seg = np.diff(coords, axis=0)
+    total = float(np.hypot(seg[:, 0], seg[:, 1]).sum())
+    if is_closed:
+        dx, dy = coords[0] - coords[-1]
+        total += float(np.hypot(dx, dy))
+    return total
+
+
+def area(points: Sequence[Point]) -> float:
+    """Absolute polygon area (shoelace formula)"""
+    coords = as_coords(points)
+    if len(coords) < 3:
+        return 0.0
+    x, y = coords[:, 0], coords[:, 1]
+    xn, yn = np.roll(x, -1), np.roll(y, -1)
+    return abs(float(np.dot(x, yn) - np.dot(xn, y))) / 2.0
+
+
+def bounding_box(points: Sequence[Point]) -> Dict[str, float]:
+    coords = as_coords(points)
+    if len(coords) == 0:
+        return dict(EMPTY_BOUNDING_BOX)
+    min_x, min_y = coords.min(axis=0)
+    max_x, max_y = coords.max(axis=0)
+    return bounding_box_from_bounds(min_x, min_y, max_x, max_y)
+
+
+def centroid(points: Sequence[Point]) -> Tuple[float, float]:
+    """Vertex average, rounded to 0.01"""
+    coords = as_coords(points)
+    if len(coords) == 0:
+        return (0.0, 0.0)
+    cx, cy = coords.mean(axis=0)
+    return (round(float(cx), 2), round(float(cy), 2))
+
+
+def round_values(values, ndigits: int) -> List[float]:
+    """
+    [round(v, ndigits) for v in values], vectorised. np.round can differ from the builtin
+    when v * 10**ndigits lands next to a .5 boundary, so those few values use round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    result = (np.rint(scaled) / scale).tolist()
+    fraction = np.abs(scaled - np.trunc(scaled))
+    near_half = np.abs(fraction - 0.5) < 1e-6 + np.abs(scaled) * 1e-15
+    for i in np.flatnonzero(near_half).tolist():
+        result[i] = round(float(values[i]), ndigits)
+    return result
+
+
+def bounding_box_from_bounds(min_x, min_y, max_x, max_y) -> Dict[str, float]:
+    """Bounding box dict (rounded to 0.01) from its extreme coordinates"""
+    min_x, min_y, max_x, max_y = float(min_x), float(min_y), float(max_x), float(max_y)
+    return {
+        'min_x': round(min_x, 2), 'min_y': round(min_y, 2),
+        'max_x': round(max_x, 2), 'max_y': round(max_y, 2),
+        'width': round(max_x - min_x, 2), 'height': round(max_y - min_y, 2)
+    }
+
+
+class PolylineBatch:
+    """
+    Many (x, y) polylines packed into one ragged array: coords (N, 2) plus offsets (M + 1),
+    polyline i being coords[offsets[i]:offsets[i + 1]].
+    Metrics are computed for the whole batch with segment-wise reductions.
+    """
+
+    def __init__(self, polylines: Sequence[Sequence[Point]], closed: Sequence[bool]):
+        if len(polylines) != len(closed):
+            raise ValueError("polylines and closed must have the same length")
+        self.counts = np.fromiter((len(p) for p in polylines), dtype=np.int64, count=len(polylines))
+        self.offsets = np.zeros(len(polylines) + 1, dtype=np.int64)
+        np.cumsum(self.counts, out=self.offsets[1:])
+        self.closed = np.asarray(closed, dtype=bool)
+        flat = chain.from_iterable(chain.from_iterable(polylines))
+        self.coords = np.fromiter(flat, dtype=np.float64, count=2 * int(self.offsets[-1])).reshape(-1, 2)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def _per_polyline_sum(self, values: np.ndarray) -> np.ndarray:
+        """Sum `values` (one per vertex) over each polyline; empty polylines sum to 0"""
+        result = np.zeros(len(self), dtype=np.float64)
+        nonempty = self.counts > 0
+        if nonempty.any():
+            result[nonempty] = np.add.reduceat(values, self.offsets[:-1][nonempty])
+        return result
+
+    def _last_indices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices of the last and first vertex of every non-empty polyline"""
+        nonempty = self.counts > 0
+        return self.offsets[1:][nonempty] - 1, self.offsets[:-1][nonempty]
+
+    def perimeters(self) -> np.ndarray:
+        if len(self.coords) == 0:
+            return np.zeros(len(self), dtype=np.float64)
+        # Length of the edge leaving each vertex; the last vertex of a polyline has no
+        # edge unless the polyline is closed, in which case it goes back to its first vertex
+        seg = np.diff(self.coords, axis=0, append=self.coords[-1:])
+        last, first = self._last_indices()
+        closed = self.closed[self.counts > 0]
+        seg[last] = np.where(closed[:, None], self.coords[first] - self.coords[last], 0.0)
+        result = self._per_polyline_sum(np.hypot(seg[:, 0], seg[:, 1]))
+        result[self.counts < 2] = 0.0
+        return result
+
+    def areas(self) -> np.ndarray:
+        """Absolute shoelace areas; polylines with fewer than 3 points get 0"""
+        if len(self.coords) == 0:
+            return np.zeros(len(self), dtype=np.float64)
+        x, y = self.coords[:, 0], self.coords[:, 1]
+        # Index of the next vertex, wrapping back to the first one of the same polyline
+        nxt = np.arange(1, len(self.coords) + 1, dtype=np.int64)
+        last, first = self._last_indices()
+        nxt[last] = first
+        result = np.abs(self._per_polyline_sum(x * y[nxt] - x[nxt] * y)) / 2.0
+        result[self.counts < 3] = 0.0
+        return result
+
+    def bounds(self) -> np.ndarray:
+        """(M, 4) array of min_x, min_y, max_x, max_y (zeros for empty polylines)"""
+        result = np.zeros((len(self), 4), dtype=np.float64)
+        nonempty = self.counts > 0
+        if not nonempty.any():
+            return result
+        starts = self.offsets[:-1][nonempty]
+        result[nonempty, :2] = np.minimum.reduceat(self.coords, starts, axis=0)
+        result[nonempty, 2:] = np.maximum.reduceat(self.coords, starts, axis=0)
+        return result
+
+    def bounding_boxes(self) -> List[Dict[str, float]]:
+        """Same dicts as bounding_box(), one per polyline"""
+        bounds = self.bounds()
+        table = np.hstack((bounds, bounds[:, 2:] - bounds[:, :2]))
+        rows = zip(*(round_values(table[:, k], 2) for k in range(6)))
+        keys = ('min_x', 'min_y', 'max_x', 'max_y', 'width', 'height')
+        return [
+            dict(zip(keys, row)) if count else dict(EMPTY_BOUNDING_BOX)
+            for row, count in zip(rows, self.counts.tolist())
+        ]
+
+    def centroids(self) -> List[Tuple[float, float]]:
+        """Vertex averages, rounded to 0.01 ((0, 0) for empty polylines)"""
+        if len(self.coords) == 0:
+            return [(0.0, 0.0)] * len(self)
+        n = np.maximum(self.counts, 1)
+        cx = round_values(self._per_polyline_sum(self.coords[:, 0]) / n, 2)
+        cy = round_values(self._per_polyline_sum(self.coords[:, 1]) / n, 2)
+        return list(zip(cx, cy))
@@ -0,0 +1,185 @@
+"""
+AluQuote AI - Job Manager Module
+Processamento em segundo plano dos ficheiros carregados
+O pedido HTTP devolve logo um job id; a análise corre num pool limitado de workers
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue already holds the maximum number of pending jobs"""
+
+
+class JobManager:
+    """
+    Bounded background worker pool with job status tracking.
+    Each job is a plain dict so it can be returned directly by the API.
+    Finished jobs are forgotten finished_ttl seconds after they end (oldest first once
+    more than max_finished are kept); their result payload is dropped after result_ttl,
+    since what it reports has been persisted by the job itself.
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32,
+                 finished_ttl: float = 3600.0, result_ttl: float = 600.0, max_finished: int = 256):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.finished_ttl = finished_ttl
+        self.result_ttl = min(result_ttl, finished_ttl)
+        self.max_finished = max_finished
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        # job id -> monotonic finish time, in finishing order
+        self._finished: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="aluquote-job"
+        )
+
+    def submit(self, job_type: str, func: Callable[..., Any], *args,
+               project_id: Optional[str] = None, total_steps: int = 0, **kwargs) -> Dict[str, Any]:
+        """
+        Queue func(job_id, *args, **kwargs) for background execution.
+        The function's return value becomes the job "result".
+        """
+        with self._lock:
+            self._expire_finished()
+            if self._count_pending() >= self.max_pending:
+                raise JobQueueFullError(
+                    f"Fila de processamento cheia ({self.max_pending} jobs pendentes)"
+                )
+
+            job_id = uuid.uuid4().hex[:12]
+            job = {
+                "id": job_id,
+                "type": job_type,
+                "project_id": project_id,
+                "status": self.STATUS_QUEUED,
+                "created_at": datetime.now().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "progress": {"total": total_steps, "done": 0},
+                "result": None,
+                "error": None
+            }
+            self.jobs[job_id] = job
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._expire_finished()
+            return self.jobs.get(job_id)
+
+    def list_for_project(self, project_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._expire_finished()
+            return [job for job in self.jobs.values() if job["project_id"] == project_id]
+
+    def advance(self, job_id: str, steps: int = 1):
+        """Mark progress on a running job"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job:
+                job["progress"]["done"] += steps
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _count_pending(self) -> int:
+        return sum(
+            1 for job in self.jobs.values()
+            if job["status"] in (self.STATUS_QUEUED, self.STATUS_RUNNING)
+        )
+
+    def _expire_finished(self):
+        """Drop stale result payloads and forget old finished jobs (caller holds the lock)"""
+        now = time.monotonic()
+        for job_id, finished in list(self._finished.items()):
+            age = now - finished
+            if age >= self.finished_ttl or len(self._finished) > self.max_finished:
+                del self._finished[job_id]
+                self.jobs.pop(job_id, None)
+            elif age >= self.result_ttl:
+                job = self.jobs[job_id]
+                if job["result"] is not None:
+                    job["result"] = None
+                    job["result_expired"] = True
+                job.pop("traceback", None)
+            else:
+                break  # Finishing order: every later job is younger
+
+    def _run(self, job_id: str, func: Callable[..., Any], args: tuple, kwargs: dict):
+        job = self.jobs[job_id]
+        job["status"] = self.STATUS_RUNNING
+        job["started_at"] = datetime.now().isoformat()
+
+        try:
+            job["result"] = func(job_id, *args, **kwargs)
+            job["status"] = self.STATUS_COMPLETED
+        except Exception as e:
+            job["status"] = self.STATUS_FAILED
+            job["error"] = str(e)
+            job["traceback"] = traceback.format_exc()
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+            with self._lock:
+                self._finished[job_id] = time.monotonic()
+
+
+class ParsePool:
+    """
+    Process pool for CPU-bound parsing (pdfplumber / ezdxf).
+    Created lazily, sized to the CPU count by default, and rebuilt if a worker dies.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """Submit func to a worker process; func must be a picklable module-level function"""
+        try:
+            return self._get_executor().submit(func, *args, **kwargs)
+        except BrokenProcessPool:
+            self._reset()
+            return self._get_executor().submit(func, *args, **kwargs)
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # forkserver/spawn: never fork the threaded API process
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(method)
+                )
+            return self._executor
+
+    def _reset(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
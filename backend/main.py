@@ -4,28 +4,37 @@ Main API server for aluminum facade budgeting automation
 Suporta múltiplos ficheiros DXF e PDF com análise exaustiva
 """
 
-import os
 import json
+import os
 import uuid
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-import io
+from fastapi.responses import JSONResponse, FileResponse, Response, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+import threading
+from collections import OrderedDict
 from pydantic import BaseModel
 
 from dxf_parser import DXFParser, parse_dxf_file
-from pdf_reader import PDFReader, parse_pdf_file
+from dxf_preview import render_analysis_preview, TileSet, TILE_MAX_ZOOM
+from pdf_reader import PDFReader, parse_pdf_file, OCR_AVAILABLE
 from budget_calculator import BudgetCalculator, PricingParameters, calculate_quick_estimate
+from job_manager import JobManager, JobQueueFullError, ParsePool
+from upload_store import UploadStore, ParseCache
+from project_store import ProjectStore, ProjectNotFoundError
+from api_responses import CompressionMiddleware, FastJSONResponse, json_response
+from budget_exports import ExportCache, iter_csv, iter_json
+from quote_pdf import QuotePDFCache, render_quote_pdf
+from analysis_merge import merge_project_files, remove_analysis
+from analysis_views import (
+    COLLECTIONS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError,
+    paginate, parse_fields, resolve_collection, select_fields
+)
+from ocr_cache import OCRCache
 
 # Import cost database
 try:
@@ -37,15 +46,119 @@ except ImportError:
 
 # Configuration
 UPLOAD_DIR = Path("./uploads")
-EXPORT_DIR = Path("./exports")
+CACHE_DIR = Path("./cache")
 UPLOAD_DIR.mkdir(exist_ok=True)
-EXPORT_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
+
+# Uploads are stored by content hash; analyses are cached per hash + parser version (size-bounded, LRU)
+PARSE_CACHE_MAX_MB = int(os.environ.get("ALUQUOTE_PARSE_CACHE_MB", "1024"))
+upload_store = UploadStore(UPLOAD_DIR)
+parse_cache = ParseCache(CACHE_DIR / "parse", max_bytes=PARSE_CACHE_MAX_MB * 1024 * 1024)
+DXF_CACHE_VERSION = DXFParser.PARSER_VERSION
+
+# DXF files at least this large are parsed in streaming mode (bounded memory); 0 disables it
+DXF_STREAM_MIN_MB = float(os.environ.get("ALUQUOTE_DXF_STREAM_MB", "0"))
+
+
+def use_dxf_streaming(size_bytes: int) -> bool:
+    return DXF_STREAM_MIN_MB > 0 and size_bytes >= DXF_STREAM_MIN_MB * 1024 * 1024
+
+
+def dxf_cache_version(streaming: bool) -> str:
+    """Streamed analyses number profiles in drawing order, so they are cached separately"""
+    return f"{DXF_CACHE_VERSION}+stream" if streaming else DXF_CACHE_VERSION
+
+# SVG previews are rendered from the stored analysis; only the default size is cached
+# (per file hash and analysis version), any other size is rendered on each request
+PREVIEW_DEFAULT_WIDTH = 800
+PREVIEW_DEFAULT_HEIGHT = 600
+PREVIEW_CACHED_SIZES = {(PREVIEW_DEFAULT_WIDTH, PREVIEW_DEFAULT_HEIGHT)}
+
+
+def dxf_preview_svg(sha256: str, version: Optional[str], load_analysis: Callable[[], dict],
+                    width: int, height: int) -> str:
+    """
+    SVG preview of a file's analysis. version is the cache version the analysis was parsed
+    with (streamed or not); the analysis is only loaded (load_analysis()) when the preview
+    is not cached, or to read the version of records stored before it was kept.
+    """
+    if (width, height) not in PREVIEW_CACHED_SIZES:
+        return render_analysis_preview(load_analysis(), width, height)
+
+    analysis = None
+    if version is None:
+        analysis = load_analysis()
+        # Analyses older than the cache_version label were parsed with the plain version
+        version = (analysis.get("file_info") or {}).get("cache_version", DXF_CACHE_VERSION)
+
+    kind = f"svg{width}x{height}"
+    cached = parse_cache.get(kind, version, sha256)
+    if cached is not None:
+        return cached["svg"]
+
+    if analysis is None:
+        analysis = load_analysis()
+    svg = render_analysis_preview(analysis, width, height)
+    parse_cache.put(kind, version, sha256, {"success": True, "svg": svg})
+    return svg
+
+# Tile sets (spatial index over one analysis) kept in memory for the most recently viewed files
+TILESET_CACHE_ENTRIES = int(os.environ.get("ALUQUOTE_TILESET_CACHE", "8"))
+dxf_tilesets: "OrderedDict[str, TileSet]" = OrderedDict()
+dxf_tilesets_lock = threading.Lock()
+
+
+def dxf_tileset(sha256: str, load_analysis: Callable[[], dict]) -> TileSet:
+    """The tile set of a file; its analysis is only loaded (load_analysis()) when it is not cached"""
+    with dxf_tilesets_lock:
+        tileset = dxf_tilesets.get(sha256)
+        if tileset is not None:
+            dxf_tilesets.move_to_end(sha256)
+            return tileset
+
+    tileset = TileSet.from_analysis(load_analysis())
+    with dxf_tilesets_lock:
+        dxf_tilesets[sha256] = tileset
+        while len(dxf_tilesets) > TILESET_CACHE_ENTRIES:
+            dxf_tilesets.popitem(last=False)
+    return tileset
+
+# OCR text cache keyed by page raster hash (size-bounded, LRU eviction)
+OCR_CACHE_MAX_MB = int(os.environ.get("ALUQUOTE_OCR_CACHE_MB", "256"))
+ocr_cache = OCRCache(CACHE_DIR / "ocr", max_bytes=OCR_CACHE_MAX_MB * 1024 * 1024)
+
+
+def pdf_cache_version(max_ocr_pages: int) -> str:
+    """PDF analyses also depend on OCR availability and the OCR page cap"""
+    if not OCR_AVAILABLE:
+        return PDFReader.PARSER_VERSION
+    return f"{PDFReader.PARSER_VERSION}+ocr{max_ocr_pages}"
+
+# Responses at least this large are gzip/brotli compressed when the client accepts it
+COMPRESS_MIN_BYTES = int(os.environ.get("ALUQUOTE_COMPRESS_MIN_BYTES", "1024"))
+
+# Finished CSV/JSON exports kept in memory per project and budget version (0 disables)
+EXPORT_CACHE_MB = int(os.environ.get("ALUQUOTE_EXPORT_CACHE_MB", "32"))
+export_cache = ExportCache(max_bytes=EXPORT_CACHE_MB * 1024 * 1024)
+
+# Rendered quote PDFs, keyed by project, budget hash and template version
+quote_pdf_cache = QuotePDFCache(CACHE_DIR / "quotes")
+
+# Background processing: bounded pool so long OCR runs never block the event loop
+JOB_WORKERS = int(os.environ.get("ALUQUOTE_JOB_WORKERS", "2"))
+JOB_MAX_PENDING = int(os.environ.get("ALUQUOTE_JOB_MAX_PENDING", "32"))
+# Finished jobs stay queryable for an hour (results for 10 minutes; the files are in the project)
+JOB_TTL_SECONDS = float(os.environ.get("ALUQUOTE_JOB_TTL", "3600"))
+JOB_RESULT_TTL_SECONDS = float(os.environ.get("ALUQUOTE_JOB_RESULT_TTL", "600"))
+JOB_MAX_FINISHED = int(os.environ.get("ALUQUOTE_JOB_MAX_FINISHED", "256"))
+PARSE_WORKERS = int(os.environ.get("ALUQUOTE_PARSE_WORKERS", "0")) or os.cpu_count() or 1
 
 # Initialize FastAPI
 app = FastAPI(
     title="AluQuote AI",
     description="AI-powered aluminum facade budgeting automation - Enhanced",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -56,10 +169,26 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESS_MIN_BYTES)
+
+# Persistent project store (SQLite, WAL): shared by every uvicorn worker, survives restarts
+PROJECT_DB_PATH = Path(os.environ.get("ALUQUOTE_PROJECT_DB", "./data/projects.db"))
+project_store = ProjectStore(PROJECT_DB_PATH)
+
+job_manager = JobManager(
+    max_workers=JOB_WORKERS,
+    max_pending=JOB_MAX_PENDING,
+    finished_ttl=JOB_TTL_SECONDS,
+    result_ttl=JOB_RESULT_TTL_SECONDS,
+    max_finished=JOB_MAX_FINISHED
+)
+parse_pool = ParsePool(max_workers=PARSE_WORKERS)
+
 
-# In-memory storage
-projects_db = {}
-files_db = {}
+@app.on_event("shutdown")
+def shutdown_job_manager():
+    job_manager.shutdown(wait=False)
+    parse_pool.shutdown(wait=False)
 
 
 # ============== Pydantic Models ==============
@@ -102,6 +231,7 @@ async def root():
         ],
         "endpoints": {
             "upload": "/api/upload",
+            "jobs": "/api/jobs/{job_id}",
             "projects": "/api/projects",
             "calculate": "/api/calculate",
             "export": "/api/export"
@@ -110,7 +240,15 @@ async def root():
 
 @app.get("/api/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        # Hit/miss counters of this worker process since it started
+        "caches": {
+            "parse": parse_cache.stats(),
+            "quote_pdf": quote_pdf_cache.stats()
+        }
+    }
 
 
 # ============== Cost Database Management ==============
@@ -291,7 +429,7 @@ async def create_project(project: ProjectCreate):
     """Create a new budgeting project"""
     project_id = str(uuid.uuid4())[:8]
 
-    projects_db[project_id] = {
+    await run_in_threadpool(project_store.create, {
         "id": project_id,
         "name": project.name,
         "description": project.description,
@@ -303,48 +441,69 @@ async def create_project(project: ProjectCreate):
         "merged_pdf_analysis": None,
         "budget": None,
         "status": "created"
-    }
+    })
 
-    return projects_db[project_id]
+    return json_response(await run_in_threadpool(project_store.get, project_id, True))
 
 @app.get("/api/projects")
 async def list_projects():
-    """List all projects"""
-    return list(projects_db.values())
+    """List all projects (file metadata only; analyses are loaded per project)"""
+    return json_response(await run_in_threadpool(project_store.list))
 
 @app.get("/api/projects/{project_id}")
 async def get_project(project_id: str):
     """Get project details"""
-    if project_id not in projects_db:
+    try:
+        project = await run_in_threadpool(project_store.get, project_id, True)
+    except ProjectNotFoundError:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return json_response(project)
+
+@app.delete("/api/projects/{project_id}/files/{file_id}")
+async def delete_project_file(project_id: str, file_id: str):
+    """Remove one file from a project and from its merged analyses"""
+    if not await run_in_threadpool(project_store.exists, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    return projects_db[project_id]
+
+    try:
+        await run_in_threadpool(project_store.remove_file, project_id, file_id, unmerge_project_file)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Ficheiro não encontrado no projeto")
+
+    return {"message": "File removed", "id": file_id, "project_id": project_id}
 
 @app.delete("/api/projects/{project_id}")
 async def delete_project(project_id: str):
     """Delete a project"""
-    if project_id not in projects_db:
+    if not await run_in_threadpool(project_store.delete, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
+    export_cache.discard(lambda key: key[0] == project_id)
+    await run_in_threadpool(quote_pdf_cache.discard_project, project_id)
 
-    del projects_db[project_id]
     return {"message": "Project deleted", "id": project_id}
 
 
 # ============== File Upload & Processing ==============
 
-@app.post("/api/upload")
+@app.post("/api/upload", status_code=202)
 async def upload_files(
     project_id: str = Form(...),
-    files: List[UploadFile] = File(...)
+    files: List[UploadFile] = File(...),
+    max_ocr_pages: int = Form(PDFReader.DEFAULT_MAX_OCR_PAGES)
 ):
     """
-    Upload and process MULTIPLE DXF and PDF files
-    Analyzes each file exhaustively
+    Upload MULTIPLE DXF and PDF files
+    Files are saved immediately; exhaustive analysis runs as a background job.
+    Poll /api/jobs/{job_id} for the processing results.
+    max_ocr_pages caps OCR on scanned PDFs (0 = every page).
     """
-    if project_id not in projects_db:
+    if not await run_in_threadpool(project_store.exists, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
+    if max_ocr_pages < 0:
+        raise HTTPException(status_code=400, detail="max_ocr_pages deve ser >= 0")
 
-    project = projects_db[project_id]
     results = []
+    pending_files = []
 
     for file in files:
         file_id = str(uuid.uuid4())[:8]
@@ -376,45 +535,146 @@ async def upload_files(
             })
             continue
 
-        # Save file
-        file_path = UPLOAD_DIR / f"{file_id}_{file.filename}"
-
+        # Save file (content-addressed: identical drawings are stored once)
         try:
             content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
+            sha256, file_path, _ = await run_in_threadpool(upload_store.put, content, file.filename)
+        except Exception as e:
+            results.append({
+                "filename": file.filename,
+                "status": "error",
+                "error": str(e)
+            })
+            continue
+
+        pending_files.append({
+            "file_id": file_id,
+            "filename": file.filename,
+            "ext": file_ext,
+            "path": str(file_path),
+            "sha256": sha256,
+            "size_bytes": len(content)
+        })
+
+    if not pending_files:
+        return {
+            "project_id": project_id,
+            "job_id": None,
+            "status": "completed",
+            "files_received": len(results),
+            "results": results
+        }
+
+    try:
+        job = job_manager.submit(
+            "upload",
+            process_upload_job,
+            project_id,
+            pending_files,
+            results,
+            max_ocr_pages,
+            project_id=project_id,
+            total_steps=len(pending_files)
+        )
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
-            # Process based on file type
-            if file_ext == '.dxf':
-                analysis = process_dxf_exhaustive(str(file_path))
+    await run_in_threadpool(project_store.update, project_id, status="processing")
+
+    return {
+        "project_id": project_id,
+        "job_id": job["id"],
+        "status": job["status"],
+        "files_received": len(results) + len(pending_files),
+        "files_queued": len(pending_files),
+        "status_url": f"/api/jobs/{job['id']}",
+        "results": results
+    }
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Get status (and results, once finished) of a background processing job"""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return json_response(job)
+
+
+@app.get("/api/projects/{project_id}/jobs")
+async def list_project_jobs(project_id: str):
+    """List background jobs submitted for a project"""
+    if not project_store.exists(project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return job_manager.list_for_project(project_id)
+
+
+def process_upload_job(job_id: str, project_id: str, pending_files: List[Dict],
+                       initial_results: List[Dict],
+                       max_ocr_pages: int = PDFReader.DEFAULT_MAX_OCR_PAGES) -> dict:
+    """
+    Background worker: analyze saved uploads exhaustively and merge them into the project.
+    Runs in the job pool, never on the event loop.
+    """
+    results = list(initial_results)
+    added_files = []
+
+    # Parse every distinct file of the upload in parallel (skipping cached analyses);
+    # results are consumed in upload order. Cores left over when the upload has
+    # fewer files than workers go to page-sharded PDF extraction and OCR threads.
+    distinct_files = {(pending["ext"], pending["sha256"]) for pending in pending_files}
+    page_workers = max(1, PARSE_WORKERS // len(distinct_files))
+
+    futures = {}
+    for pending in pending_files:
+        key = (pending["ext"], pending["sha256"])
+        if key not in futures:
+            futures[key] = submit_parse(pending, page_workers, max_ocr_pages)
+
+    for pending in pending_files:
+        file_id = pending["file_id"]
+        filename = pending["filename"]
+        file_path = pending["path"]
+
+        try:
+            analysis = resolve_parse(pending, futures[(pending["ext"], pending["sha256"])], max_ocr_pages)
+
+            if pending["ext"] == '.dxf':
                 file_type = "dxf"
                 category = categorize_dxf(analysis)
-                project["dxf_analyses"].append(analysis)
+                cache_version = analysis["file_info"]["cache_version"]
+                if analysis.get("success"):
+                    dxf_preview_svg(pending["sha256"], cache_version, lambda: analysis,
+                                    PREVIEW_DEFAULT_WIDTH, PREVIEW_DEFAULT_HEIGHT)
             else:
-                analysis = process_pdf_exhaustive(str(file_path))
                 file_type = "pdf"
                 category = categorize_pdf(analysis)
-                project["pdf_analyses"].append(analysis)
+                cache_version = analysis["document_info"]["cache_version"]
 
             # Store file info
             file_info = {
                 "id": file_id,
-                "filename": file.filename,
+                "filename": filename,
                 "type": file_type,
                 "category": category,
-                "path": str(file_path),
-                "size_bytes": len(content),
+                "path": file_path,
+                "sha256": pending["sha256"],
+                "size_bytes": pending["size_bytes"],
                 "uploaded_at": datetime.now().isoformat(),
                 "analysis_success": analysis.get("success", False),
+                "cache_version": cache_version,
                 "analysis": analysis
             }
 
-            files_db[file_id] = file_info
-            project["files"].append(file_info)
+            try:
+                project_store.add_file(project_id, file_info)
+            except ProjectNotFoundError:
+                raise RuntimeError("Projeto removido durante o processamento")
+            added_files.append(file_info)
 
             results.append({
                 "file_id": file_id,
-                "filename": file.filename,
+                "filename": filename,
                 "type": file_type,
                 "category": category,
                 "status": "processed" if analysis.get("success") else "error",
@@ -424,123 +684,86 @@ async def upload_files(
 
         except Exception as e:
             results.append({
-                "filename": file.filename,
+                "filename": filename,
                 "status": "error",
                 "error": str(e)
             })
 
-    # Merge analyses after all files are processed
-    merge_project_analyses(project)
+        job_manager.advance(job_id)
 
-    project["status"] = "files_uploaded"
+    def merge(project: Dict) -> Dict:
+        # Fold only this upload's analyses (still in the project) into the merged views
+        merge_project_files(project, added_files)
+        project["status"] = "files_uploaded"
 
-    return {
-        "project_id": project_id,
-        "files_processed": len(results),
-        "dxf_files": len(project["dxf_analyses"]),
-        "pdf_files": len(project["pdf_analyses"]),
-        "results": results
-    }
-
-
-def process_dxf_exhaustive(file_path: str) -> dict:
-    """Process DXF file with exhaustive extraction"""
-    parser = DXFParser(file_path)
-    result = parser.parse()
-    return result
-
-
-def process_pdf_exhaustive(file_path: str) -> dict:
-    """Process PDF file with exhaustive extraction"""
-    reader = PDFReader(file_path)
-    result = reader.parse()
-    return result
-
-
-def merge_project_analyses(project: Dict):
-    """Merge multiple DXF and PDF analyses into unified views"""
-
-    # Merge DXF analyses
-    if project["dxf_analyses"]:
-        merged_dxf = {
-            "success": True,
-            "profiles": [],
-            "features_summary": {},
-            "material_quantities": [],
-            "texts_extracted": [],
-            "layers": {},
-            "blocks_analyzed": {},
-            "total_profiles": 0,
-            "total_features": 0,
-            "files_merged": len(project["dxf_analyses"])
+        return {
+            "project_id": project_id,
+            "files_processed": len(results),
+            "dxf_files": sum(1 for f in project["files"] if f["type"] == "dxf"),
+            "pdf_files": sum(1 for f in project["files"] if f["type"] == "pdf"),
+            "results": results
         }
 
-        for analysis in project["dxf_analyses"]:
-            if analysis.get("success"):
-                # Merge profiles
-                for profile in analysis.get("profiles", []):
-                    profile["source_file"] = analysis.get("file_info", {}).get("filename", "")
-                    merged_dxf["profiles"].append(profile)
-
-                # Merge features
-                for ftype, count in analysis.get("features_summary", {}).items():
-                    merged_dxf["features_summary"][ftype] = merged_dxf["features_summary"].get(ftype, 0) + count
-
-                # Merge material quantities
-                merged_dxf["material_quantities"].extend(analysis.get("material_quantities", []))
-
-                # Merge texts
-                merged_dxf["texts_extracted"].extend(analysis.get("texts_extracted", []))
-
-                # Merge layers
-                merged_dxf["layers"].update(analysis.get("layers", {}))
-
-                # Merge blocks
-                merged_dxf["blocks_analyzed"].update(analysis.get("blocks_analyzed", {}))
-
-        merged_dxf["total_profiles"] = len(merged_dxf["profiles"])
-        merged_dxf["total_features"] = sum(merged_dxf["features_summary"].values())
-
-        project["merged_dxf_analysis"] = merged_dxf
-
-    # Merge PDF analyses
-    if project["pdf_analyses"]:
-        merged_pdf = {
-            "success": True,
-            "bom_items": [],
-            "constraints": [],
-            "dimension_specs": [],
-            "material_specs": [],
-            "profile_references": [],
-            "total_items": 0,
-            "total_constraints": 0,
-            "files_merged": len(project["pdf_analyses"])
-        }
+    try:
+        return project_store.update_with(project_id, merge)
+    except ProjectNotFoundError:
+        raise RuntimeError("Projeto removido durante o processamento")
 
-        for analysis in project["pdf_analyses"]:
-            if analysis.get("success"):
-                # Merge BOM items
-                for item in analysis.get("bom_items", []):
-                    item["source_file"] = analysis.get("document_info", {}).get("filename", "")
-                    merged_pdf["bom_items"].append(item)
 
-                # Merge constraints
-                for constraint in analysis.get("constraints", []):
-                    constraint["source_file"] = analysis.get("document_info", {}).get("filename", "")
-                    merged_pdf["constraints"].append(constraint)
+def submit_parse(pending: Dict, page_workers: int = 1,
+                 max_ocr_pages: int = PDFReader.DEFAULT_MAX_OCR_PAGES):
+    """
+    Return a cached analysis, or a parse future from the process pool.
+    page_workers is the file's share of PARSE_WORKERS, used for both page shards and OCR threads.
+    """
+    if pending["ext"] == '.dxf':
+        streaming = use_dxf_streaming(pending["size_bytes"])
+        cached = parse_cache.get("dxf", dxf_cache_version(streaming), pending["sha256"])
+        return cached if cached is not None else parse_pool.submit(parse_dxf_file, pending["path"], streaming)
 
-                # Merge specs
-                merged_pdf["dimension_specs"].extend(analysis.get("dimension_specs", []))
-                merged_pdf["material_specs"].extend(analysis.get("material_specs", []))
-                merged_pdf["profile_references"].extend(analysis.get("profile_references", []))
+    cached = parse_cache.get("pdf", pdf_cache_version(max_ocr_pages), pending["sha256"])
+    if cached is not None:
+        return cached
+    return parse_pool.submit(parse_pdf_file, pending["path"], page_workers, max_ocr_pages, ocr_cache,
+                             ocr_workers=page_workers)
 
-        # Deduplicate profile references
-        merged_pdf["profile_references"] = list(set(merged_pdf["profile_references"]))
 
-        merged_pdf["total_items"] = len(merged_pdf["bom_items"])
-        merged_pdf["total_constraints"] = len(merged_pdf["constraints"])
+def resolve_parse(pending: Dict, parse_result,
+                  max_ocr_pages: int = PDFReader.DEFAULT_MAX_OCR_PAGES) -> dict:
+    """
+    Wait for a parse submitted by submit_parse, cache it, and label a shallow copy
+    with the uploaded filename (the stored file is named after its hash) and the
+    cache version it was parsed with.
+    """
+    is_dxf = pending["ext"] == '.dxf'
+    if is_dxf:
+        version = dxf_cache_version(use_dxf_streaming(pending["size_bytes"]))
+    else:
+        version = pdf_cache_version(max_ocr_pages)
 
-        project["merged_pdf_analysis"] = merged_pdf
+    if isinstance(parse_result, dict):
+        analysis = parse_result
+    else:
+        analysis = parse_result.result()
+        parse_cache.put("dxf" if is_dxf else "pdf", version, pending["sha256"], analysis)
+        if not is_dxf:
+            # Pool workers only add OCR entries; the size limit is enforced here
+            ocr_cache.trim()
+
+    info_key = "file_info" if is_dxf else "document_info"
+    analysis = dict(analysis)
+    analysis[info_key] = dict(analysis.get(info_key) or {}, filename=pending["filename"], cache_version=version)
+    return analysis
+
+
+def unmerge_project_file(project: Dict, file_info: Dict):
+    """Take a removed file out of the project's merged summary (its part goes with its row)"""
+    kind = file_info["type"]
+    key = f"merged_{kind}_analysis"
+    project[key] = remove_analysis(
+        kind, project.get(key), file_info["id"],
+        lambda: project_store.get_merge_parts(project["id"], kind)
+    )
 
 
 def categorize_dxf(analysis: dict) -> str:
@@ -616,76 +839,222 @@ def get_analysis_summary(analysis: dict, file_type: str) -> dict:
 
 # ============== Analysis Endpoints ==============
 
-@app.get("/api/projects/{project_id}/dxf-analysis")
-async def get_dxf_analysis(project_id: str):
-    """Get merged DXF analysis for a project"""
-    if project_id not in projects_db:
+def load_project_analysis(project_id: str, kind: str, file_id: Optional[str] = None) -> dict:
+    """
+    The project's merged analysis of one kind (or its first file's if not merged yet),
+    or a single file's analysis when file_id is given
+    """
+    label = kind.upper()
+    if file_id is not None:
+        if not project_store.exists(project_id):
+            raise HTTPException(status_code=404, detail="Project not found")
+        file_info = project_store.get_file(file_id, project_id=project_id)
+        if file_info is None or file_info["type"] != kind:
+            raise HTTPException(status_code=404, detail=f"Ficheiro {label} não encontrado no projeto")
+        return file_info["analysis"]
+
+    try:
+        merged = project_store.get_field(project_id, f"merged_{kind}_analysis")
+    except ProjectNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
+    if merged:
+        return merged
 
-    if project["merged_dxf_analysis"]:
-        return project["merged_dxf_analysis"]
-    elif project["dxf_analyses"]:
-        return project["dxf_analyses"][0]
+    first = project_store.get_analyses(project_id, kind, limit=1)
+    if first:
+        return first[0]
     else:
-        raise HTTPException(status_code=404, detail="Nenhuma análise DXF disponível")
+        raise HTTPException(status_code=404, detail=f"Nenhuma análise {label} disponível")
+
+
+def analysis_collection_page(project_id: str, kind: str, collection: str, file_id: Optional[str],
+                             limit: int, cursor: Optional[str], fields: Optional[str]) -> dict:
+    name = resolve_collection(kind, collection)
+    if name is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Coleção desconhecida: {collection} (disponíveis: {', '.join(COLLECTIONS[kind])})"
+        )
+
+    analysis = load_project_analysis(project_id, kind, file_id)
+    try:
+        page = paginate(analysis.get(name) or [], limit, cursor, parse_fields(fields))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {"collection": name, **page}
+
+
+@app.get("/api/projects/{project_id}/dxf-analysis")
+async def get_dxf_analysis(project_id: str, file_id: Optional[str] = None, fields: Optional[str] = None):
+    """
+    Get merged DXF analysis for a project (or one file's with file_id).
+    fields=statistics,layers,... returns only those top-level keys.
+    """
+    analysis = await run_in_threadpool(load_project_analysis, project_id, "dxf", file_id)
+    return json_response(select_fields(analysis, parse_fields(fields)))
+
+
+@app.get("/api/projects/{project_id}/dxf-analysis/{collection}")
+async def get_dxf_collection(project_id: str, collection: str,
+                             file_id: Optional[str] = None,
+                             limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                             cursor: Optional[str] = None,
+                             fields: Optional[str] = None):
+    """
+    One page of a DXF collection (profiles, texts, features, material_quantities).
+    Pass next_cursor back as cursor for the following page; fields selects item keys.
+    """
+    return json_response(await run_in_threadpool(
+        analysis_collection_page, project_id, "dxf", collection, file_id, limit, cursor, fields
+    ))
 
 
 @app.get("/api/projects/{project_id}/pdf-analysis")
-async def get_pdf_analysis(project_id: str):
-    """Get merged PDF analysis for a project"""
-    if project_id not in projects_db:
-        raise HTTPException(status_code=404, detail="Project not found")
+async def get_pdf_analysis(project_id: str, file_id: Optional[str] = None, fields: Optional[str] = None):
+    """
+    Get merged PDF analysis for a project (or one file's with file_id).
+    fields=bom_items,total_items,... returns only those top-level keys.
+    """
+    analysis = await run_in_threadpool(load_project_analysis, project_id, "pdf", file_id)
+    return json_response(select_fields(analysis, parse_fields(fields)))
 
-    project = projects_db[project_id]
 
-    if project["merged_pdf_analysis"]:
-        return project["merged_pdf_analysis"]
-    elif project["pdf_analyses"]:
-        return project["pdf_analyses"][0]
-    else:
-        raise HTTPException(status_code=404, detail="Nenhuma análise PDF disponível")
+@app.get("/api/projects/{project_id}/pdf-analysis/{collection}")
+async def get_pdf_collection(project_id: str, collection: str,
+                             file_id: Optional[str] = None,
+                             limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+                             cursor: Optional[str] = None,
+                             fields: Optional[str] = None):
+    """
+    One page of a PDF collection (bom_items, constraints, dimension_specs, material_specs).
+    Pass next_cursor back as cursor for the following page; fields selects item keys.
+    """
+    return json_response(await run_in_threadpool(
+        analysis_collection_page, project_id, "pdf", collection, file_id, limit, cursor, fields
+    ))
 
 
 @app.get("/api/projects/{project_id}/all-analyses")
-async def get_all_analyses(project_id: str):
-    """Get all individual analyses for a project"""
-    if project_id not in projects_db:
+async def get_all_analyses(project_id: str, fields: Optional[str] = None):
+    """
+    Get all individual analyses for a project.
+    fields=... keeps only those top-level keys of every analysis (e.g. fields=success,statistics).
+    """
+    try:
+        project = await run_in_threadpool(project_store.get, project_id, True)
+    except ProjectNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
+    selected = parse_fields(fields)
 
-    return {
-        "dxf_analyses": project["dxf_analyses"],
-        "pdf_analyses": project["pdf_analyses"],
-        "merged_dxf": project["merged_dxf_analysis"],
-        "merged_pdf": project["merged_pdf_analysis"],
+    return json_response({
+        "dxf_analyses": [select_fields(a, selected) for a in project["dxf_analyses"]],
+        "pdf_analyses": [select_fields(a, selected) for a in project["pdf_analyses"]],
+        "merged_dxf": select_fields(project["merged_dxf_analysis"], selected),
+        "merged_pdf": select_fields(project["merged_pdf_analysis"], selected),
         "files_count": {
             "dxf": len(project["dxf_analyses"]),
             "pdf": len(project["pdf_analyses"])
         }
-    }
+    })
 
 
-@app.get("/api/projects/{project_id}/dxf-preview")
-async def get_dxf_preview(project_id: str):
-    """Get SVG preview of DXF file"""
-    if project_id not in projects_db:
+def find_project_dxf_file(project_id: str, file_id: Optional[str]):
+    """
+    DXF files of a project and the requested one (the first one unless file_id is given).
+    Only file records are read; the analysis is loaded with dxf_file_analysis when a cache misses.
+    """
+    try:
+        project = project_store.get(project_id)
+    except ProjectNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
     dxf_files = [f for f in project.get("files", []) if f["type"] == "dxf"]
 
     if not dxf_files:
         raise HTTPException(status_code=404, detail="Nenhum ficheiro DXF no projeto")
 
-    # Generate SVG preview from first DXF
-    parser = DXFParser(dxf_files[0]["path"])
-    parser.parse()
-    svg = parser.get_svg_preview()
+    if file_id is None:
+        dxf_file = dxf_files[0]
+    else:
+        dxf_file = next((f for f in dxf_files if f["id"] == file_id), None)
+        if dxf_file is None:
+            raise HTTPException(status_code=404, detail="Ficheiro DXF não encontrado no projeto")
+
+    if not dxf_file.get("analysis_success"):
+        raise HTTPException(status_code=422, detail="Análise DXF falhou para este ficheiro")
+
+    return dxf_files, dxf_file
+
 
-    return {"svg": svg, "file": dxf_files[0]["filename"]}
+def dxf_file_analysis(file_id: str) -> dict:
+    dxf_file = project_store.get_file(file_id)
+    if dxf_file is None:
+        raise HTTPException(status_code=404, detail="Ficheiro DXF não encontrado no projeto")
+    return dxf_file["analysis"]
+
+
+@app.get("/api/projects/{project_id}/dxf-preview")
+async def get_dxf_preview(project_id: str,
+                          file_id: Optional[str] = None,
+                          width: int = Query(PREVIEW_DEFAULT_WIDTH, ge=16, le=8192),
+                          height: int = Query(PREVIEW_DEFAULT_HEIGHT, ge=16, le=8192)):
+    """
+    Get SVG preview of a DXF file of the project (the first one unless file_id is given).
+    Rendered from the stored analysis with sub-pixel geometry merged; the default size is cached per file.
+    """
+    dxf_files, dxf_file = await run_in_threadpool(find_project_dxf_file, project_id, file_id)
+    svg = await run_in_threadpool(
+        dxf_preview_svg, dxf_file["sha256"], dxf_file["cache_version"],
+        lambda: dxf_file_analysis(dxf_file["id"]), width, height
+    )
+
+    return {
+        "svg": svg,
+        "file": dxf_file["filename"],
+        "file_id": dxf_file["id"],
+        "width": width,
+        "height": height,
+        "dxf_files": [{"id": f["id"], "filename": f["filename"]} for f in dxf_files]
+    }
+
+
+@app.get("/api/projects/{project_id}/dxf-tiles")
+async def get_dxf_tiles_info(project_id: str, file_id: Optional[str] = None):
+    """
+    Tile pyramid description of a DXF file, for pan/zoom viewers.
+    Tiles are fetched from url_template; zoom z has 2**z x 2**z tiles over a square extent from origin.
+    """
+    dxf_files, dxf_file = await run_in_threadpool(find_project_dxf_file, project_id, file_id)
+    tileset = await run_in_threadpool(dxf_tileset, dxf_file["sha256"], lambda: dxf_file_analysis(dxf_file["id"]))
+
+    return {
+        **tileset.metadata(),
+        "file": dxf_file["filename"],
+        "file_id": dxf_file["id"],
+        "url_template": f"/api/projects/{project_id}/dxf-tiles/{dxf_file['id']}/{{z}}/{{x}}/{{y}}.svg",
+        "dxf_files": [{"id": f["id"], "filename": f["filename"]} for f in dxf_files]
+    }
+
+
+@app.get("/api/projects/{project_id}/dxf-tiles/{file_id}/{z}/{x}/{y}.svg")
+async def get_dxf_tile(project_id: str, file_id: str, z: int, x: int, y: int):
+    """One SVG tile: only the profiles and holes overlapping it, at its level of detail"""
+    if not 0 <= z <= TILE_MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=404, detail="Tile fora da pirâmide")
+    _, dxf_file = await run_in_threadpool(find_project_dxf_file, project_id, file_id)
+
+    tileset = await run_in_threadpool(dxf_tileset, dxf_file["sha256"], lambda: dxf_file_analysis(dxf_file["id"]))
+    svg = await run_in_threadpool(tileset.render_tile, z, x, y)
+
+    # A file id always refers to the same content, so tiles never change
+    return Response(
+        content=svg,
+        media_type="image/svg+xml",
+        headers={"Cache-Control": "public, max-age=86400"}
+    )
 
 
 # ============== Budget Calculation ==============
@@ -696,17 +1065,24 @@ async def calculate_budget(request: BudgetRequest):
     Calculate complete budget based on uploaded files
     REGRA: Quantidades DXF prevalecem sobre PDF
     """
-    if request.project_id not in projects_db:
+    return json_response(await run_in_threadpool(calculate_project_budget, request))
+
+
+def calculate_project_budget(request: BudgetRequest) -> dict:
+    """Calculate and store a project's budget from its merged analyses (blocking; run in the threadpool)"""
+    try:
+        project = project_store.get(request.project_id)
+    except ProjectNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[request.project_id]
+    files_count = project_store.count_files(request.project_id)
 
     # Use merged analyses
-    dxf_analysis = project.get("merged_dxf_analysis") or (
-        project["dxf_analyses"][0] if project["dxf_analyses"] else {"success": False}
+    dxf_analysis = project_store.get_field(request.project_id, "merged_dxf_analysis") or next(
+        iter(project_store.get_analyses(request.project_id, "dxf", limit=1)), {"success": False}
     )
-    pdf_analysis = project.get("merged_pdf_analysis") or (
-        project["pdf_analyses"][0] if project["pdf_analyses"] else {"success": False}
+    pdf_analysis = project_store.get_field(request.project_id, "merged_pdf_analysis") or next(
+        iter(project_store.get_analyses(request.project_id, "pdf", limit=1)), {"success": False}
     )
 
     has_dxf = dxf_analysis.get("success", False)
@@ -740,15 +1116,14 @@ async def calculate_budget(request: BudgetRequest):
 
     # Add source information
     budget["data_sources"] = {
-        "dxf_files_used": len(project["dxf_analyses"]),
-        "pdf_files_used": len(project["pdf_analyses"]),
+        "dxf_files_used": files_count.get("dxf", 0),
+        "pdf_files_used": files_count.get("pdf", 0),
         "quantity_source": "DXF" if has_dxf else "PDF",
         "specifications_source": "PDF" if has_pdf else "DXF"
     }
 
     # Store budget in project
-    project["budget"] = budget
-    project["status"] = "calculated"
+    project_store.update(request.project_id, budget=budget, status="calculated")
 
     return budget
 
@@ -766,12 +1141,11 @@ async def quick_estimate(request: QuickEstimateRequest):
 @app.post("/api/projects/{project_id}/simulate-margin")
 async def simulate_margin(project_id: str, target_margin_pct: float = 25.0):
     """Simulate different profit margins"""
-    if project_id not in projects_db:
+    try:
+        budget = await run_in_threadpool(project_store.get_field, project_id, "budget")
+    except ProjectNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
-    budget = project.get("budget")
-
     if not budget:
         raise HTTPException(status_code=400, detail="Nenhum orçamento calculado ainda")
 
@@ -792,252 +1166,72 @@ async def simulate_margin(project_id: str, target_margin_pct: float = 25.0):
 
 # ============== Export Endpoints ==============
 
-@app.get("/api/projects/{project_id}/export/json")
-async def export_json(project_id: str):
-    """Export budget as JSON"""
-    if project_id not in projects_db:
+def budget_export_chunks(project_id: str, export_format: str, produce):
+    """
+    Chunks of a budget export: the cached copy for the current budget version,
+    or produce(budget) streamed straight from the stored budget (and recorded)
+    """
+    try:
+        version = project_store.budget_version(project_id)
+    except ProjectNotFoundError:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    project = projects_db[project_id]
-    budget = project.get("budget")
+    cached = export_cache.get((project_id, version, export_format))
+    if cached is not None:
+        return iter((cached,))
 
+    budget, version = project_store.get_budget(project_id)
     if not budget:
         raise HTTPException(status_code=400, detail="Nenhum orçamento para exportar")
 
-    export_path = EXPORT_DIR / f"quote_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    return export_cache.record((project_id, version, export_format), produce(budget))
 
-    with open(export_path, "w", encoding="utf-8") as f:
-        json.dump(budget, f, indent=2, ensure_ascii=False)
 
-    return FileResponse(
-        path=export_path,
-        filename=export_path.name,
-        media_type="application/json"
-    )
+def export_filename(prefix: str, project_id: str, ext: str) -> str:
+    return f"{prefix}_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{ext}"
 
 
-@app.get("/api/projects/{project_id}/export/pdf")
-async def export_pdf(project_id: str):
-    """Export budget as professional PDF document"""
-    if project_id not in projects_db:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    project = projects_db[project_id]
-    budget = project.get("budget")
+@app.get("/api/projects/{project_id}/export/json")
+async def export_json(project_id: str):
+    """Export budget as JSON (streamed, no temp file)"""
+    chunks = await run_in_threadpool(budget_export_chunks, project_id, "json", iter_json)
 
-    if not budget:
-        raise HTTPException(status_code=400, detail="Nenhum orçamento para exportar")
+    return StreamingResponse(
+        chunks,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("quote", project_id, "json")}"'}
+    )
 
-    # Create PDF
-    export_path = EXPORT_DIR / f"orcamento_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
 
-    doc = SimpleDocTemplate(
-        str(export_path),
-        pagesize=A4,
-        rightMargin=15*mm,
-        leftMargin=15*mm,
-        topMargin=15*mm,
-        bottomMargin=15*mm
-    )
+def quote_pdf_path(project_id: str) -> Path:
+    """
+    Cached quote PDF for the current budget, rendered on first request.
+    The hash and the rendered budget come from the same read of the budget row.
+    """
+    try:
+        budget_json = project_store.budget_json(project_id)
+    except ProjectNotFoundError:
+        raise HTTPException(status_code=404, detail="Project not found")
 
-    # Styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#0ea5e9'),
-        spaceAfter=10,
-        alignment=TA_CENTER
-    )
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#6b7280'),
-        alignment=TA_CENTER,
-        spaceAfter=20
-    )
-    section_style = ParagraphStyle(
-        'Section',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#1f2937'),
-        spaceBefore=15,
-        spaceAfter=10
-    )
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=9
-    )
+    if budget_json is None:
+        raise HTTPException(status_code=400, detail="Nenhum orçamento para exportar")
 
-    elements = []
+    digest = QuotePDFCache.budget_hash(budget_json)
+    cached = quote_pdf_cache.get(project_id, digest)
+    if cached is not None:
+        return cached
 
-    # Header
-    elements.append(Paragraph("AluQuote AI", title_style))
-    elements.append(Paragraph("Orçamento de Serralharia de Alumínio", subtitle_style))
+    budget = json.loads(budget_json)
+    if not budget:
+        raise HTTPException(status_code=400, detail="Nenhum orçamento para exportar")
 
-    # Project Info
-    summary = budget.get("summary", {})
-    project_info = [
-        ["Projeto:", summary.get("project_name", "N/A")],
-        ["Data:", datetime.now().strftime("%d/%m/%Y %H:%M")],
-        ["Referência:", f"ORÇ-{project_id.upper()}"]
-    ]
-
-    info_table = Table(project_info, colWidths=[80, 300])
-    info_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#6b7280')),
-        ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#1f2937')),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-    ]))
-    elements.append(info_table)
-    elements.append(Spacer(1, 15))
-
-    # Summary Stats
-    elements.append(Paragraph("Resumo do Orçamento", section_style))
-
-    quantities = summary.get("quantities", {})
-    totals = summary.get("totals", {})
-    metrics = summary.get("metrics", {})
-
-    summary_data = [
-        ["Descrição", "Valor"],
-        ["Total de Perfis", str(quantities.get("total_profiles", 0))],
-        ["Quantidade Total", str(quantities.get("total_quantity", 0))],
-        ["Peso Total (kg)", f"{quantities.get('total_weight_kg', 0):.2f}"],
-        ["Horas de Produção", f"{metrics.get('production_hours', 0):.1f}h"],
-        ["Fator de Desperdício", f"{metrics.get('waste_percentage', 0):.1f}%"],
-    ]
-
-    summary_table = Table(summary_data, colWidths=[250, 150])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-    ]))
-    elements.append(summary_table)
-    elements.append(Spacer(1, 15))
-
-    # Line Items
-    elements.append(Paragraph("Itens do Orçamento", section_style))
-
-    line_items = budget.get("line_items", [])
-
-    items_header = ["#", "Referência", "Descrição", "Qtd", "Peso(kg)", "Material", "Tratam.", "M.O.", "Total"]
-    items_data = [items_header]
-
-    for item in line_items:
-        costs = item.get("costs", {})
-        geometry = item.get("geometry", {})
-        row = [
-            str(item.get("line_id", "")),
-            item.get("reference", "-")[:15],
-            item.get("description", "-")[:20],
-            str(item.get("quantity", 0)),
-            f"{geometry.get('weight_kg', 0):.2f}",
-            f"{costs.get('raw_material', 0):.2f}",
-            f"{costs.get('surface_treatment', 0):.2f}",
-            f"{costs.get('labor', 0):.2f}",
-            f"{item.get('total_cost', 0):.2f}"
-        ]
-        items_data.append(row)
-
-    items_table = Table(items_data, colWidths=[20, 55, 80, 25, 40, 45, 40, 35, 45])
-    items_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('ALIGN', (0, 0), (0, -1), 'CENTER'),
-        ('ALIGN', (3, 0), (-1, -1), 'RIGHT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    elements.append(items_table)
-    elements.append(Spacer(1, 15))
-
-    # Cost Breakdown
-    elements.append(Paragraph("Decomposição de Custos", section_style))
-
-    cost_breakdown = summary.get("cost_breakdown", {})
-    breakdown_data = [["Categoria", "Valor (EUR)"]]
-
-    cost_labels = {
-        "raw_material": "Matéria-Prima",
-        "transformation": "Transformação",
-        "surface_treatment": "Tratamento Superfície",
-        "labor": "Mão de Obra",
-        "accessories": "Acessórios",
-        "waste_allowance": "Provisão Desperdício",
-        "overhead": "Custos Gerais"
-    }
+    return quote_pdf_cache.put(project_id, digest, render_quote_pdf(project_id, budget))
 
-    for key, value in cost_breakdown.items():
-        label = cost_labels.get(key, key.replace("_", " ").title())
-        breakdown_data.append([label, f"{value:.2f} €"])
-
-    breakdown_table = Table(breakdown_data, colWidths=[250, 150])
-    breakdown_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')]),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-    ]))
-    elements.append(breakdown_table)
-    elements.append(Spacer(1, 20))
-
-    # Totals
-    totals_data = [
-        ["Subtotal:", f"{totals.get('subtotal', 0):.2f} €"],
-        ["Margem de Lucro:", f"{totals.get('profit_margin', 0):.2f} €"],
-        ["TOTAL ORÇAMENTO:", f"{totals.get('total_quote', 0):.2f} €"],
-    ]
-
-    totals_table = Table(totals_data, colWidths=[300, 100])
-    totals_table.setStyle(TableStyle([
-        ('FONTSIZE', (0, 0), (-1, -1), 11),
-        ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#0ea5e9')),
-        ('FONTSIZE', (0, -1), (-1, -1), 14),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#0ea5e9')),
-    ]))
-    elements.append(totals_table)
-    elements.append(Spacer(1, 30))
-
-    # Footer
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.HexColor('#9ca3af'),
-        alignment=TA_CENTER
-    )
-    elements.append(Paragraph("Orçamento gerado automaticamente por AluQuote AI | Válido por 30 dias", footer_style))
-    elements.append(Paragraph(f"Documento: ORÇ-{project_id.upper()} | {datetime.now().strftime('%d/%m/%Y')}", footer_style))
 
-    # Build PDF
-    doc.build(elements)
+@app.get("/api/projects/{project_id}/export/pdf")
+async def export_pdf(project_id: str):
+    """Export budget as professional PDF document (rendered off the event loop, cached per budget)"""
+    export_path = await run_in_threadpool(quote_pdf_path, project_id)
 
     return FileResponse(
         path=export_path,
@@ -1048,58 +1242,13 @@ async def export_pdf(project_id: str):
 
 @app.get("/api/projects/{project_id}/export/csv")
 async def export_csv(project_id: str):
-    """Export budget line items as CSV"""
-    if project_id not in projects_db:
-        raise HTTPException(status_code=404, detail="Project not found")
-
-    project = projects_db[project_id]
-    budget = project.get("budget")
-
-    if not budget:
-        raise HTTPException(status_code=400, detail="Nenhum orçamento para exportar")
-
-    import csv
-
-    export_path = EXPORT_DIR / f"quote_{project_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-
-    line_items = budget.get("line_items", [])
-
-    with open(export_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        # Header
-        writer.writerow([
-            "Linha", "Referência", "Descrição", "Qtd", "Fonte Qtd",
-            "Perímetro (mm)", "Comprimento (mm)", "Peso (kg)",
-            "Custo Material", "Custo Tratamento", "Custo M.O.",
-            "Custo Unitário", "Custo Total", "Confiança"
-        ])
-
-        # Data rows
-        for item in line_items:
-            geometry = item.get("geometry", {})
-            costs = item.get("costs", {})
-            writer.writerow([
-                item["line_id"],
-                item["reference"],
-                item["description"],
-                item["quantity"],
-                item.get("quantity_source", ""),
-                geometry.get("perimeter_mm", 0),
-                geometry.get("length_mm", 0),
-                geometry.get("weight_kg", 0),
-                costs.get("raw_material", 0),
-                costs.get("surface_treatment", 0),
-                costs.get("labor", 0),
-                item["unit_cost"],
-                item["total_cost"],
-                item.get("correlation_confidence", 0)
-            ])
+    """Export budget line items as CSV (streamed row by row, no temp file)"""
+    chunks = await run_in_threadpool(budget_export_chunks, project_id, "csv", iter_csv)
 
-    return FileResponse(
-        path=export_path,
-        filename=export_path.name,
-        media_type="text/csv"
+    return StreamingResponse(
+        chunks,
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("quote", project_id, "csv")}"'}
     )
 
 
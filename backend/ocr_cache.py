@@ -0,0 +1,79 @@
+"""
+AluQuote AI - OCR Cache Module
+Cache persistente de resultados OCR, indexado pelo hash da imagem da página
+Evita voltar a correr o tesseract em PDFs digitalizados já analisados
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from upload_store import _atomic_write, trim_cache_dir
+
+
+class OCRCache:
+    """
+    Disk-backed OCR text cache keyed by (page raster hash, DPI, tesseract lang/config).
+    Entries are evicted least-recently-used first once the cache exceeds max_bytes
+    (an entry's mtime is refreshed on every hit).
+
+    The size is always measured on the directory, never counted per process.
+    Copies sent to ParsePool workers are pickled as root + limit only and never
+    evict; the process that created the cache trims it after their parses finish
+    (and after its own writes).
+    """
+
+    FILE_SUFFIX = ".txt"
+
+    def __init__(self, root: Path, max_bytes: int = 256 * 1024 * 1024, evict: bool = True):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.evict = evict
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"root": self.root, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(state["root"], state["max_bytes"], evict=False)
+
+    @staticmethod
+    def make_key(image, dpi: int, lang: str, config: str) -> str:
+        """Hash the rendered page pixels together with the OCR settings"""
+        digest = hashlib.sha256()
+        digest.update(f"{image.mode}|{image.size[0]}x{image.size[1]}|{dpi}|{lang}|{config}|".encode("utf-8"))
+        digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{self.FILE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return text
+
+    def put(self, key: str, text: str):
+        try:
+            _atomic_write(self._path(key), text.encode("utf-8"))
+        except OSError:
+            return
+
+        if self.evict:
+            self.trim()
+
+    def trim(self) -> int:
+        """Enforce max_bytes over the cache directory (all processes' entries); returns the bytes kept"""
+        with self._lock:
+            return trim_cache_dir(self.root, f"*{self.FILE_SUFFIX}", self.max_bytes)
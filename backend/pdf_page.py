@@ -0,0 +1,146 @@
+"""
+AluQuote AI - PDF Page Module
+Extração por página (texto, palavras e tabelas) calculada uma única vez
+O texto, as palavras e as duas estratégias de tabelas partilham o mesmo trabalho do pdfplumber
+Métricas baratas (vetores, fragmentação do texto) para a triagem das páginas
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pdfplumber.table import TableFinder, TableSettings
+from pdfplumber.utils import extract_text
+
+# Table strategies tried on every page (pdfplumber defaults to ruling lines)
+LINES_TABLE_SETTINGS: Dict[str, Any] = {}
+TEXT_TABLE_SETTINGS = {
+    "vertical_strategy": "text",
+    "horizontal_strategy": "text"
+}
+
+# Page kinds assigned by PDFReader's triage; each gets its own extraction pipeline
+PAGE_BOM_TABLE = "bom_table"
+PAGE_PROSE = "prose"
+PAGE_DRAWING = "drawing"
+
+# Word settings TableFinder uses for the text strategy; they match extract_words() defaults
+DEFAULT_WORD_SETTINGS = {"x_tolerance": 3, "y_tolerance": 3}
+
+
+def text_fragmentation(texts: Iterable[str]) -> Tuple[float, float]:
+    """(newlines per char, share of lines with at most one char) over the given texts"""
+    total_chars = 0
+    total_newlines = 0
+    single_char_lines = 0
+    total_lines = 0
+
+    for content in texts:
+        total_chars += len(content)
+        total_newlines += content.count('\n')
+
+        lines = content.split('\n')
+        total_lines += len(lines)
+        single_char_lines += sum(1 for l in lines if len(l.strip()) <= 1)
+
+    if total_chars == 0 or total_lines == 0:
+        return 0.0, 0.0
+    return total_newlines / total_chars, single_char_lines / total_lines
+
+
+def is_fragmented(newline_ratio: float, single_char_ratio: float) -> bool:
+    """Scattered, vertical or one-glyph-per-line text, typical of CAD drawings"""
+    return newline_ratio > 0.15 or single_char_ratio > 0.3
+
+
+class PageContent:
+    """
+    Lazily computed extraction results for one pdfplumber page.
+    The text-strategy table finder reuses the page words, and table cells are filled
+    from chars indexed by vertical position instead of a full chars scan per row.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self._text: Optional[str] = None
+        self._words: Optional[List[Dict]] = None
+        self._char_mids: Optional[List[float]] = None
+        self._char_order: Optional[List[int]] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.page.extract_text() or ""
+        return self._text
+
+    @property
+    def words(self) -> List[Dict]:
+        if self._words is None:
+            self._words = self.page.extract_words()
+        return self._words
+
+    @property
+    def vector_count(self) -> int:
+        """Line, rect and curve objects on the page (ruled tables, drawing geometry)"""
+        return len(self.page.lines) + len(self.page.rects) + len(self.page.curves)
+
+    def extract_words(self, **kwargs) -> List[Dict]:
+        """Page.extract_words for TableFinder, answered from the shared words for default settings"""
+        if kwargs == DEFAULT_WORD_SETTINGS:
+            return self.words
+        return self.page.extract_words(**kwargs)
+
+    def __getattr__(self, name: str):
+        # Everything else TableFinder/Table need (chars, edges, bbox...) comes from the page
+        return getattr(self.page, name)
+
+    def tables(self, table_settings: Optional[Dict[str, Any]] = None) -> List[List[List[Optional[str]]]]:
+        """Same result as page.extract_tables(table_settings)"""
+        settings = TableSettings.resolve(table_settings)
+        finder = TableFinder(self, settings)
+        return [self._extract_table(table, dict(settings.text_settings or {})) for table in finder.tables]
+
+    def _chars_in_band(self, top: float, bottom: float) -> List[int]:
+        """Indices (in page order) of chars whose vertical midpoint lies in [top, bottom)"""
+        if self._char_mids is None:
+            chars = self.page.chars
+            order = sorted(range(len(chars)), key=lambda i: (chars[i]["top"] + chars[i]["bottom"]) / 2)
+            self._char_order = order
+            self._char_mids = [(chars[i]["top"] + chars[i]["bottom"]) / 2 for i in order]
+
+        lo = bisect_left(self._char_mids, top)
+        hi = bisect_left(self._char_mids, bottom)
+        return sorted(self._char_order[lo:hi])
+
+    def _extract_table(self, table, kwargs: Dict[str, Any]) -> List[List[Optional[str]]]:
+        """pdfplumber Table.extract with the row chars looked up by vertical band"""
+        chars = self.page.chars
+        table_arr = []
+
+        for row in table.rows:
+            x0, top, x1, bottom = row.bbox
+            row_chars = [chars[i] for i in self._chars_in_band(top, bottom)
+                         if x0 <= (chars[i]["x0"] + chars[i]["x1"]) / 2 < x1]
+
+            arr = []
+            for cell in row.cells:
+                if cell is None:
+                    arr.append(None)
+                    continue
+
+                cell_chars = [
+                    char for char in row_chars
+                    if cell[0] <= (char["x0"] + char["x1"]) / 2 < cell[2]
+                    and cell[1] <= (char["top"] + char["bottom"]) / 2 < cell[3]
+                ]
+                if cell_chars:
+                    kwargs["x_shift"] = cell[0]
+                    kwargs["y_shift"] = cell[1]
+                    if "layout" in kwargs:
+                        kwargs["layout_width"] = cell[2] - cell[0]
+                        kwargs["layout_height"] = cell[3] - cell[1]
+                    arr.append(extract_text(cell_chars, **kwargs))
+                else:
+                    arr.append("")
+            table_arr.append(arr)
+
+        return table_arr
@@ -13,6 +13,15 @@ from collections import defaultdict
 import subprocess
 import tempfile
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ocr_cache import OCRCache
+from text_index import SubstringIndex
+from pdf_page import (
+    PageContent, LINES_TABLE_SETTINGS, TEXT_TABLE_SETTINGS,
+    PAGE_BOM_TABLE, PAGE_PROSE, PAGE_DRAWING, text_fragmentation, is_fragmented
+)
 
 # OCR imports
 # Fix for Python 3.14 compatibility: patch pkgutil.find_loader before importing pytesseract
@@ -68,6 +77,7 @@ class BOMItem:
     confidence: float
     source_page: int
     raw_row: List[str] = field(default_factory=list)
+    from_text: bool = False  # Extracted from unstructured text (deduplicated by description)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -134,6 +144,9 @@ class PDFReader:
     Leitura EXAUSTIVA de todos os ficheiros PDF
     """
 
+    # Bump whenever parse() output changes (invalidates cached analyses)
+    PARSER_VERSION = "2.2.0"
+
     # Header normalization mappings - EXTENDED
     HEADER_MAPPINGS = {
         # Quantity
@@ -286,9 +299,48 @@ class PDFReader:
         ],
     }
 
-    def __init__(self, file_path: str):
+    # Characters IGNORECASE equates with i/s that str.lower() does not map (or maps to two characters)
+    CASEFOLD_UNSAFE = re.compile('[\u0130\u0131\u017f]')
+
+    # Header fields that make a table (or a text line) look like a BOM
+    BOM_HEADER_FIELDS = {'quantity', 'reference', 'description', 'length', 'material'}
+
+    # Page triage: a page with at least DRAWING_MIN_VECTORS lines/rects/curves and more of them
+    # than chars is a drawing sheet; fewer than TABLE_MIN_RULINGS cannot hold a ruled table
+    DRAWING_MIN_VECTORS = 300
+    TABLE_MIN_RULINGS = 4
+
+    # Minimum pages per worker before page-sharded extraction is worth the process start-up
+    MIN_PAGES_PER_SHARD = 2
+
+    # OCR settings (150 DPI for balance of speed and quality, Portuguese + English)
+    DEFAULT_MAX_OCR_PAGES = 5
+    OCR_DPI = 150
+    OCR_MAX_WIDTH_PX = 2000
+    OCR_LANG = 'por+eng'
+    OCR_CONFIG = '--psm 6'  # Assume uniform text block
+
+    def __init__(self, file_path: str, page_workers: int = 1,
+                 max_ocr_pages: Optional[int] = None, ocr_workers: Optional[int] = None,
+                 ocr_cache: Optional[OCRCache] = None, skip_redundant_text_tables: bool = True,
+                 page_triage: bool = True):
         self.file_path = Path(file_path)
+        self.page_workers = max(1, page_workers)
+        # Skip the text-strategy table pass on pages whose ruled tables already had a BOM header
+        self.skip_redundant_text_tables = skip_redundant_text_tables
+        # Route each page to the BOM-table, prose or drawing pipeline (False = everything everywhere)
+        self.page_triage = page_triage
+        self.page_kinds: Dict[int, str] = {}
+        # max_ocr_pages <= 0 means OCR every page
+        self.max_ocr_pages = self.DEFAULT_MAX_OCR_PAGES if max_ocr_pages is None else max_ocr_pages
+        self.ocr_workers = max(1, ocr_workers or os.cpu_count() or 1)
+        self.ocr_cache = ocr_cache
+        self.ocr_cache_hits = 0
+        self.ocr_cache_misses = 0
         self.bom_items: List[BOMItem] = []
+        # Lowercased descriptions of bom_items, caught up lazily by _is_already_extracted
+        self._description_index: Optional[SubstringIndex] = None
+        self._indexed_items: Optional[List[BOMItem]] = None
         self.constraints: List[TechnicalConstraint] = []
         self.extracted_texts: List[ExtractedText] = []
         self.raw_tables: List[Dict] = []
@@ -313,11 +365,20 @@ class PDFReader:
                     "metadata": pdf.metadata or {}
                 }
 
+                shards = self._plan_page_shards(total_pages)
+
                 # First pass: try standard text extraction
-                for page_num, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text() or ""
-                    total_text_extracted += len(text.strip())
-                    self._process_page_exhaustive(page, page_num)
+                if len(shards) <= 1:
+                    total_text_extracted = self._process_page_range(pdf, 1, total_pages)
+
+            if len(shards) > 1:
+                total_text_extracted = self._process_shards_in_parallel(shards)
+
+            if self.page_triage:
+                self.document_info["page_kinds"] = {
+                    kind: sum(1 for k in self.page_kinds.values() if k == kind)
+                    for kind in (PAGE_BOM_TABLE, PAGE_PROSE, PAGE_DRAWING)
+                }
 
             # Check if PDF is scanned or has fragmented text (CAD drawings)
             avg_text_per_page = total_text_extracted / max(total_pages, 1)
@@ -378,30 +439,139 @@ class PDFReader:
                 "document_info": {"filename": self.file_path.name}
             }
 
-    def _process_page_exhaustive(self, page, page_num: int):
-        """Process a single PDF page EXHAUSTIVELY"""
+    def _process_page_range(self, pdf, first_page: int, last_page: int) -> int:
+        """Run exhaustive extraction on pages first_page..last_page (1-based, inclusive)"""
+        total_text = 0
+        for page_num in range(first_page, last_page + 1):
+            content = PageContent(pdf.pages[page_num - 1])
+            total_text += len(content.text.strip())
+            self._process_page_exhaustive(content, page_num)
+        return total_text
+
+    def _plan_page_shards(self, total_pages: int) -> List[Tuple[int, int]]:
+        """Split the document into contiguous page ranges, one per worker"""
+        n_shards = min(self.page_workers, total_pages // self.MIN_PAGES_PER_SHARD)
+        if n_shards <= 1:
+            return [(1, total_pages)]
+
+        base, extra = divmod(total_pages, n_shards)
+        shards = []
+        first = 1
+        for i in range(n_shards):
+            last = first + base - 1 + (1 if i < extra else 0)
+            shards.append((first, last))
+            first = last + 1
+        return shards
+
+    def _process_shards_in_parallel(self, shards: List[Tuple[int, int]]) -> int:
+        """Extract page ranges in worker processes and merge the results in page order"""
+        context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as executor:
+            futures = [
+                executor.submit(_extract_page_shard, str(self.file_path), first, last,
+                                self.skip_redundant_text_tables, self.page_triage)
+                for first, last in shards
+            ]
+            partials = [future.result() for future in futures]
+
+        total_text = 0
+        for partial in partials:
+            total_text += partial["text_chars"]
+            self._merge_page_shard(partial)
+        return total_text
+
+    def _export_page_shard(self) -> Dict[str, Any]:
+        """Collect per-page extraction state (used by page-shard workers)"""
+        return {
+            "bom_items": self.bom_items,
+            "constraints": self.constraints,
+            "extracted_texts": self.extracted_texts,
+            "raw_tables": self.raw_tables,
+            "all_text_content": self.all_text_content,
+            "dimension_specs": self.dimension_specs,
+            "material_specs": self.material_specs,
+            "page_kinds": self.page_kinds
+        }
 
-        # 1. Extract ALL tables on this page
-        tables = page.extract_tables()
+    def _merge_page_shard(self, partial: Dict[str, Any]):
+        """Append a shard's results, re-applying the text-item dedup across shard boundaries"""
+        for item in partial["bom_items"]:
+            if item.from_text and self._is_already_extracted(item.description):
+                continue
+            self.bom_items.append(item)
+
+        self.constraints.extend(partial["constraints"])
+        self.extracted_texts.extend(partial["extracted_texts"])
+        self.raw_tables.extend(partial["raw_tables"])
+        self.all_text_content.extend(partial["all_text_content"])
+        self.dimension_specs.extend(partial["dimension_specs"])
+        self.material_specs.extend(partial["material_specs"])
+        self.page_kinds.update(partial["page_kinds"])
+
+    def _triage_page(self, content: PageContent) -> str:
+        """
+        Cheap first-pass page classification from the text and the vector object count:
+        BOM header line or ruled tables -> PAGE_BOM_TABLE, CAD sheet -> PAGE_DRAWING, else PAGE_PROSE.
+        A missed header (split over two lines, sharing a band with title-block text) only costs
+        the text-strategy and word passes: ruled tables are still read on drawing sheets.
+        """
+        text = content.text
+        if any(self._is_bom_header_line(line) for line in text.split('\n')):
+            return PAGE_BOM_TABLE
+
+        vectors = content.vector_count
+        if not text.strip() or is_fragmented(*text_fragmentation([text])):
+            return PAGE_DRAWING
+        if vectors >= self.DRAWING_MIN_VECTORS and vectors > len(content.page.chars):
+            return PAGE_DRAWING
+        if vectors >= self.TABLE_MIN_RULINGS:
+            return PAGE_BOM_TABLE
+        return PAGE_PROSE
+
+    def _is_bom_header_line(self, line: str) -> bool:
+        """A text line made mostly of header words covering at least two BOM fields"""
+        tokens = line.lower().split()
+        if len(tokens) < 2:
+            return False
+        fields = [self.HEADER_MAPPINGS[token] for token in tokens if len(token) > 1 and token in self.HEADER_MAPPINGS]
+        return len(set(fields) & self.BOM_HEADER_FIELDS) >= 2 and 2 * len(fields) >= len(tokens)
+
+    def _process_page_exhaustive(self, content: PageContent, page_num: int):
+        """
+        Process a single PDF page EXHAUSTIVELY (text, words and chars are extracted once per page).
+        With page triage, prose pages skip table extraction, and drawing sheets keep only the
+        ruled-table pass (parts lists on the sheet) and skip the text-strategy table and
+        word-position passes (title-block noise). A drawing sheet whose ruled table has a
+        BOM header row is reclassified as a BOM-table page.
+        """
+        kind = self._triage_page(content) if self.page_triage else PAGE_BOM_TABLE
+
+        # 1. Extract ALL ruled tables on this page
+        found_bom_header = False
+        tables = content.tables(LINES_TABLE_SETTINGS) if kind != PAGE_PROSE else []
         for table in tables:
             if table and len(table) > 0:
-                self._parse_table_exhaustive(table, page_num)
+                found_bom_header |= self._parse_table_exhaustive(table, page_num)
+
+        if kind == PAGE_DRAWING and found_bom_header:
+            kind = PAGE_BOM_TABLE
+        self.page_kinds[page_num] = kind
 
         # 2. Also try table extraction with different settings
-        try:
-            tables_v2 = page.extract_tables(table_settings={
-                "vertical_strategy": "text",
-                "horizontal_strategy": "text"
-            })
-            for table in tables_v2:
-                if table and len(table) > 0:
-                    # Check if this table adds new data
-                    self._parse_table_exhaustive(table, page_num)
-        except:
-            pass
+        if kind == PAGE_BOM_TABLE and not (found_bom_header and self.skip_redundant_text_tables):
+            try:
+                tables_v2 = content.tables(TEXT_TABLE_SETTINGS)
+                for table in tables_v2:
+                    if table and len(table) > 0:
+                        # Check if this table adds new data
+                        self._parse_table_exhaustive(table, page_num)
+            except:
+                pass
 
         # 3. Extract ALL text content
-        text = page.extract_text() or ""
+        text = content.text
         if text.strip():
             # Store full text
             self.all_text_content.append({
@@ -419,16 +589,16 @@ class PDFReader:
             self._extract_items_from_text(text, page_num)
 
         # 4. Extract words with positions for spatial analysis
-        try:
-            words = page.extract_words()
-            self._analyze_word_positions(words, page_num)
-        except:
-            pass
+        if kind != PAGE_DRAWING:
+            try:
+                self._analyze_word_positions(content.words, page_num)
+            except:
+                pass
 
-    def _parse_table_exhaustive(self, table: List[List[str]], page_num: int):
-        """Parse a table exhaustively, trying multiple interpretation strategies"""
+    def _parse_table_exhaustive(self, table: List[List[str]], page_num: int) -> bool:
+        """Parse a table exhaustively, trying multiple interpretation strategies; True if it had a BOM header row"""
         if not table or len(table) < 1:
-            return
+            return False
 
         # Store raw table
         self.raw_tables.append({
@@ -439,9 +609,11 @@ class PDFReader:
         })
 
         # Strategy 1: First row as headers
+        has_bom_header = False
         if len(table) >= 2:
             headers = self._normalize_headers(table[0])
             if self._is_valid_header_row(headers):
+                has_bom_header = True
                 self._extract_bom_from_table(table[1:], headers, page_num)
 
         # Strategy 2: Try without headers (detect from content)
@@ -450,6 +622,8 @@ class PDFReader:
         # Strategy 3: Look for key-value pairs
         self._extract_key_value_pairs(table, page_num)
 
+        return has_bom_header
+
     def _normalize_headers(self, header_row: List[str]) -> Dict[int, str]:
         """Normalize table headers"""
         normalized = {}
@@ -477,8 +651,7 @@ class PDFReader:
 
     def _is_valid_header_row(self, headers: Dict[int, str]) -> bool:
         """Check if headers suggest a valid BOM table"""
-        important_fields = {'quantity', 'reference', 'description', 'length', 'material'}
-        return len(set(headers.values()) & important_fields) >= 1
+        return len(set(headers.values()) & self.BOM_HEADER_FIELDS) >= 1
 
     def _extract_bom_from_table(self, rows: List[List[str]], headers: Dict[int, str], page_num: int):
         """Extract BOM items from table rows"""
@@ -687,33 +860,53 @@ class PDFReader:
                             "page": page_num
                         })
 
+    @classmethod
+    def _constraint_matchers(cls) -> List[Tuple[str, str, Any, Any]]:
+        """
+        CONSTRAINT_PATTERNS compiled once per class: (type, importance, lowercase pattern, IGNORECASE pattern).
+        The lowercase patterns run case-sensitively on text.lower(), which keeps sre's literal
+        prefix scan (IGNORECASE disables it) and finds exactly the same matches.
+        """
+        if '_compiled_constraints' not in cls.__dict__:
+            matchers = []
+            for constraint_type, patterns in cls.CONSTRAINT_PATTERNS.items():
+                importance = "medium"
+                if constraint_type in ['surface_treatment', 'material_grade', 'certification']:
+                    importance = "high"
+                elif constraint_type in ['hardware', 'seal_gasket']:
+                    importance = "low"
+
+                for pattern in patterns:
+                    # Lowercase the literals only; escapes like \d and \s keep their meaning
+                    lowered = re.sub(r'\\.|[^\\]+',
+                                     lambda m: m.group() if m.group().startswith('\\') else m.group().lower(),
+                                     pattern)
+                    matchers.append((constraint_type, importance,
+                                     re.compile(lowered, re.MULTILINE),
+                                     re.compile(pattern, re.IGNORECASE | re.MULTILINE)))
+            cls._compiled_constraints = matchers
+        return cls._compiled_constraints
+
     def _extract_constraints_exhaustive(self, text: str, page_num: int):
         """Extract ALL technical constraints from text"""
         text_lower = text.lower()
-
-        for constraint_type, patterns in self.CONSTRAINT_PATTERNS.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE)
-                for match in matches:
-                    start = max(0, match.start() - 100)
-                    end = min(len(text), match.end() + 100)
-                    context = text[start:end].strip()
-                    context = re.sub(r'\s+', ' ', context)
-
-                    # Determine importance
-                    importance = "medium"
-                    if constraint_type in ['surface_treatment', 'material_grade', 'certification']:
-                        importance = "high"
-                    elif constraint_type in ['hardware', 'seal_gasket']:
-                        importance = "low"
-
-                    self.constraints.append(TechnicalConstraint(
-                        constraint_type=constraint_type,
-                        value=match.group(),
-                        context=context,
-                        source_page=page_num,
-                        importance=importance
-                    ))
+        folded = len(text_lower) == len(text) and not self.CASEFOLD_UNSAFE.search(text)
+        subject = text_lower if folded else text
+
+        for constraint_type, importance, lowered, ignorecase in self._constraint_matchers():
+            for match in (lowered if folded else ignorecase).finditer(subject):
+                start = max(0, match.start() - 100)
+                end = min(len(text), match.end() + 100)
+                # Same as strip() + collapsing whitespace runs to one space
+                context = ' '.join(text[start:end].split())
+
+                self.constraints.append(TechnicalConstraint(
+                    constraint_type=constraint_type,
+                    value=text[match.start():match.end()],
+                    context=context,
+                    source_page=page_num,
+                    importance=importance
+                ))
 
     def _extract_text_blocks(self, text: str, page_num: int):
         """Extract structured text blocks"""
@@ -761,7 +954,7 @@ class PDFReader:
 
                     if qty > 0 and qty < 1000 and len(desc) > 5:
                         # Check if not already extracted
-                        if not any(desc.lower() in item.description.lower() for item in self.bom_items):
+                        if not self._is_already_extracted(desc):
                             self.bom_items.append(BOMItem(
                                 row_id=len(self.bom_items) + 1,
                                 reference="",
@@ -776,11 +969,23 @@ class PDFReader:
                                 finish=None,
                                 notes=f"Extracted from text, page {page_num}",
                                 confidence=0.4,
-                                source_page=page_num
+                                source_page=page_num,
+                                from_text=True
                             ))
                 except:
                     continue
 
+    def _is_already_extracted(self, description: str) -> bool:
+        """True if description is contained in an already extracted item's description"""
+        index = self._description_index
+        # bom_items only grows during extraction; rebuild if the list was replaced or shrank
+        if index is None or self._indexed_items is not self.bom_items or len(index) > len(self.bom_items):
+            index = self._description_index = SubstringIndex()
+            self._indexed_items = self.bom_items
+        for item in self.bom_items[len(index):]:
+            index.add(item.description)
+        return index.contained_in_any(description)
+
     def _analyze_word_positions(self, words: List[Dict], page_num: int):
         """Analyze word positions for additional extraction"""
         # Group words by approximate Y position (rows)
@@ -912,16 +1117,23 @@ class PDFReader:
 
     def _correlate_constraints_with_items(self):
         """Correlate constraints with BOM items"""
-        # Add material/finish info to items if found on same page
+        # Index the material/finish constraints once by (page, type), keeping document order
+        by_page_type: Dict[Tuple[int, str], List[TechnicalConstraint]] = defaultdict(list)
+        for constraint in self.constraints:
+            if constraint.constraint_type in ('material_grade', 'surface_treatment'):
+                by_page_type[(constraint.source_page, constraint.constraint_type)].append(constraint)
+
+        # Add material/finish info to items if found on same page (first value on the page wins)
         for item in self.bom_items:
             page = item.source_page
-            page_constraints = [c for c in self.constraints if c.source_page == page]
-
-            for constraint in page_constraints:
-                if constraint.constraint_type == 'material_grade' and not item.material:
-                    item.material = constraint.value
-                elif constraint.constraint_type == 'surface_treatment' and not item.finish:
-                    item.finish = constraint.value
+            for constraint in by_page_type.get((page, 'material_grade'), ()):
+                if item.material:
+                    break
+                item.material = constraint.value
+            for constraint in by_page_type.get((page, 'surface_treatment'), ()):
+                if item.finish:
+                    break
+                item.finish = constraint.value
 
     def _extract_all_profile_references(self) -> List[str]:
         """Extract all unique profile references"""
@@ -986,86 +1198,110 @@ class PDFReader:
         if not self.all_text_content:
             return False
 
-        total_chars = 0
-        total_newlines = 0
-        single_char_lines = 0
-        total_lines = 0
-
-        for text_block in self.all_text_content:
-            content = text_block.get('content', '')
-            total_chars += len(content)
-            total_newlines += content.count('\n')
-
-            lines = content.split('\n')
-            total_lines += len(lines)
-            single_char_lines += sum(1 for l in lines if len(l.strip()) <= 1)
-
-        if total_chars == 0 or total_lines == 0:
-            return False
-
-        # High newline ratio suggests fragmented text
-        newline_ratio = total_newlines / max(total_chars, 1)
-
-        # High single-char line ratio suggests vertical/scattered text
-        single_char_ratio = single_char_lines / max(total_lines, 1)
-
-        # Consider fragmented if either ratio is high
-        return newline_ratio > 0.15 or single_char_ratio > 0.3
+        newline_ratio, single_char_ratio = text_fragmentation(
+            text_block.get('content', '') for text_block in self.all_text_content
+        )
+        return is_fragmented(newline_ratio, single_char_ratio)
 
     def _apply_ocr_to_pdf(self):
-        """Apply OCR to scanned PDF pages"""
+        """
+        Apply OCR to scanned PDF pages.
+        Only the pages that will be OCR'd are rasterised, one page per task, and
+        tesseract runs on a thread pool (both poppler and tesseract are subprocesses).
+        """
         if not OCR_AVAILABLE:
             return
 
-        try:
-            # Convert PDF to images (150 DPI for balance of speed and quality)
-            images = convert_from_path(
-                str(self.file_path),
-                dpi=150,
-                fmt='png',
-                size=(2000, None)  # Limit width to 2000px for faster processing
-            )
-
-            # Limit OCR to first 5 pages for performance
-            max_ocr_pages = min(len(images), 5)
-            for page_num, image in enumerate(images[:max_ocr_pages], 1):
-                try:
-                    # Apply OCR with Portuguese + English
-                    ocr_text = pytesseract.image_to_string(
-                        image,
-                        lang='por+eng',
-                        config='--psm 6'  # Assume uniform text block
-                    )
-
-                    if ocr_text.strip():
-                        self.ocr_text_content.append({
-                            "page": page_num,
-                            "content": ocr_text,
-                            "source": "ocr"
-                        })
-
-                        # Also store in all_text_content
-                        self.all_text_content.append({
-                            "page": page_num,
-                            "content": ocr_text,
-                            "source": "ocr"
-                        })
+        total_pages = self.document_info.get("total_pages", 0)
+        max_ocr_pages = total_pages if self.max_ocr_pages <= 0 else min(total_pages, self.max_ocr_pages)
+        if max_ocr_pages <= 0:
+            return
 
-                        # Process the OCR text for constraints and items
-                        self._extract_constraints_exhaustive(ocr_text, page_num)
-                        self._extract_text_blocks(ocr_text, page_num)
-                        self._extract_items_from_text(ocr_text, page_num)
+        page_numbers = list(range(1, max_ocr_pages + 1))
 
-                        # Try to find tables in OCR text
-                        self._extract_tables_from_ocr_text(ocr_text, page_num)
+        with ThreadPoolExecutor(max_workers=min(self.ocr_workers, len(page_numbers))) as executor:
+            futures = [executor.submit(self._ocr_single_page, page_num) for page_num in page_numbers]
 
+            # Results are consumed in page order so extraction stays deterministic
+            for page_num, future in zip(page_numbers, futures):
+                try:
+                    ocr_text, cache_hit = future.result()
                 except Exception as e:
                     print(f"Erro OCR na página {page_num}: {e}")
+                    self.document_info.setdefault("ocr_error", str(e))
                     continue
 
-        except Exception as e:
-            print(f"Erro ao aplicar OCR: {e}")
-            self.document_info["ocr_error"] = str(e)
+                if self.ocr_cache is not None:
+                    if cache_hit:
+                        self.ocr_cache_hits += 1
+                    else:
+                        self.ocr_cache_misses += 1
+
+                if ocr_text.strip():
+                    self.ocr_text_content.append({
+                        "page": page_num,
+                        "content": ocr_text,
+                        "source": "ocr"
+                    })
+
+                    # Also store in all_text_content
+                    self.all_text_content.append({
+                        "page": page_num,
+                        "content": ocr_text,
+                        "source": "ocr"
+                    })
+
+                    # Process the OCR text for constraints and items
+                    self._extract_constraints_exhaustive(ocr_text, page_num)
+                    self._extract_text_blocks(ocr_text, page_num)
+                    self._extract_items_from_text(ocr_text, page_num)
+
+                    # Try to find tables in OCR text
+                    self._extract_tables_from_ocr_text(ocr_text, page_num)
+
+        self.document_info["ocr_pages_requested"] = max_ocr_pages
+        self.document_info["ocr_cache"] = {
+            "enabled": self.ocr_cache is not None,
+            "hits": self.ocr_cache_hits,
+            "misses": self.ocr_cache_misses
+        }
+
+    def _ocr_single_page(self, page_num: int) -> Tuple[str, bool]:
+        """
+        Rasterise a single page and OCR it (runs on the OCR worker pool).
+        Returns (text, served_from_cache).
+        """
+        images = convert_from_path(
+            str(self.file_path),
+            dpi=self.OCR_DPI,
+            fmt='png',
+            size=(self.OCR_MAX_WIDTH_PX, None),  # Limit width for faster processing
+            first_page=page_num,
+            last_page=page_num
+        )
+        if not images:
+            return "", False
+
+        image = images[0]
+        try:
+            cache_key = None
+            if self.ocr_cache is not None:
+                cache_key = OCRCache.make_key(image, self.OCR_DPI, self.OCR_LANG, self.OCR_CONFIG)
+                cached_text = self.ocr_cache.get(cache_key)
+                if cached_text is not None:
+                    return cached_text, True
+
+            ocr_text = pytesseract.image_to_string(
+                image,
+                lang=self.OCR_LANG,
+                config=self.OCR_CONFIG
+            )
+
+            if cache_key is not None:
+                self.ocr_cache.put(cache_key, ocr_text)
+            return ocr_text, False
+        finally:
+            image.close()
 
     def _extract_tables_from_ocr_text(self, text: str, page_num: int):
         """Try to extract table-like data from OCR text"""
@@ -1132,7 +1368,27 @@ class PDFReader:
                 })
 
 
-def parse_pdf_file(file_path: str) -> Dict[str, Any]:
-    """Convenience function to parse a PDF file"""
-    reader = PDFReader(file_path)
+def _extract_page_shard(file_path: str, first_page: int, last_page: int,
+                        skip_redundant_text_tables: bool = True, page_triage: bool = True) -> Dict[str, Any]:
+    """Worker entry point for page-sharded extraction (must be module-level to be picklable)"""
+    reader = PDFReader(file_path, skip_redundant_text_tables=skip_redundant_text_tables,
+                       page_triage=page_triage)
+    with pdfplumber.open(file_path) as pdf:
+        text_chars = reader._process_page_range(pdf, first_page, last_page)
+
+    partial = reader._export_page_shard()
+    partial["text_chars"] = text_chars
+    return partial
+
+
+def parse_pdf_file(file_path: str, page_workers: int = 1,
+                   max_ocr_pages: Optional[int] = None,
+                   ocr_cache: Optional[OCRCache] = None,
+                   ocr_workers: int = 1) -> Dict[str, Any]:
+    """
+    Convenience function to parse a PDF file (also the ParsePool entry point).
+    ocr_workers defaults to 1: a pool worker only OCRs with the cores its caller budgeted.
+    """
+    reader = PDFReader(file_path, page_workers=page_workers, max_ocr_pages=max_ocr_pages,
+                       ocr_workers=ocr_workers, ocr_cache=ocr_cache)
     return reader.parse()
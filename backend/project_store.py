@@ -0,0 +1,404 @@
+"""
+AluQuote AI - Project Store Module
+Armazenamento persistente de projetos e ficheiros em SQLite (modo WAL)
+As análises são guardadas como blobs JSON comprimidos e só são carregadas quando pedidas
+A vista agregada guarda a parte de cada ficheiro na própria linha do ficheiro
+Vários workers do uvicorn partilham o mesmo estado e um reinício não perde os projetos
+"""
+
+import gzip
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from analysis_merge import add_analysis, merged_view
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL,
+    budget_version INTEGER NOT NULL DEFAULT 0,
+    merged_dxf_analysis BLOB,
+    merged_pdf_analysis BLOB,
+    budget BLOB
+);
+CREATE TABLE IF NOT EXISTS files (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    project_id TEXT NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT,
+    path TEXT,
+    sha256 TEXT,
+    size_bytes INTEGER,
+    uploaded_at TEXT,
+    analysis_success INTEGER NOT NULL,
+    cache_version TEXT,
+    analysis BLOB,
+    merge_part BLOB
+);
+CREATE INDEX IF NOT EXISTS files_by_project ON files(project_id, type, seq);
+"""
+
+PROJECT_COLUMNS = ("id", "name", "description", "created_at", "status", "budget_version")
+MERGED_BLOBS = ("merged_dxf_analysis", "merged_pdf_analysis")
+MERGED_KINDS = {"merged_dxf_analysis": "dxf", "merged_pdf_analysis": "pdf"}
+PROJECT_BLOBS = MERGED_BLOBS + ("budget",)
+FILE_COLUMNS = ("id", "filename", "type", "category", "path", "sha256", "size_bytes",
+                "uploaded_at", "analysis_success", "cache_version")
+
+
+class ProjectNotFoundError(KeyError):
+    """Raised when a project id is not in the store"""
+
+
+def encode_blob(value: Any) -> Optional[bytes]:
+    """Gzip-compressed JSON (same encoding as the parse cache); None stays NULL"""
+    if value is None:
+        return None
+    payload = json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+    return gzip.compress(payload, compresslevel=6)
+
+
+def decode_blob(blob: Optional[bytes]) -> Any:
+    if blob is None:
+        return None
+    return json.loads(gzip.decompress(blob).decode("utf-8"))
+
+
+class ProjectStore:
+    """
+    SQLite-backed project and file records.
+    Reads return plain dicts shaped like the API responses; the analysis blobs
+    (per file, merged, budget) are only decompressed by the calls that need them.
+    A merged analysis is stored as a small summary on the project row plus each
+    file's part (analysis_merge) on the file row, and assembled when it is read.
+    Each thread gets its own connection; WAL mode lets readers run alongside a writer.
+    """
+
+    def __init__(self, path: Path, timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(projects)")}
+        if "budget_version" not in columns:
+            conn.execute("ALTER TABLE projects ADD COLUMN budget_version INTEGER NOT NULL DEFAULT 0")
+        file_columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+        if "cache_version" not in file_columns:
+            # Files stored before it was kept have NULL; their analysis still carries the label
+            conn.execute("ALTER TABLE files ADD COLUMN cache_version TEXT")
+
+        if not self._has_merge_parts(conn):
+            with self._write():
+                if not self._has_merge_parts(conn):  # Another worker may have migrated meanwhile
+                    conn.execute("ALTER TABLE files ADD COLUMN merge_part BLOB")
+                    self._rebuild_merged(conn)
+
+    @staticmethod
+    def _has_merge_parts(conn: sqlite3.Connection) -> bool:
+        return any(row[1] == "merge_part" for row in conn.execute("PRAGMA table_info(files)"))
+
+    @staticmethod
+    def _rebuild_merged(conn: sqlite3.Connection):
+        """Re-fold every project's files into summaries and per-file parts (one-off migration)"""
+        for (project_id,) in conn.execute("SELECT id FROM projects").fetchall():
+            summaries: Dict[str, Any] = {}
+            rows = conn.execute(
+                "SELECT id, type, analysis FROM files WHERE project_id = ? ORDER BY seq", (project_id,)
+            ).fetchall()
+            for file_id, file_type, blob in rows:
+                summary, part = add_analysis(file_type, summaries.get(file_type), file_id, decode_blob(blob) or {})
+                summaries[file_type] = summary
+                conn.execute("UPDATE files SET merge_part = ? WHERE id = ?", (encode_blob(part), file_id))
+            conn.execute(
+                "UPDATE projects SET merged_dxf_analysis = ?, merged_pdf_analysis = ? WHERE id = ?",
+                (encode_blob(summaries.get("dxf")), encode_blob(summaries.get("pdf")), project_id)
+            )
+
+    @contextmanager
+    def _write(self):
+        """Write transaction; BEGIN IMMEDIATE serialises writers across threads and processes"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @contextmanager
+    def _read(self):
+        """
+        Read transaction, so that reads spanning several statements (project row, file rows,
+        merge parts) see one WAL snapshot; inside a write transaction it just uses that one
+        """
+        conn = self._connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.execute("COMMIT")
+
+    # ---------- projects ----------
+
+    def create(self, project: Dict[str, Any]) -> Dict[str, Any]:
+        project = {"budget_version": 0, **project}
+        columns = PROJECT_COLUMNS + PROJECT_BLOBS
+        with self._write() as conn:
+            conn.execute(
+                f"INSERT INTO projects ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                tuple(project.get(c) for c in PROJECT_COLUMNS)
+                + tuple(encode_blob(project.get(b)) for b in PROJECT_BLOBS)
+            )
+        return self.get(project["id"])
+
+    def exists(self, project_id: str) -> bool:
+        row = self._connection().execute("SELECT 1 FROM projects WHERE id = ?", (project_id,)).fetchone()
+        return row is not None
+
+    def delete(self, project_id: str) -> bool:
+        with self._write() as conn:
+            deleted = conn.execute("DELETE FROM projects WHERE id = ?", (project_id,)).rowcount
+        return deleted > 0
+
+    def _project_row(self, conn: sqlite3.Connection, project_id: str, blobs) -> Dict[str, Any]:
+        columns = PROJECT_COLUMNS + tuple(blobs)
+        row = conn.execute(
+            f"SELECT {', '.join(columns)} FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        if row is None:
+            raise ProjectNotFoundError(project_id)
+        project = dict(zip(PROJECT_COLUMNS, row))
+        for name, blob in zip(blobs, row[len(PROJECT_COLUMNS):]):
+            project[name] = decode_blob(blob)
+        return project
+
+    def _file_rows(self, conn: sqlite3.Connection, where: str, params, with_analysis: bool) -> List[Dict[str, Any]]:
+        columns = FILE_COLUMNS + (("analysis",) if with_analysis else ())
+        rows = conn.execute(
+            f"SELECT {', '.join(columns)} FROM files WHERE {where} ORDER BY seq", params
+        ).fetchall()
+        files = []
+        for row in rows:
+            file_info = dict(zip(FILE_COLUMNS, row))
+            file_info["analysis_success"] = bool(file_info["analysis_success"])
+            if with_analysis:
+                file_info["analysis"] = decode_blob(row[-1])
+            files.append(file_info)
+        return files
+
+    def _merge_parts(self, conn: sqlite3.Connection, project_id: str, file_type: str) -> List[Dict[str, Any]]:
+        rows = conn.execute(
+            "SELECT merge_part FROM files WHERE project_id = ? AND type = ? AND merge_part IS NOT NULL "
+            "ORDER BY seq", (project_id, file_type)
+        ).fetchall()
+        return [decode_blob(row[0]) for row in rows]
+
+    def _assemble_merged(self, conn: sqlite3.Connection, project_id: str, project: Dict[str, Any]):
+        """Replace the merged summaries in project by the full merged views"""
+        for name, kind in MERGED_KINDS.items():
+            if project.get(name) is not None:
+                project[name] = merged_view(kind, project[name], self._merge_parts(conn, project_id, kind))
+
+    def _document(self, conn: sqlite3.Connection, project_id: str) -> Dict[str, Any]:
+        project = self._project_row(conn, project_id, PROJECT_BLOBS)
+        self._assemble_merged(conn, project_id, project)
+        project["files"] = self._file_rows(conn, "project_id = ?", (project_id,), True)
+        project["dxf_analyses"] = [f["analysis"] for f in project["files"] if f["type"] == "dxf"]
+        project["pdf_analyses"] = [f["analysis"] for f in project["files"] if f["type"] == "pdf"]
+        return project
+
+    def get(self, project_id: str, analyses: bool = False) -> Dict[str, Any]:
+        """
+        Project record with its file list.
+        With analyses=True the full document is loaded: file analyses, the
+        dxf_analyses/pdf_analyses lists, merged analyses and budget.
+        """
+        with self._read() as conn:
+            if not analyses:
+                project = self._project_row(conn, project_id, ())
+                project["files"] = self._file_rows(conn, "project_id = ?", (project_id,), False)
+                return project
+
+            return self._document(conn, project_id)
+
+    def get_field(self, project_id: str, name: str) -> Any:
+        """One decoded blob field (merged_dxf_analysis, merged_pdf_analysis or budget)"""
+        if name not in PROJECT_BLOBS:
+            raise ValueError(f"Unknown project field: {name}")
+        with self._read() as conn:
+            project = self._project_row(conn, project_id, (name,))
+            if name in MERGED_KINDS:
+                self._assemble_merged(conn, project_id, project)
+        return project[name]
+
+    def get_merge_parts(self, project_id: str, file_type: str) -> List[Dict[str, Any]]:
+        """Merge parts of the project's files of one type, in upload order"""
+        return self._merge_parts(self._connection(), project_id, file_type)
+
+    def get_budget(self, project_id: str) -> Tuple[Optional[Dict[str, Any]], int]:
+        """(budget, budget_version); the version changes every time a budget is stored"""
+        project = self._project_row(self._connection(), project_id, ("budget",))
+        return project["budget"], project["budget_version"]
+
+    def budget_version(self, project_id: str) -> int:
+        """Current budget version without decoding the budget"""
+        row = self._connection().execute(
+            "SELECT budget_version FROM projects WHERE id = ?", (project_id,)
+        ).fetchone()
+        if row is None:
+            raise ProjectNotFoundError(project_id)
+        return row[0]
+
+    def budget_json(self, project_id: str) -> Optional[bytes]:
+        """The stored budget's JSON text (None without a budget), decompressed but not parsed"""
+        row = self._connection().execute("SELECT budget FROM projects WHERE id = ?", (project_id,)).fetchone()
+        if row is None:
+            raise ProjectNotFoundError(project_id)
+        if row[0] is None:
+            return None
+        return gzip.decompress(row[0])
+
+    def list(self) -> List[Dict[str, Any]]:
+        """All projects with their file lists, without any analysis blobs"""
+        with self._read() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(PROJECT_COLUMNS)} FROM projects ORDER BY created_at"
+            ).fetchall()
+            projects = [dict(zip(PROJECT_COLUMNS, row)) for row in rows]
+            for project in projects:
+                project["files"] = self._file_rows(conn, "project_id = ?", (project["id"],), False)
+        return projects
+
+    def update(self, project_id: str, **fields):
+        """
+        Set status and/or blob fields of a project; setting the budget bumps budget_version.
+        Merged fields take summaries, as in update_with.
+        """
+        assignments = []
+        params = []
+        for name, value in fields.items():
+            if name in PROJECT_BLOBS:
+                params.append(encode_blob(value))
+            elif name in PROJECT_COLUMNS and name not in ("id", "budget_version"):
+                params.append(value)
+            else:
+                raise ValueError(f"Unknown project field: {name}")
+            assignments.append(f"{name} = ?")
+        if "budget" in fields:
+            assignments.append("budget_version = budget_version + 1")
+        if not assignments:
+            return
+        with self._write() as conn:
+            updated = conn.execute(
+                f"UPDATE projects SET {', '.join(assignments)} WHERE id = ?", (*params, project_id)
+            ).rowcount
+        if not updated:
+            raise ProjectNotFoundError(project_id)
+
+    def _read_modify_write(self, conn: sqlite3.Connection, project_id: str, func: Callable, *args) -> Any:
+        project = self._project_row(conn, project_id, MERGED_BLOBS)
+        project["files"] = self._file_rows(conn, "project_id = ?", (project_id,), False)
+        result = func(project, *args)
+        conn.execute(
+            "UPDATE projects SET status = ?, merged_dxf_analysis = ?, merged_pdf_analysis = ? WHERE id = ?",
+            (project["status"], *(encode_blob(project.get(b)) for b in MERGED_BLOBS), project_id)
+        )
+        for file_id, part in project.get("merge_parts", {}).items():
+            conn.execute(
+                "UPDATE files SET merge_part = ? WHERE id = ? AND project_id = ?",
+                (encode_blob(part), file_id, project_id)
+            )
+        return result
+
+    def update_with(self, project_id: str, func: Callable[[Dict[str, Any]], Any]) -> Any:
+        """
+        Read-modify-write inside one write transaction: func(project) gets the project
+        record (merged summaries, file metadata without per-file analyses), mutates it
+        and its return value is passed through.
+        Status and merged summaries are written back, plus the file parts func puts in
+        project["merge_parts"] ({file_id: part}); concurrent writers wait for the lock.
+        The budget is neither read nor written here: it is replaced only through update(),
+        which bumps budget_version.
+        """
+        with self._write() as conn:
+            return self._read_modify_write(conn, project_id, func)
+
+    # ---------- files ----------
+
+    def add_file(self, project_id: str, file_info: Dict[str, Any]):
+        """Store a processed file and its analysis; fails if the project was deleted"""
+        with self._write() as conn:
+            if conn.execute("SELECT 1 FROM projects WHERE id = ?", (project_id,)).fetchone() is None:
+                raise ProjectNotFoundError(project_id)
+            conn.execute(
+                f"INSERT INTO files (project_id, {', '.join(FILE_COLUMNS)}, analysis) "
+                f"VALUES (?, {', '.join('?' for _ in FILE_COLUMNS)}, ?)",
+                (project_id, *(file_info.get(c) for c in FILE_COLUMNS), encode_blob(file_info.get("analysis")))
+            )
+
+    def remove_file(self, project_id: str, file_id: str,
+                    func: Callable[[Dict[str, Any], Dict[str, Any]], Any]) -> Any:
+        """
+        Delete one file of a project; in the same transaction func(project, file_info)
+        updates the project record as in update_with. Raises KeyError for an unknown file.
+        """
+        with self._write() as conn:
+            files = self._file_rows(conn, "id = ? AND project_id = ?", (file_id, project_id), False)
+            if not files:
+                raise KeyError(file_id)
+            conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+            return self._read_modify_write(conn, project_id, func, files[0])
+
+    def get_file(self, file_id: str, analysis: bool = True,
+                 project_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """One file record (with its analysis by default), optionally only if it belongs to project_id"""
+        if project_id is None:
+            files = self._file_rows(self._connection(), "id = ?", (file_id,), analysis)
+        else:
+            files = self._file_rows(self._connection(), "id = ? AND project_id = ?", (file_id, project_id), analysis)
+        return files[0] if files else None
+
+    def get_analyses(self, project_id: str, file_type: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Analyses of the project's files of one type, in upload order"""
+        sql = "SELECT analysis FROM files WHERE project_id = ? AND type = ? ORDER BY seq"
+        params: tuple = (project_id, file_type)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        rows = self._connection().execute(sql, params).fetchall()
+        return [decode_blob(row[0]) for row in rows]
+
+    def count_files(self, project_id: str) -> Dict[str, int]:
+        rows = self._connection().execute(
+            "SELECT type, COUNT(*) FROM files WHERE project_id = ? GROUP BY type", (project_id,)
+        ).fetchall()
+        return dict(rows)
@@ -0,0 +1,292 @@
+"""
+AluQuote AI - Quote PDF Module
+Orçamento em PDF (ReportLab) com estilos pré-construídos e cache em disco
+Um PDF é identificado por (projeto, hash do orçamento, versão do template)
+"""
+
+import hashlib
+import io
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from upload_store import _atomic_write
+
+# Bump whenever the layout below changes so cached PDFs are re-rendered
+QUOTE_TEMPLATE_VERSION = "1"
+
+# ---------- Prebuilt styles (shared by every render; ReportLab never mutates them) ----------
+
+_sample_styles = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_sample_styles['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#0ea5e9'),
+    spaceAfter=10,
+    alignment=TA_CENTER
+)
+SUBTITLE_STYLE = ParagraphStyle(
+    'Subtitle',
+    parent=_sample_styles['Normal'],
+    fontSize=10,
+    textColor=colors.HexColor('#6b7280'),
+    alignment=TA_CENTER,
+    spaceAfter=20
+)
+SECTION_STYLE = ParagraphStyle(
+    'Section',
+    parent=_sample_styles['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#1f2937'),
+    spaceBefore=15,
+    spaceAfter=10
+)
+FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_sample_styles['Normal'],
+    fontSize=8,
+    textColor=colors.HexColor('#9ca3af'),
+    alignment=TA_CENTER
+)
+
+INFO_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#6b7280')),
+    ('TEXTCOLOR', (1, 0), (1, -1), colors.HexColor('#1f2937')),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+])
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#0ea5e9')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+])
+ITEMS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('ALIGN', (0, 0), (0, -1), 'CENTER'),
+    ('ALIGN', (3, 0), (-1, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+])
+BREAKDOWN_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')]),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+])
+TOTALS_TABLE_STYLE = TableStyle([
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#0ea5e9')),
+    ('FONTSIZE', (0, -1), (-1, -1), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#0ea5e9')),
+])
+
+COST_LABELS = {
+    "raw_material": "Matéria-Prima",
+    "transformation": "Transformação",
+    "surface_treatment": "Tratamento Superfície",
+    "labor": "Mão de Obra",
+    "accessories": "Acessórios",
+    "waste_allowance": "Provisão Desperdício",
+    "overhead": "Custos Gerais"
+}
+
+
+def budget_date(budget: Dict[str, Any]) -> datetime:
+    """When the budget was calculated (so a cached PDF shows the same date on every download)"""
+    created_at = budget.get("summary", {}).get("created_at")
+    try:
+        return datetime.fromisoformat(created_at)
+    except (TypeError, ValueError):
+        return datetime.now()
+
+
+def build_quote_elements(project_id: str, budget: Dict[str, Any]) -> List[Any]:
+    elements = []
+    issued = budget_date(budget)
+
+    # Header
+    elements.append(Paragraph("AluQuote AI", TITLE_STYLE))
+    elements.append(Paragraph("Orçamento de Serralharia de Alumínio", SUBTITLE_STYLE))
+
+    # Project Info
+    summary = budget.get("summary", {})
+    project_info = [
+        ["Projeto:", summary.get("project_name", "N/A")],
+        ["Data:", issued.strftime("%d/%m/%Y %H:%M")],
+        ["Referência:", f"ORÇ-{project_id.upper()}"]
+    ]
+
+    info_table = Table(project_info, colWidths=[80, 300])
+    info_table.setStyle(INFO_TABLE_STYLE)
+    elements.append(info_table)
+    elements.append(Spacer(1, 15))
+
+    # Summary Stats
+    elements.append(Paragraph("Resumo do Orçamento", SECTION_STYLE))
+
+    quantities = summary.get("quantities", {})
+    totals = summary.get("totals", {})
+    metrics = summary.get("metrics", {})
+
+    summary_data = [
+        ["Descrição", "Valor"],
+        ["Total de Perfis", str(quantities.get("total_profiles", 0))],
+        ["Quantidade Total", str(quantities.get("total_quantity", 0))],
+        ["Peso Total (kg)", f"{quantities.get('total_weight_kg', 0):.2f}"],
+        ["Horas de Produção", f"{metrics.get('production_hours', 0):.1f}h"],
+        ["Fator de Desperdício", f"{metrics.get('waste_percentage', 0):.1f}%"],
+    ]
+
+    summary_table = Table(summary_data, colWidths=[250, 150])
+    summary_table.setStyle(SUMMARY_TABLE_STYLE)
+    elements.append(summary_table)
+    elements.append(Spacer(1, 15))
+
+    # Line Items
+    elements.append(Paragraph("Itens do Orçamento", SECTION_STYLE))
+
+    items_header = ["#", "Referência", "Descrição", "Qtd", "Peso(kg)", "Material", "Tratam.", "M.O.", "Total"]
+    items_data = [items_header]
+
+    for item in budget.get("line_items", []):
+        costs = item.get("costs", {})
+        geometry = item.get("geometry", {})
+        items_data.append([
+            str(item.get("line_id", "")),
+            item.get("reference", "-")[:15],
+            item.get("description", "-")[:20],
+            str(item.get("quantity", 0)),
+            f"{geometry.get('weight_kg', 0):.2f}",
+            f"{costs.get('raw_material', 0):.2f}",
+            f"{costs.get('surface_treatment', 0):.2f}",
+            f"{costs.get('labor', 0):.2f}",
+            f"{item.get('total_cost', 0):.2f}"
+        ])
+
+    items_table = Table(items_data, colWidths=[20, 55, 80, 25, 40, 45, 40, 35, 45])
+    items_table.setStyle(ITEMS_TABLE_STYLE)
+    elements.append(items_table)
+    elements.append(Spacer(1, 15))
+
+    # Cost Breakdown
+    elements.append(Paragraph("Decomposição de Custos", SECTION_STYLE))
+
+    breakdown_data = [["Categoria", "Valor (EUR)"]]
+    for key, value in summary.get("cost_breakdown", {}).items():
+        label = COST_LABELS.get(key, key.replace("_", " ").title())
+        breakdown_data.append([label, f"{value:.2f} €"])
+
+    breakdown_table = Table(breakdown_data, colWidths=[250, 150])
+    breakdown_table.setStyle(BREAKDOWN_TABLE_STYLE)
+    elements.append(breakdown_table)
+    elements.append(Spacer(1, 20))
+
+    # Totals
+    totals_data = [
+        ["Subtotal:", f"{totals.get('subtotal', 0):.2f} €"],
+        ["Margem de Lucro:", f"{totals.get('profit_margin', 0):.2f} €"],
+        ["TOTAL ORÇAMENTO:", f"{totals.get('total_quote', 0):.2f} €"],
+    ]
+
+    totals_table = Table(totals_data, colWidths=[300, 100])
+    totals_table.setStyle(TOTALS_TABLE_STYLE)
+    elements.append(totals_table)
+    elements.append(Spacer(1, 30))
+
+    # Footer
+    elements.append(Paragraph("Orçamento gerado automaticamente por AluQuote AI | Válido por 30 dias", FOOTER_STYLE))
+    elements.append(Paragraph(f"Documento: ORÇ-{project_id.upper()} | {issued.strftime('%d/%m/%Y')}", FOOTER_STYLE))
+
+    return elements
+
+
+def render_quote_pdf(project_id: str, budget: Dict[str, Any]) -> bytes:
+    """The quote document as PDF bytes (rendered in memory)"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        rightMargin=15*mm,
+        leftMargin=15*mm,
+        topMargin=15*mm,
+        bottomMargin=15*mm
+    )
+    doc.build(build_quote_elements(project_id, budget))
+    return buffer.getvalue()
+
+
+class QuotePDFCache:
+    """
+    Rendered quotes on disk, one file per (project id, budget hash, template version).
+    Shared by every worker; a budget that has not changed is never rendered twice.
+    Only the latest rendered quote of a project is kept.
+    """
+
+    def __init__(self, root: Path, template_version: str = QUOTE_TEMPLATE_VERSION):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.template_version = template_version
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def budget_hash(budget_json: bytes) -> str:
+        """Key of a budget, from its stored JSON text"""
+        return hashlib.sha256(budget_json).hexdigest()
+
+    def path_for(self, project_id: str, budget_hash: str) -> Path:
+        return self.root / f"{project_id}_{budget_hash[:32]}_t{self.template_version}.pdf"
+
+    def get(self, project_id: str, budget_hash: str) -> Optional[Path]:
+        path = self.path_for(project_id, budget_hash)
+        if path.exists():
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def put(self, project_id: str, budget_hash: str, pdf: bytes) -> Path:
+        """Store a rendered quote, replacing the project's quotes of earlier budgets or templates"""
+        path = self.path_for(project_id, budget_hash)
+        _atomic_write(path, pdf)
+        self.discard_project(project_id, keep=path)
+        return path
+
+    def discard_project(self, project_id: str, keep: Optional[Path] = None):
+        for path in self.root.glob(f"{project_id}_*.pdf"):
+            if path != keep:
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,123 @@
+"""
+AluQuote AI - Spatial Index Module
+Índices espaciais em grelha uniforme para consultas de proximidade no DXF
+Substituem varrimentos lineares (perfis × textos) por consultas locais
+"""
+
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PointGridIndex:
+    """
+    Uniform grid over 2D points.
+    Every point keeps its insertion order so queries can reproduce the
+    "first match in list order" semantics of the linear scans they replace.
+    """
+
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+        self._cells: Dict[Tuple[int, int], List[Tuple[int, float, float, Any]]] = defaultdict(list)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, x: float, y: float, value: Any):
+        self._cells[self._cell(x, y)].append((self._count, x, y, value))
+        self._count += 1
+
+    def _candidates(self, x: float, y: float, reach: float):
+        """Yield points stored in every cell overlapping the square [x±reach, y±reach]"""
+        min_cx, min_cy = self._cell(x - reach, y - reach)
+        max_cx, max_cy = self._cell(x + reach, y + reach)
+        cells = self._cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def first_within_radius(self, x: float, y: float, radius: float) -> Optional[Any]:
+        """Value of the earliest-inserted point with euclidean distance < radius"""
+        best_order = None
+        best_value = None
+        for order, px, py, value in self._candidates(x, y, radius):
+            if best_order is not None and order > best_order:
+                continue
+            if math.sqrt((x - px)**2 + (y - py)**2) < radius:
+                best_order = order
+                best_value = value
+        return best_value
+
+    def within_box(self, x: float, y: float, half_size: float) -> List[Any]:
+        """Values of all points with |dx| < half_size and |dy| < half_size, in insertion order"""
+        hits = [
+            (order, value) for order, px, py, value in self._candidates(x, y, half_size)
+            if abs(px - x) < half_size and abs(py - y) < half_size
+        ]
+        hits.sort(key=lambda hit: hit[0])
+        return [value for _, value in hits]
+
+
+class BoxGridIndex:
+    """
+    Uniform grid over axis-aligned boxes, for viewport queries.
+    A box is registered in every cell it overlaps; boxes spanning more than
+    max_cells cells are kept in a separate list that every query scans.
+    """
+
+    def __init__(self, cell_size: float, max_cells: int = 64):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = float(cell_size)
+        self.max_cells = max_cells
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._boxes: List[Tuple[float, float, float, float]] = []
+        self._values: List[Any] = []
+        self._oversized: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, min_x: float, min_y: float, max_x: float, max_y: float, value: Any):
+        order = len(self._values)
+        self._boxes.append((min_x, min_y, max_x, max_y))
+        self._values.append(value)
+        min_cx, min_cy = self._cell(min_x, min_y)
+        max_cx, max_cy = self._cell(max_x, max_y)
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > self.max_cells:
+            self._oversized.append(order)
+            return
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                self._cells[(cx, cy)].append(order)
+
+    def intersecting(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[Any]:
+        """Values of all boxes overlapping [min_x, max_x] x [min_y, max_y], in insertion order"""
+        min_cx, min_cy = self._cell(min_x, min_y)
+        max_cx, max_cy = self._cell(max_x, max_y)
+        cells = self._cells
+        candidates = set(self._oversized)
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    candidates.update(bucket)
+        boxes = self._boxes
+        hits = [
+            order for order in candidates
+            if boxes[order][0] <= max_x and boxes[order][2] >= min_x
+            and boxes[order][1] <= max_y and boxes[order][3] >= min_y
+        ]
+        hits.sort()
+        return [self._values[order] for order in hits]
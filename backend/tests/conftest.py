@@ -0,0 +1,9 @@
+"""
+Backend modules are imported by name (as main.py does), so put backend/ on the path.
+Run from backend/:  python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
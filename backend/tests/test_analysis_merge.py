@@ -0,0 +1,209 @@
+"""Incremental merge (summary + per-file parts) against the baseline full re-merge"""
+
+import copy
+import threading
+
+from analysis_merge import add_analysis, merge_project_files, merged_view, remove_analysis
+from project_store import ProjectStore
+
+
+def baseline_merge(kind, analyses):
+    """The merged view the baseline rebuilt from every analysis on each upload"""
+    if kind == "dxf":
+        merged = {"success": True, "profiles": [], "features_summary": {}, "material_quantities": [],
+                  "texts_extracted": [], "layers": {}, "blocks_analyzed": {}, "files_merged": len(analyses)}
+        for analysis in analyses:
+            if analysis.get("success"):
+                filename = analysis.get("file_info", {}).get("filename", "")
+                merged["profiles"] += [{**p, "source_file": filename} for p in analysis.get("profiles", [])]
+                for ftype, count in analysis.get("features_summary", {}).items():
+                    merged["features_summary"][ftype] = merged["features_summary"].get(ftype, 0) + count
+                merged["material_quantities"] += analysis.get("material_quantities", [])
+                merged["texts_extracted"] += analysis.get("texts_extracted", [])
+                merged["layers"].update(analysis.get("layers", {}))
+                merged["blocks_analyzed"].update(analysis.get("blocks_analyzed", {}))
+        merged["total_profiles"] = len(merged["profiles"])
+        merged["total_features"] = sum(merged["features_summary"].values())
+        return merged
+
+    merged = {"success": True, "bom_items": [], "constraints": [], "dimension_specs": [],
+              "material_specs": [], "profile_references": [], "files_merged": len(analyses)}
+    for analysis in analyses:
+        if analysis.get("success"):
+            filename = analysis.get("document_info", {}).get("filename", "")
+            merged["bom_items"] += [{**i, "source_file": filename} for i in analysis.get("bom_items", [])]
+            merged["constraints"] += [{**c, "source_file": filename} for c in analysis.get("constraints", [])]
+            merged["dimension_specs"] += analysis.get("dimension_specs", [])
+            merged["material_specs"] += analysis.get("material_specs", [])
+            merged["profile_references"] += analysis.get("profile_references", [])
+    merged["profile_references"] = list(set(merged["profile_references"]))
+    merged["total_items"] = len(merged["bom_items"])
+    merged["total_constraints"] = len(merged["constraints"])
+    return merged
+
+
+def dxf_analysis(name, layers, features, profiles=2):
+    return {
+        "success": True,
+        "file_info": {"filename": name},
+        "profiles": [{"id": f"{name}-{i}", "length_mm": 100.0 * i} for i in range(profiles)],
+        "material_quantities": [{"ref": name}],
+        "texts_extracted": [f"texto {name}"],
+        "features_summary": features,
+        "layers": layers,
+        "blocks_analyzed": {f"BLK_{name}": {"count": 1}},
+    }
+
+
+def pdf_analysis(name, refs):
+    return {
+        "success": True,
+        "document_info": {"filename": name},
+        "bom_items": [{"reference": ref, "quantity": 1} for ref in refs],
+        "constraints": [{"type": "tolerance", "value": name}],
+        "dimension_specs": [{"raw": "100x50"}],
+        "material_specs": [],
+        "profile_references": refs,
+    }
+
+
+DXF_FILES = [
+    ("f1", dxf_analysis("a.dxf", {"L1": {"n": 1}, "L2": {"n": 2}}, {"hole": 2})),
+    ("f2", {"success": False, "error": "falhou", "file_info": {"filename": "bad.dxf"}}),
+    ("f3", dxf_analysis("b.dxf", {"L2": {"n": 9}}, {"hole": 1, "slot": 3}, profiles=3)),
+    ("f4", dxf_analysis("c.dxf", {}, {}, profiles=0)),
+]
+PDF_FILES = [
+    ("p1", pdf_analysis("a.pdf", ["RPT45", "RPT60"])),
+    ("p2", pdf_analysis("b.pdf", ["RPT60", "C50"])),
+    ("p3", pdf_analysis("c.pdf", [])),
+]
+
+
+def merge_incrementally(kind, files):
+    summary, parts = None, {}
+    for file_id, analysis in files:
+        summary, parts[file_id] = add_analysis(kind, summary, file_id, copy.deepcopy(analysis))
+    return summary, parts
+
+
+def view(kind, summary, parts, order):
+    return merged_view(kind, copy.deepcopy(summary), [parts[file_id] for file_id in order if file_id in parts])
+
+
+def comparable(kind, merged):
+    """The baseline keys (profile_references compared as a set: the baseline went through set())"""
+    keys = baseline_merge(kind, []).keys()
+    result = {key: merged[key] for key in keys}
+    if kind == "pdf":
+        result["profile_references"] = sorted(result["profile_references"])
+    return result
+
+
+def test_incremental_merge_matches_baseline():
+    for kind, files in (("dxf", DXF_FILES), ("pdf", PDF_FILES)):
+        summary, parts = merge_incrementally(kind, files)
+        merged = view(kind, summary, parts, [file_id for file_id, _ in files])
+        expected = baseline_merge(kind, [analysis for _, analysis in files])
+        assert comparable(kind, merged) == comparable(kind, expected)
+
+
+def test_analyses_are_not_mutated():
+    originals = copy.deepcopy(DXF_FILES)
+    summary = None
+    for file_id, analysis in DXF_FILES:
+        summary, _ = add_analysis("dxf", summary, file_id, analysis)
+    assert DXF_FILES == originals
+
+
+def test_add_then_remove_round_trips():
+    for kind, files in (("dxf", DXF_FILES), ("pdf", PDF_FILES)):
+        for removed_id, _ in files:
+            summary, parts = merge_incrementally(kind, files)
+            del parts[removed_id]
+            summary = remove_analysis(kind, summary, removed_id,
+                                      lambda: [parts[file_id] for file_id, _ in files if file_id in parts])
+
+            kept = [(file_id, analysis) for file_id, analysis in files if file_id != removed_id]
+            expected_summary, expected_parts = merge_incrementally(kind, kept)
+            order = [file_id for file_id, _ in kept]
+            assert view(kind, summary, parts, order) == view(kind, expected_summary, expected_parts, order)
+
+
+def test_removing_the_last_file_or_an_unknown_one():
+    summary, parts = merge_incrementally("pdf", PDF_FILES[:1])
+    assert remove_analysis("pdf", copy.deepcopy(summary), "unknown", lambda: parts.values()) == summary
+    assert remove_analysis("pdf", summary, "p1", lambda: []) is None
+    assert merged_view("pdf", None, []) is None
+
+
+def test_parts_are_only_loaded_when_keys_must_be_refolded():
+    summary, parts = merge_incrementally("dxf", DXF_FILES)
+
+    def fail():
+        raise AssertionError("remaining parts loaded for a file without dict keys")
+
+    # The failed analysis contributed no layers or blocks: nothing to re-fold
+    summary = remove_analysis("dxf", summary, "f2", fail)
+    assert summary["files_merged"] == 3
+
+
+def test_file_deleted_during_its_upload_job_is_not_merged(tmp_path):
+    store = ProjectStore(tmp_path / "projects.db")
+    store.create({"id": "p", "name": "Obra", "description": "", "created_at": "2026-01-01", "status": "created"})
+    uploads = []
+    for file_id, analysis in DXF_FILES[:3:2]:  # f1, f3
+        file_info = {"id": file_id, "filename": file_id, "type": "dxf", "analysis_success": True,
+                     "analysis": analysis}
+        store.add_file("p", file_info)
+        uploads.append(file_info)
+
+    def unmerge(project, file_info):
+        project["merged_dxf_analysis"] = remove_analysis(
+            "dxf", project.get("merged_dxf_analysis"), file_info["id"],
+            lambda: store.get_merge_parts("p", "dxf")
+        )
+
+    # The user deletes f1 before the upload job reaches its merge step
+    store.remove_file("p", "f1", unmerge)
+    merged_files = store.update_with("p", lambda project: merge_project_files(project, uploads))
+
+    assert [file_info["id"] for file_info in merged_files] == ["f3"]
+    merged = store.get_field("p", "merged_dxf_analysis")
+    expected_summary, expected_parts = merge_incrementally("dxf", DXF_FILES[2:3])
+    assert merged == view("dxf", expected_summary, expected_parts, ["f3"])
+
+    # Removing the remaining file leaves no phantom source behind
+    store.remove_file("p", "f3", unmerge)
+    assert store.get_field("p", "merged_dxf_analysis") is None
+
+
+def test_merged_read_sees_one_snapshot(tmp_path):
+    class InterleavedStore(ProjectStore):
+        """Runs a pending write from another thread between the summary and the parts reads"""
+        pending = []
+
+        def _merge_parts(self, conn, project_id, file_type):
+            while self.pending:
+                writer = threading.Thread(target=self.pending.pop())
+                writer.start()
+                writer.join()
+            return super()._merge_parts(conn, project_id, file_type)
+
+    store = InterleavedStore(tmp_path / "projects.db")
+    store.create({"id": "p", "name": "Obra", "description": "", "created_at": "2026-01-01", "status": "created"})
+
+    def upload(file_id, analysis):
+        file_info = {"id": file_id, "filename": file_id, "type": "dxf", "analysis_success": True,
+                     "analysis": analysis}
+        store.add_file("p", file_info)
+        store.update_with("p", lambda project: merge_project_files(project, [file_info]))
+
+    upload(*DXF_FILES[0])
+    store.pending.append(lambda: upload(*DXF_FILES[2]))
+    merged = store.get_field("p", "merged_dxf_analysis")
+
+    # The parts committed after the summary was read are not part of this view
+    expected_summary, expected_parts = merge_incrementally("dxf", DXF_FILES[:1])
+    assert merged == view("dxf", expected_summary, expected_parts, ["f1"])
+    assert store.get("p", analyses=True)["merged_dxf_analysis"]["files_merged"] == 2
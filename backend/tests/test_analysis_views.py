@@ -0,0 +1,70 @@
+"""Field selection and cursor pagination must return exactly what the full responses held"""
+
+import pytest
+
+from analysis_views import (
+    InvalidCursorError, decode_cursor, encode_cursor, paginate, parse_fields,
+    resolve_collection, select_fields
+)
+
+ITEMS = [{"id": i, "reference": f"RPT{i}", "quantity": i % 7} for i in range(253)]
+
+
+def all_pages(items, limit, fields=None):
+    pages = []
+    cursor = None
+    while True:
+        page = paginate(items, limit, cursor, fields)
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 10, 100, 253, 1000])
+def test_pages_concatenate_to_the_full_collection(limit):
+    pages = all_pages(ITEMS, limit)
+    assert [item for page in pages for item in page["items"]] == ITEMS
+    assert all(page["total"] == len(ITEMS) and page["limit"] == limit for page in pages)
+    assert all(len(page["items"]) == limit for page in pages[:-1])
+
+
+def test_empty_collection_is_one_empty_page():
+    assert paginate([], 10) == {"items": [], "total": 0, "limit": 10, "next_cursor": None}
+
+
+def test_field_selection_on_items_and_documents():
+    pages = all_pages(ITEMS, 50, ["reference", "missing", "id"])
+    assert [item for page in pages for item in page["items"]] == [
+        {"reference": item["reference"], "id": item["id"]} for item in ITEMS
+    ]
+
+    document = {"statistics": {"total": 1}, "profiles": [1, 2], "layers": {}}
+    assert select_fields(document, None) is document
+    assert select_fields(document, parse_fields("layers, statistics")) == {
+        "layers": {}, "statistics": {"total": 1}
+    }
+    assert select_fields(None, ["layers"]) is None
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(" , ") is None
+    assert parse_fields("a, b,c") == ["a", "b", "c"]
+
+
+def test_cursor_round_trip_and_rejects_foreign_cursors():
+    for offset in (0, 1, 99, 10 ** 6):
+        assert decode_cursor(encode_cursor(offset)) == offset
+    assert decode_cursor(None) == 0
+
+    for cursor in ("not-base64!", encode_cursor(5)[:-1] + "@", "eDox", "bzotMQ"):  # x:1, o:-1
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+
+def test_resolve_collection_aliases():
+    assert resolve_collection("dxf", "texts") == "texts_extracted"
+    assert resolve_collection("dxf", "features") == "features_detail"
+    assert resolve_collection("pdf", "bom_items") == "bom_items"
+    assert resolve_collection("pdf", "profiles") is None
@@ -0,0 +1,84 @@
+"""Streamed CSV/JSON exports must be byte-identical to the files the baseline wrote"""
+
+import csv
+import io
+
+import pytest
+
+pytest.importorskip("starlette")  # api_responses builds on starlette
+
+from api_responses import dumps  # noqa: E402
+from budget_exports import CSV_HEADER, ExportCache, csv_row, iter_csv, iter_json  # noqa: E402
+
+
+def budget_with_items(count):
+    return {
+        "project_name": "Fachada \"Norte\", PAV 1",
+        "summary": {"totals": {"subtotal": 1234.5, "total_quote": 1481.4}, "notes": "linha 1\nlinha 2"},
+        "line_items": [
+            {
+                "line_id": i,
+                "reference": f"RPT{i}",
+                "description": "Perfil, com vírgula" if i % 3 else "Caixilho \"especial\"",
+                "quantity": i % 5,
+                "quantity_source": "DXF",
+                "geometry": {"perimeter_mm": 120.5, "length_mm": 6000, "weight_kg": 1.25 * i},
+                "costs": {"raw_material": 10.0, "labor": 2.5},
+                "unit_cost": 12.5,
+                "total_cost": 12.5 * (i % 5),
+            }
+            for i in range(count)
+        ],
+        "recommendations": ["Rever tolerâncias", "Confirmar acabamento"],
+    }
+
+
+def baseline_csv(budget):
+    """What the baseline export_csv wrote to its temp file (newline='', UTF-8)"""
+    buffer = io.StringIO(newline="")
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    for item in budget.get("line_items", []):
+        writer.writerow(csv_row(item))
+    return buffer.getvalue().encode("utf-8")
+
+
+@pytest.mark.parametrize("count", [0, 1, 255, 256, 257, 700])
+def test_csv_stream_is_byte_identical(count):
+    budget = budget_with_items(count)
+    assert b"".join(iter_csv(budget)) == baseline_csv(budget)
+    assert b"".join(iter_csv(budget, rows_per_chunk=7)) == baseline_csv(budget)
+
+
+@pytest.mark.parametrize("budget", [
+    budget_with_items(0), budget_with_items(1), budget_with_items(40), {}, {"line_items": []}
+])
+def test_json_stream_is_byte_identical(budget):
+    assert b"".join(iter_json(budget)) == dumps(budget, indent=True)
+    assert b"".join(iter_json(budget, stream_keys=("line_items", "recommendations"))) == dumps(budget, indent=True)
+
+
+def test_export_cache_records_completed_streams_within_budget():
+    cache = ExportCache(max_bytes=100)
+    assert b"".join(cache.record("a", iter([b"x" * 30, b"y" * 30]))) == b"x" * 30 + b"y" * 30
+    assert cache.get("a") == b"x" * 30 + b"y" * 30
+
+    # Too large to keep, or abandoned before the end: not recorded
+    assert b"".join(cache.record("big", iter([b"z" * 60, b"z" * 60]))) == b"z" * 120
+    partial = cache.record("partial", iter([b"p", b"q"]))
+    next(partial)
+    partial.close()
+    assert cache.get("big") is None and cache.get("partial") is None
+
+    cache.put("b", b"b" * 60)  # evicts "a"
+    assert cache.get("a") is None and cache.get("b") == b"b" * 60
+
+    cache.discard(lambda key: key == "b")
+    assert cache.get("b") is None
+
+
+def test_disabled_export_cache_passes_chunks_through():
+    cache = ExportCache(max_bytes=0)
+    chunks = iter([b"a"])
+    assert cache.record("k", chunks) is chunks
+    assert cache.get("k") is None
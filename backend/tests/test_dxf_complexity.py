@@ -0,0 +1,65 @@
+"""Profile feature membership and complexity must match the baseline per-profile scan"""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("ezdxf")
+
+from dxf_parser import DXFParser, GeometricFeature, ProfileData  # noqa: E402
+
+
+def baseline_features(parser, profile):
+    """The baseline: every feature on the profile's layer plus features within the search box"""
+    half = parser.FEATURE_SEARCH_HALF_SIZE
+    return [i for i, f in enumerate(parser.features)
+            if f.layer == profile.layer
+            or (abs(f.position[0] - profile.centroid[0]) < half and abs(f.position[1] - profile.centroid[1]) < half)]
+
+
+def baseline_score(parser, profile, feature_count):
+    vertex_factor = max(1.0, min(1.0 + (profile.vertex_count - 4) * 0.05, 2.0))
+    bbox = profile.bounding_box
+    if bbox['height'] > 0 and bbox['width'] > 0:
+        aspect = max(bbox['width'], bbox['height']) / min(bbox['width'], bbox['height'])
+        aspect_factor = min(1.0 + (aspect - 1) * 0.03, 1.3)
+    else:
+        aspect_factor = 1.0
+    return min(3.0, vertex_factor * (1.0 + feature_count * 0.15) * aspect_factor)
+
+
+def synthetic_parser(seed=3, profiles=120, features=300):
+    rng = random.Random(seed)
+    layers = ["ALU_A", "ALU_B", "FUROS", "COTAS"]
+    parser = DXFParser("synthetic.dxf")
+    for i in range(features):
+        parser.features.append(GeometricFeature(
+            feature_type="hole", position=(rng.uniform(0, 2000), rng.uniform(0, 2000)),
+            dimensions={"diameter": 8.0}, layer=rng.choice(layers), machining_time_mins=0.5
+        ))
+    sample = []
+    for i in range(profiles):
+        width, height = rng.uniform(0, 400), rng.uniform(0, 400)
+        x, y = rng.uniform(0, 2000), rng.uniform(0, 2000)
+        profile = ProfileData(
+            profile_id=f"P{i}", layer=rng.choice(layers), is_closed=True,
+            perimeter_mm=2 * (width + height), area_mm2=width * height,
+            bounding_box={"min_x": x, "min_y": y, "max_x": x + width, "max_y": y + height,
+                          "width": width, "height": height},
+            centroid=(x + width / 2, y + height / 2), vertex_count=rng.randint(2, 40)
+        )
+        parser.profiles.append(profile)
+        sample.append(profile)
+    return parser, sample
+
+
+def test_profile_features_and_scores_match_baseline():
+    parser, profiles = synthetic_parser()
+    parser._calculate_complexity()
+
+    scores = parser.profiles.column('complexity_score').tolist()
+    for i, profile in enumerate(profiles):
+        expected = baseline_features(parser, profile)
+        assert parser.profiles.feature_indices(i) == expected
+        assert scores[i] == pytest.approx(baseline_score(parser, profile, len(expected)))
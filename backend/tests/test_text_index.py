@@ -0,0 +1,47 @@
+"""SubstringIndex must answer exactly like the linear any(query in text) scan it replaced"""
+
+import random
+
+import pytest
+
+from text_index import SubstringIndex
+
+
+def linear_scan(texts, query):
+    return any(query.lower() in text.lower() for text in texts)
+
+
+def test_matches_linear_scan_on_random_texts():
+    rng = random.Random(7)
+    alphabet = "abcAB -x"
+    texts = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(200)]
+    index = SubstringIndex()
+    for text in texts:
+        index.add(text)
+
+    queries = []
+    for text in texts[:50]:
+        start = rng.randint(0, len(text))
+        queries.append(text[start:rng.randint(start, len(text))].swapcase())
+    queries += ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))) for _ in range(500)]
+
+    for query in queries:
+        assert index.contained_in_any(query) == linear_scan(texts, query), query
+
+
+def test_empty_index_and_short_queries():
+    index = SubstringIndex()
+    assert not index.contained_in_any("")
+    assert not index.contained_in_any("ab")
+
+    index.add("Perfil RPT 45")
+    assert len(index) == 1
+    assert index.contained_in_any("")
+    assert index.contained_in_any("pe")
+    assert index.contained_in_any("PERFIL rpt")
+    assert not index.contained_in_any("rpt 46")
+
+
+def test_rejects_non_positive_gram_size():
+    with pytest.raises(ValueError):
+        SubstringIndex(gram_size=0)
@@ -0,0 +1,63 @@
+"""
+AluQuote AI - Text Index Module
+Índice de substrings (n-gramas) para verificar descrições já extraídas
+Substitui o varrimento linear de todas as descrições por cada candidato
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Set
+
+
+class SubstringIndex:
+    """
+    Case-insensitive "is this text contained in any indexed text" lookups.
+    Exact texts are kept in a set; other queries are answered from a k-gram index,
+    checking `in` only against the texts that hold the query's rarest k-grams.
+    """
+
+    def __init__(self, gram_size: int = 3):
+        if gram_size <= 0:
+            raise ValueError("gram_size must be positive")
+        self.gram_size = gram_size
+        self._texts: List[str] = []
+        self._exact: Set[str] = set()
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _grams(self, text: str) -> Set[str]:
+        k = self.gram_size
+        return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+    def add(self, text: str):
+        lowered = text.lower()
+        position = len(self._texts)
+        self._texts.append(lowered)
+        self._exact.add(lowered)
+        for gram in self._grams(lowered):
+            self._postings[gram].append(position)
+
+    def contained_in_any(self, text: str) -> bool:
+        """Same answer as any(text.lower() in t.lower() for t in indexed texts)"""
+        query = text.lower()
+        if query in self._exact:
+            return True
+        if len(query) < self.gram_size:
+            return any(query in indexed for indexed in self._texts)
+
+        postings = []
+        for gram in self._grams(query):
+            positions = self._postings.get(gram)
+            if positions is None:
+                return False
+            postings.append(positions)
+
+        # Intersect the rarest few posting lists; the `in` check settles the rest
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for positions in postings[1:3]:
+            candidates.intersection_update(positions)
+            if not candidates:
+                return False
+        return any(query in self._texts[position] for position in candidates)
@@ -0,0 +1,144 @@
+"""
+AluQuote AI - Upload Store Module
+Armazenamento de ficheiros por conteúdo (SHA-256) e cache de resultados de análise
+Um desenho carregado várias vezes (ou partilhado entre projetos) é guardado e analisado uma só vez
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write to a temp file in the same directory and rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except Exception:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def trim_cache_dir(root: Path, pattern: str, max_bytes: int) -> int:
+    """
+    Delete the least recently used files matching pattern (oldest mtime first) until
+    they take at most 90% of max_bytes, if they currently exceed max_bytes.
+    Returns the bytes left; files removed concurrently by another process are skipped.
+    """
+    entries = []
+    for path in Path(root).glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return total
+
+    target = int(max_bytes * 0.9)
+    for _, size, path in sorted(entries, key=lambda e: e[0]):
+        if total <= target:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+    return total
+
+
+class UploadStore:
+    """
+    Content-addressed file store: each distinct upload lives once as <sha256><ext>.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def hash_bytes(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def path_for(self, sha256: str, ext: str) -> Path:
+        return self.root / f"{sha256}{ext.lower()}"
+
+    def put(self, content: bytes, filename: str) -> Tuple[str, Path, bool]:
+        """
+        Store content if not already present.
+        Returns (sha256, path, already_stored).
+        """
+        sha256 = self.hash_bytes(content)
+        path = self.path_for(sha256, Path(filename).suffix)
+
+        if path.exists():
+            return sha256, path, True
+
+        _atomic_write(path, content)
+        return sha256, path, False
+
+
+class ParseCache:
+    """
+    Disk cache of parser results keyed by (file kind, parser version, content hash).
+    Only successful analyses are cached so transient failures are retried.
+    Entries are evicted least-recently-used first once the cache exceeds max_bytes
+    (an entry's mtime is refreshed on every hit), which also retires the entries
+    of superseded parser versions.
+    """
+
+    FILE_PATTERN = "*.json.gz"
+
+    def __init__(self, root: Path, max_bytes: int = 1024 * 1024 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, kind: str, version: str, sha256: str) -> Path:
+        safe_version = "".join(c if c.isalnum() or c in ".-+" else "_" for c in version)
+        return self.root / f"{kind}_{safe_version}_{sha256}.json.gz"
+
+    def get(self, kind: str, version: str, sha256: str) -> Optional[Dict[str, Any]]:
+        path = self._path(kind, version, sha256)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, kind: str, version: str, sha256: str, result: Dict[str, Any]):
+        if not result.get("success"):
+            return
+
+        payload = json.dumps(result, ensure_ascii=False, default=str).encode("utf-8")
+        _atomic_write(self._path(kind, version, sha256), gzip.compress(payload, compresslevel=6))
+        self.trim()
+
+    def trim(self) -> int:
+        """Enforce max_bytes over the whole directory (shared by every worker); returns the bytes kept"""
+        with self._lock:
+            return trim_cache_dir(self.root, self.FILE_PATTERN, self.max_bytes)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}